@@ -1,7 +1,7 @@
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
-from datetime import datetime
-from sqlalchemy import String, Text, DateTime, ForeignKey, Float
+from datetime import datetime, timezone
+from sqlalchemy import JSON, String, Text, DateTime, ForeignKey, Float, Integer, Uuid
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 from db.connection import Base
@@ -48,3 +48,40 @@ class AudioTranscription(Base):
     audio_duration: Mapped[float | None] = mapped_column(Float)
     created_at: Mapped[datetime | None] = mapped_column(DateTime, default=func.now())
     status: Mapped[str] = mapped_column(String, default="Transcribed")
+
+
+def _utcnow() -> datetime:
+    # Naive UTC: the job API reports these timestamps with a "Z" suffix, so
+    # they must not depend on the database server's time zone.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class ProcessingJob(Base):
+    """
+    Durable queue entry for an asynchronous OCR + translation job.
+
+    Uses the generic `Uuid`/`JSON` types so the same table works on Postgres
+    and on a local SQLite queue (JOBS_DATABASE_URL).
+    """
+    __tablename__ = "processing_jobs"
+
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    status: Mapped[str] = mapped_column(String, default="queued", index=True)
+    stage: Mapped[str | None] = mapped_column(String)
+    stages: Mapped[dict | None] = mapped_column(JSON)
+    original_filename: Mapped[str | None] = mapped_column(String)
+    spool_path: Mapped[str | None] = mapped_column(String)
+    content_digest: Mapped[str | None] = mapped_column(String)
+    source_lang: Mapped[str] = mapped_column(String)
+    target_lang: Mapped[str] = mapped_column(String)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    lease_owner: Mapped[str | None] = mapped_column(String)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime)
+    # Earliest time a requeued job may be claimed again (retry back-off).
+    not_before: Mapped[datetime | None] = mapped_column(DateTime)
+    ocr_result: Mapped[dict | None] = mapped_column(JSON)
+    result: Mapped[dict | None] = mapped_column(JSON)
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime | None] = mapped_column(DateTime, default=_utcnow)
+    updated_at: Mapped[datetime | None] = mapped_column(DateTime, default=_utcnow, onupdate=_utcnow)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
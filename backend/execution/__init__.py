@@ -0,0 +1,20 @@
+# Shared execution pools (see execution/pools.py)
+from execution.pools import (
+    BLOCKING_POOL,
+    IMAGE_POOL,
+    LLM_DISPATCH_POOL,
+    LLM_IO_POOL,
+    TESSERACT_POOL,
+    get_pool,
+    is_pool_thread,
+    pool_stats,
+    shutdown_pools,
+    start_pools,
+)
+from execution.offload import (
+    ClientDisconnected,
+    offload_stats,
+    run_blocking,
+    run_cancellable,
+    run_ocr,
+)
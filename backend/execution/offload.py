@@ -0,0 +1,169 @@
+"""
+Event-Loop Offloading
+=====================
+Helpers for `async def` FastAPI handlers that must call blocking code
+(OCR, transcription, SQLAlchemy, file writes) without freezing the event
+loop for every other request on the worker.
+
+- Blocking calls run on the shared `blocking` thread pool.
+- Whole-document OCR runs in that pool as a coordinator only: pages,
+  including single images, are OCR'd on the page process pool (see
+  `OCREngine.process_detailed(use_process_pool=True)`), so CPU-bound work
+  never competes with the event loop for the GIL.
+- Each resource has its own concurrency limit (an asyncio semaphore), so a
+  burst of PDF uploads queues for OCR slots instead of starving database
+  calls or transcription.
+- When the client disconnects, the waiting handler is cancelled and the
+  worker is told to stop via a `threading.Event` (OCR checks it between
+  pages). Work that cannot be interrupted finishes in the background, still
+  holding its slot, and its result is dropped.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+from typing import Any, Callable, Optional
+
+from execution.pools import BLOCKING_POOL, get_pool
+
+logger = logging.getLogger(__name__)
+
+OCR_RESOURCE = "ocr"
+TRANSCRIPTION_RESOURCE = "transcription"
+DB_RESOURCE = "db"
+IO_RESOURCE = "io"
+
+RESOURCE_LIMITS = {
+    OCR_RESOURCE: int(os.getenv("OFFLOAD_OCR_CONCURRENCY", "2")),
+    TRANSCRIPTION_RESOURCE: int(os.getenv("OFFLOAD_TRANSCRIPTION_CONCURRENCY", "2")),
+    DB_RESOURCE: int(os.getenv("OFFLOAD_DB_CONCURRENCY", "8")),
+    IO_RESOURCE: int(os.getenv("OFFLOAD_IO_CONCURRENCY", "16")),
+}
+# How often a waiting handler checks whether its client is still connected.
+DISCONNECT_POLL_SECONDS = 0.5
+
+_semaphores: dict[str, asyncio.Semaphore] = {}
+_in_use: dict[str, int] = {}
+# Abandoned work that is still running after its client disconnected.
+_background: set[asyncio.Task] = set()
+
+
+class ClientDisconnected(Exception):
+    """Raised in a handler when its client went away before the work finished."""
+
+
+def _semaphore(resource: str) -> asyncio.Semaphore:
+    semaphore = _semaphores.get(resource)
+    if semaphore is None:
+        if resource not in RESOURCE_LIMITS:
+            raise ValueError(f"Unknown offload resource '{resource}'")
+        semaphore = _semaphores[resource] = asyncio.Semaphore(max(1, RESOURCE_LIMITS[resource]))
+    return semaphore
+
+
+async def _run_in_slot(
+    resource: str,
+    call: Callable[[], Any],
+    cancel_event: Optional[threading.Event],
+) -> Any:
+    async with _semaphore(resource):
+        _in_use[resource] = _in_use.get(resource, 0) + 1
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(get_pool(BLOCKING_POOL), call)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if cancel_event is not None:
+                cancel_event.set()
+            # Keep the slot until the thread has really stopped, so the
+            # limit reflects work that is actually running.
+            await asyncio.wait([future])
+            raise
+        finally:
+            _in_use[resource] -= 1
+
+
+async def run_blocking(resource: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run ``fn(*args, **kwargs)`` on the blocking pool within *resource*'s limit."""
+    return await _run_in_slot(resource, functools.partial(fn, *args, **kwargs), None)
+
+
+async def run_cancellable(
+    resource: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    request=None,
+    cancel_event: Optional[threading.Event] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    `run_blocking`, abandoned as soon as *request*'s client disconnects.
+
+    *cancel_event* is set on disconnect so the worker can stop early; bind
+    it into *fn* as well if *fn* supports one.
+
+    Raises:
+        ClientDisconnected: If the client went away first.
+    """
+    task = asyncio.ensure_future(
+        _run_in_slot(resource, functools.partial(fn, *args, **kwargs), cancel_event)
+    )
+    if request is None:
+        return await task
+
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await request.is_disconnected():
+                break
+    except asyncio.CancelledError:
+        task.cancel()
+        raise
+
+    logger.info("[Offload] client disconnected; cancelling %s work", resource)
+    if cancel_event is not None:
+        cancel_event.set()
+    task.cancel()
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    raise ClientDisconnected(f"Client disconnected during {resource} work")
+
+
+async def run_ocr(
+    engine,
+    file_path: str,
+    request=None,
+    content_digest: Optional[str] = None,
+    progress_callback: Optional[Callable[[dict], None]] = None,
+) -> dict:
+    """
+    `engine.process_detailed` off the event loop, with pages on the process pool.
+
+    *progress_callback* is called from the worker thread, not the loop.
+    """
+    cancel_event = threading.Event()
+    return await run_cancellable(
+        OCR_RESOURCE,
+        functools.partial(
+            engine.process_detailed,
+            cancel_event=cancel_event,
+            use_process_pool=True,
+            progress_callback=progress_callback,
+        ),
+        file_path,
+        content_digest=content_digest,
+        request=request,
+        cancel_event=cancel_event,
+    )
+
+
+def offload_stats() -> dict:
+    """Concurrency limit and slots in use per resource."""
+    return {
+        resource: {"limit": limit, "in_use": _in_use.get(resource, 0)}
+        for resource, limit in RESOURCE_LIMITS.items()
+    }
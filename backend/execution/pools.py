@@ -0,0 +1,140 @@
+"""
+Execution Pools
+===============
+Named, process-wide thread pools shared by every OCR and translation call
+site, instead of a fresh executor per page, chunk or model call.
+
+Pools:
+  - llm_io:       per-chunk translation work (waits on llm_dispatch)
+  - llm_dispatch: individual Gemini model calls (leaf tasks only)
+  - tesseract:    Tesseract runs (PSM candidates, layout regions, docTR blocks)
+  - image:        CPU-bound OpenCV work (layout detectors)
+  - blocking:     blocking calls moved off the asyncio event loop (whole-
+                  document OCR, transcription, database, file I/O; see
+                  execution/offload.py)
+
+Tasks that wait on other tasks must not run in the same pool as the tasks
+they wait on, otherwise a saturated pool deadlocks; that is why LLM work is
+split across two pools. Pools are created on first use or by `start_pools()`
+at application startup, and report queue depth via `pool_stats()`.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_IO_POOL = "llm_io"
+LLM_DISPATCH_POOL = "llm_dispatch"
+TESSERACT_POOL = "tesseract"
+IMAGE_POOL = "image"
+BLOCKING_POOL = "blocking"
+
+_CPU_COUNT = os.cpu_count() or 1
+POOL_SIZES = {
+    LLM_IO_POOL: int(os.getenv("EXEC_LLM_IO_WORKERS", "16")),
+    LLM_DISPATCH_POOL: int(os.getenv("EXEC_LLM_DISPATCH_WORKERS", "32")),
+    TESSERACT_POOL: int(os.getenv("EXEC_TESSERACT_WORKERS", str(_CPU_COUNT))),
+    IMAGE_POOL: int(os.getenv("EXEC_IMAGE_WORKERS", str(max(2, _CPU_COUNT // 2)))),
+    BLOCKING_POOL: int(os.getenv("EXEC_BLOCKING_WORKERS", "32")),
+}
+
+
+class InstrumentedThreadPool(ThreadPoolExecutor):
+    """ThreadPoolExecutor that counts queued, running and finished tasks."""
+
+    def __init__(self, name: str, max_workers: int):
+        super().__init__(max_workers=max_workers, thread_name_prefix=f"pool-{name}")
+        self.name = name
+        self.size = max_workers
+        self._counter_lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        with self._counter_lock:
+            self._queued += 1
+        future = super().submit(self._run, fn, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    def _run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._counter_lock:
+            self._queued -= 1
+            self._running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._counter_lock:
+                self._running -= 1
+
+    def _on_done(self, future: Future) -> None:
+        with self._counter_lock:
+            if future.cancelled():
+                # Cancelled before starting: it never left the queue.
+                self._queued -= 1
+            elif future.exception() is not None:
+                self._failed += 1
+            else:
+                self._completed += 1
+
+    def stats(self) -> dict:
+        with self._counter_lock:
+            return {
+                "workers": self.size,
+                "queued": self._queued,
+                "running": self._running,
+                "completed": self._completed,
+                "failed": self._failed,
+            }
+
+
+_pools: dict[str, InstrumentedThreadPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(name: str) -> InstrumentedThreadPool:
+    """Return the named process-wide pool, creating it on first use."""
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            if name not in POOL_SIZES:
+                raise ValueError(f"Unknown execution pool '{name}'")
+            pool = InstrumentedThreadPool(name, max(1, POOL_SIZES[name]))
+            _pools[name] = pool
+            logger.info("Started %s pool with %d worker(s)", name, pool.size)
+        return pool
+
+
+def is_pool_thread(name: str) -> bool:
+    """True when called from a worker thread of the named pool."""
+    return threading.current_thread().name.startswith(f"pool-{name}_")
+
+
+def start_pools() -> None:
+    """Create every pool up front (call on application startup)."""
+    for name in POOL_SIZES:
+        get_pool(name)
+
+
+def shutdown_pools(wait: bool = False) -> None:
+    """Stop all pools, cancelling queued tasks (call on application shutdown)."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def pool_stats(name: Optional[str] = None) -> dict:
+    """Queue depth and task counters for one pool, or all started pools."""
+    with _pools_lock:
+        pools = dict(_pools)
+    if name is not None:
+        return pools[name].stats() if name in pools else {}
+    return {pool_name: pool.stats() for pool_name, pool in pools.items()}
@@ -0,0 +1,4 @@
+# Upload ingestion (see ingestion/upload.py)
+from ingestion.sniff import AUDIO_KINDS, DOCUMENT_KINDS, sniff_kind
+from ingestion.upload import IngestedFile, UploadRejected, ingest_upload
+from ingestion.limits import MAX_REQUEST_BYTES, RequestBodyLimitMiddleware
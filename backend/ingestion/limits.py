@@ -0,0 +1,66 @@
+"""
+Request Body Limit
+==================
+ASGI middleware that caps the size of a request body before FastAPI parses
+the multipart form. Without it, Starlette receives and spools the whole body
+to a temporary file before `ingest_upload` can look at the per-kind limit.
+
+A declared `Content-Length` over the cap is answered with 413 straight away.
+Chunked or undeclared bodies are counted as they arrive and the request is
+aborted with 413 once the cap is crossed.
+"""
+
+import os
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+
+from ingestion.upload import MAX_UPLOAD_BYTES
+
+# Largest per-kind limit plus room for the multipart boundaries and form fields
+MAX_REQUEST_BYTES = int(
+    os.getenv("INGEST_MAX_REQUEST_MB", str(max(MAX_UPLOAD_BYTES.values()) // (1024 * 1024) + 1))
+) * 1024 * 1024
+
+
+def _too_large_detail(limit: int) -> str:
+    return f"Request body too large: limited to {limit // (1024 * 1024)} MB"
+
+
+class RequestBodyLimitMiddleware:
+    def __init__(self, app, max_bytes: int = MAX_REQUEST_BYTES):
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.max_bytes <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", ()):
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > self.max_bytes:
+                    response = JSONResponse(
+                        {"detail": _too_large_detail(self.max_bytes)}, status_code=413
+                    )
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI re-raises HTTPException from form parsing as-is
+                    raise HTTPException(status_code=413, detail=_too_large_detail(self.max_bytes))
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -0,0 +1,66 @@
+"""
+Content Sniffing
+================
+Identify an upload's kind from its first bytes instead of trusting the
+filename, so a renamed file is rejected before it reaches OCR or Whisper.
+"""
+
+from typing import Optional
+
+from audio.transcription_service import SUPPORTED_AUDIO_EXTENSIONS
+from ocr.ocr_engine import (
+    SUPPORTED_IMAGE_EXTENSIONS,
+    SUPPORTED_PDF_EXTENSIONS,
+    SUPPORTED_WORD_EXTENSIONS,
+)
+
+IMAGE_KIND = "image"
+PDF_KIND = "pdf"
+WORD_KIND = "word"
+AUDIO_KIND = "audio"
+
+DOCUMENT_KINDS = frozenset({IMAGE_KIND, PDF_KIND, WORD_KIND})
+AUDIO_KINDS = frozenset({AUDIO_KIND})
+
+KIND_BY_EXTENSION = {
+    **{ext: IMAGE_KIND for ext in SUPPORTED_IMAGE_EXTENSIONS},
+    **{ext: PDF_KIND for ext in SUPPORTED_PDF_EXTENSIONS},
+    **{ext: WORD_KIND for ext in SUPPORTED_WORD_EXTENSIONS},
+    **{ext: AUDIO_KIND for ext in SUPPORTED_AUDIO_EXTENSIONS},
+}
+
+# Bytes needed to recognise every supported format.
+SNIFF_BYTES = 16
+
+
+def _is_mp3_frame(head: bytes) -> bool:
+    # MPEG audio frame sync: 11 set bits, then a valid layer.
+    return len(head) >= 2 and head[0] == 0xFF and (head[1] & 0xE0) == 0xE0 and (head[1] & 0x06) != 0
+
+
+def sniff_kind(head: bytes) -> Optional[str]:
+    """Kind of a file from its first `SNIFF_BYTES` bytes, or None if unknown."""
+    if head.startswith(b"%PDF-"):
+        return PDF_KIND
+    if (
+        head.startswith(b"\x89PNG\r\n\x1a\n")
+        or head.startswith(b"\xff\xd8\xff")
+        or head.startswith(b"II*\x00")
+        or head.startswith(b"MM\x00*")
+        or head.startswith(b"BM")
+    ):
+        return IMAGE_KIND
+    if head.startswith(b"PK\x03\x04") or head.startswith(b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"):
+        # .docx is a zip container, .doc an OLE compound file.
+        return WORD_KIND
+    if (
+        head.startswith(b"ID3")
+        or head.startswith(b"OggS")
+        or head.startswith(b"fLaC")
+        or head.startswith(b"\x1a\x45\xdf\xa3")  # EBML: webm / weba
+        or (head.startswith(b"RIFF") and head[8:12] == b"WAVE")
+        or head[4:8] == b"ftyp"  # ISO base media: m4a
+        or _is_mp3_frame(head)
+    ):
+        return AUDIO_KIND
+    return None
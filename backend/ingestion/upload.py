@@ -0,0 +1,188 @@
+"""
+Upload Ingestion
+================
+Shared helper that moves an uploaded file to disk for processing.
+
+Starlette already spools multipart parts to a temporary file while parsing
+the request. `ingest_upload` copies that spool to its destination in
+fixed-size chunks on a worker thread. It never holds the whole file in
+memory, and while copying it:
+
+- computes the SHA-256 digest, so OCR caching and job dedupe can key off
+  it without reading the file again;
+- sniffs the real kind from the magic bytes and rejects files whose
+  content does not match their extension;
+- enforces a per-kind size limit, before copying when the size is known
+  and again while copying, then removes any partial file.
+
+Files are written under a temporary name and renamed when complete, so a
+reader never sees half a document.
+
+The per-kind limits only apply once Starlette has received and spooled the
+whole body, so every upload is written to disk twice (spool, then copy).
+The overall request size is capped earlier, before form parsing, by
+`RequestBodyLimitMiddleware` (see ingestion/limits.py).
+"""
+
+import hashlib
+import logging
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import BinaryIO, Optional
+
+from fastapi import UploadFile
+
+from execution.offload import IO_RESOURCE, run_blocking
+from ingestion.sniff import (
+    AUDIO_KIND,
+    IMAGE_KIND,
+    KIND_BY_EXTENSION,
+    PDF_KIND,
+    SNIFF_BYTES,
+    WORD_KIND,
+    sniff_kind,
+)
+
+logger = logging.getLogger(__name__)
+
+INGEST_CHUNK_BYTES = int(os.getenv("INGEST_CHUNK_KB", "1024")) * 1024
+MAX_UPLOAD_BYTES = {
+    IMAGE_KIND: int(os.getenv("INGEST_MAX_IMAGE_MB", "25")) * 1024 * 1024,
+    PDF_KIND: int(os.getenv("INGEST_MAX_PDF_MB", "200")) * 1024 * 1024,
+    WORD_KIND: int(os.getenv("INGEST_MAX_WORD_MB", "50")) * 1024 * 1024,
+    AUDIO_KIND: int(os.getenv("INGEST_MAX_AUDIO_MB", "300")) * 1024 * 1024,
+}
+
+
+class UploadRejected(Exception):
+    """Raised when an upload fails validation; carries the HTTP status to return."""
+
+    def __init__(self, status_code: int, detail: str):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+
+
+@dataclass(frozen=True)
+class IngestedFile:
+    path: str
+    size: int
+    sha256: str
+    kind: str
+    suffix: str
+    filename: str
+
+
+def _too_large(kind: str, limit: int) -> UploadRejected:
+    return UploadRejected(413, f"File too large: {kind} uploads are limited to {limit // (1024 * 1024)} MB")
+
+
+def _copy_to_disk(
+    source: BinaryIO,
+    dest_dir: str,
+    prefix: str,
+    suffix: str,
+    kind: str,
+    filename: str,
+    durable: bool,
+) -> IngestedFile:
+    limit = MAX_UPLOAD_BYTES[kind]
+    source.seek(0)
+    head = source.read(SNIFF_BYTES)
+    sniffed = sniff_kind(head)
+    if sniffed != kind:
+        found = f"{sniffed} content" if sniffed else "unrecognised content"
+        raise UploadRejected(415, f"File content does not match its extension '{suffix}' ({found})")
+
+    os.makedirs(dest_dir, exist_ok=True)
+    path = os.path.join(dest_dir, f"{prefix}{uuid.uuid4().hex}{suffix}")
+    partial = path + ".part"
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with open(partial, "wb") as handle:
+            chunk = head
+            while chunk:
+                size += len(chunk)
+                if size > limit:
+                    raise _too_large(kind, limit)
+                digest.update(chunk)
+                handle.write(chunk)
+                chunk = source.read(INGEST_CHUNK_BYTES)
+            if durable:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(partial, path)
+    except BaseException:
+        if os.path.exists(partial):
+            os.unlink(partial)
+        raise
+
+    return IngestedFile(
+        path=path,
+        size=size,
+        sha256=digest.hexdigest(),
+        kind=kind,
+        suffix=suffix,
+        filename=filename,
+    )
+
+
+async def ingest_upload(
+    file: UploadFile,
+    dest_dir: str,
+    prefix: str = "upload_",
+    allowed_kinds: Optional[frozenset] = None,
+    durable: bool = False,
+) -> IngestedFile:
+    """
+    Validate *file* and write it to *dest_dir*.
+
+    Args:
+        file (UploadFile): The multipart upload.
+        dest_dir (str): Directory for the stored file (created if missing).
+        prefix (str): Filename prefix, e.g. the endpoint name.
+        allowed_kinds (Optional[frozenset]): Kinds the endpoint accepts
+            (see ingestion.sniff); defaults to every supported kind.
+        durable (bool): fsync before returning (queued jobs must survive
+            a crash).
+
+    Raises:
+        UploadRejected: 400 for unsupported extensions, 415 when the content
+            does not match the extension, 413 when the file is too large.
+    """
+    filename = file.filename or "unknown"
+    suffix = Path(filename).suffix.lower()
+    kind = KIND_BY_EXTENSION.get(suffix)
+    if kind is None or (allowed_kinds is not None and kind not in allowed_kinds):
+        accepted = sorted(
+            ext for ext, ext_kind in KIND_BY_EXTENSION.items()
+            if allowed_kinds is None or ext_kind in allowed_kinds
+        )
+        raise UploadRejected(400, f"Unsupported file type '{suffix}'. Accepted: {accepted}")
+
+    limit = MAX_UPLOAD_BYTES[kind]
+    if file.size is not None and file.size > limit:
+        raise _too_large(kind, limit)
+
+    ingested = await run_blocking(
+        IO_RESOURCE,
+        _copy_to_disk,
+        file.file,
+        dest_dir,
+        prefix,
+        suffix,
+        kind,
+        filename,
+        durable,
+    )
+    logger.info(
+        "Ingested %s (%s, %.1f KB, sha256 %s)",
+        filename,
+        kind,
+        ingested.size / 1024,
+        ingested.sha256[:12],
+    )
+    return ingested
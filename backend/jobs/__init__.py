@@ -0,0 +1,2 @@
+# Asynchronous OCR + translation jobs (see jobs/queue.py and jobs/worker.py).
+# Nothing is imported here, so `python -m jobs` can load .env first.
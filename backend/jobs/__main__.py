@@ -0,0 +1,13 @@
+"""Standalone job workers: ``python -m jobs`` (from the backend directory)."""
+
+import logging
+
+from dotenv import find_dotenv, load_dotenv
+
+# Before any module reads its settings from the environment.
+load_dotenv(find_dotenv(), override=True)
+logging.basicConfig(level=logging.INFO, format="%(levelname)s:     %(message)s")
+
+from jobs.worker import main  # noqa: E402
+
+main()
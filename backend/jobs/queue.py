@@ -0,0 +1,309 @@
+"""
+Job Queue
+=========
+Durable queue of OCR + translation jobs backed by the `processing_jobs`
+table.
+
+The queue lives in the main database by default. Set JOBS_DATABASE_URL to
+point it elsewhere, for example ``sqlite:///jobs.sqlite3`` for a local queue
+without Postgres.
+
+Workers claim jobs with a lease:
+
+- **claim**: the oldest queued job, or a running job whose lease has
+  expired (its worker died), is marked running under the worker's id. On
+  Postgres the candidate row is picked with ``FOR UPDATE SKIP LOCKED``, so
+  concurrent workers never block on each other. On every backend the claim
+  is a conditional UPDATE, so two workers can never both win the same job.
+- **heartbeat**: the worker renews its lease while it processes the job.
+  If the renewal fails, the worker has lost the job and stops.
+- **stages**: OCR and translation record their own status and timings.
+  The OCR result is stored as soon as OCR finishes, so a job re-claimed
+  after a restart resumes at translation.
+
+A job that fails is requeued with an exponential back-off
+(JOBS_RETRY_BASE_SECONDS, doubling per attempt up to JOBS_RETRY_MAX_SECONDS)
+before it can be claimed again. Its JOBS_MAX_ATTEMPTS-th failure marks it
+failed instead. A job that keeps killing its worker never records a
+failure, so it is marked failed when claimed after JOBS_MAX_ATTEMPTS claims.
+"""
+
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import and_, create_engine, inspect, or_, select, text, update
+from sqlalchemy.orm import sessionmaker
+
+from db.connection import DATABASE_URL, engine as main_engine
+from db.tables import ProcessingJob
+
+logger = logging.getLogger(__name__)
+
+JOBS_DATABASE_URL = os.getenv("JOBS_DATABASE_URL") or DATABASE_URL
+JOBS_LEASE_SECONDS = float(os.getenv("JOBS_LEASE_SECONDS", "60"))
+JOBS_MAX_ATTEMPTS = int(os.getenv("JOBS_MAX_ATTEMPTS", "3"))
+JOBS_RETRY_BASE_SECONDS = float(os.getenv("JOBS_RETRY_BASE_SECONDS", "30"))
+JOBS_RETRY_MAX_SECONDS = float(os.getenv("JOBS_RETRY_MAX_SECONDS", "600"))
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+
+STAGE_OCR = "ocr"
+STAGE_TRANSLATION = "translation"
+STAGES = (STAGE_OCR, STAGE_TRANSLATION)
+
+STAGE_PENDING = "pending"
+STAGE_RUNNING = "running"
+STAGE_DONE = "done"
+STAGE_FAILED = "failed"
+
+
+def _utcnow() -> datetime:
+    # Naive UTC, matching the table's plain DateTime columns.
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() + "Z" if value is not None else None
+
+
+def _retry_delay(attempts: int) -> float:
+    """Back-off before a job that failed on its *attempts*-th claim is retried."""
+    return min(JOBS_RETRY_BASE_SECONDS * 2 ** max(0, attempts - 1), JOBS_RETRY_MAX_SECONDS)
+
+
+def _make_engine(url: str):
+    if url == DATABASE_URL:
+        return main_engine
+    if url.startswith("sqlite"):
+        # Workers and request handlers share the engine across threads.
+        return create_engine(url, connect_args={"check_same_thread": False})
+    return create_engine(url)
+
+
+class JobQueue:
+    """Enqueue, claim and update `ProcessingJob` rows."""
+
+    def __init__(self, url: str = JOBS_DATABASE_URL, lease_seconds: float = JOBS_LEASE_SECONDS):
+        self.engine = _make_engine(url)
+        self.lease_seconds = lease_seconds
+        self._session = sessionmaker(autocommit=False, autoflush=False, bind=self.engine)
+
+    def create_table(self) -> None:
+        """Create `processing_jobs` if missing (local SQLite queues; Postgres uses Alembic)."""
+        ProcessingJob.__table__.create(bind=self.engine, checkfirst=True)
+        # Local queues created before `not_before` existed have no migrations.
+        columns = {column["name"] for column in inspect(self.engine).get_columns("processing_jobs")}
+        if "not_before" not in columns:
+            with self.engine.begin() as connection:
+                connection.execute(text("ALTER TABLE processing_jobs ADD COLUMN not_before DATETIME"))
+
+    # ------------------------------------------------------------------
+    # Producers
+    # ------------------------------------------------------------------
+    def enqueue(
+        self,
+        spool_path: str,
+        original_filename: str,
+        source_lang: str,
+        target_lang: str,
+        content_digest: Optional[str] = None,
+    ) -> uuid.UUID:
+        job = ProcessingJob(
+            id=uuid.uuid4(),
+            status=QUEUED,
+            stages={name: {"status": STAGE_PENDING} for name in STAGES},
+            original_filename=original_filename,
+            spool_path=spool_path,
+            content_digest=content_digest,
+            source_lang=source_lang,
+            target_lang=target_lang,
+            attempts=0,
+        )
+        with self._session() as db:
+            db.add(job)
+            db.commit()
+            return job.id
+
+    def get(self, job_id: uuid.UUID) -> Optional[dict]:
+        """Public view of a job, or None if it does not exist."""
+        with self._session() as db:
+            job = db.get(ProcessingJob, job_id)
+            if job is None:
+                return None
+            return {
+                "job_id": job.id,
+                "status": job.status,
+                "stage": job.stage,
+                "stages": job.stages or {},
+                "original_filename": job.original_filename,
+                "source_lang": job.source_lang,
+                "target_lang": job.target_lang,
+                "attempts": job.attempts,
+                "error": job.error,
+                "created_at": _isoformat(job.created_at),
+                "updated_at": _isoformat(job.updated_at),
+                "finished_at": _isoformat(job.finished_at),
+                "result": job.result,
+            }
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _claimable(self, now: datetime):
+        return or_(
+            and_(
+                ProcessingJob.status == QUEUED,
+                or_(ProcessingJob.not_before.is_(None), ProcessingJob.not_before <= now),
+            ),
+            and_(ProcessingJob.status == RUNNING, ProcessingJob.lease_expires_at < now),
+        )
+
+    def claim(self, worker_id: str) -> Optional[ProcessingJob]:
+        """
+        Lease the next job for *worker_id*.
+
+        Returns a detached snapshot of the claimed row, or None when the
+        queue is empty. The claim counts as an attempt; the caller gives up
+        on jobs past JOBS_MAX_ATTEMPTS.
+        """
+        while True:
+            now = _utcnow()
+            with self._session() as db:
+                job_id = db.execute(
+                    select(ProcessingJob.id)
+                    .where(self._claimable(now))
+                    .order_by(ProcessingJob.created_at)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                ).scalar_one_or_none()
+                if job_id is None:
+                    return None
+
+                claimed = db.execute(
+                    update(ProcessingJob)
+                    .where(ProcessingJob.id == job_id, self._claimable(now))
+                    .values(
+                        status=RUNNING,
+                        lease_owner=worker_id,
+                        lease_expires_at=now + timedelta(seconds=self.lease_seconds),
+                        attempts=ProcessingJob.attempts + 1,
+                    )
+                    .execution_options(synchronize_session=False)
+                ).rowcount
+                db.commit()
+                if not claimed:
+                    # Another worker won the race (SQLite has no row locks).
+                    continue
+
+                job = db.get(ProcessingJob, job_id)
+                db.expunge(job)
+            return job
+
+    def heartbeat(self, job_id: uuid.UUID, worker_id: str) -> bool:
+        """Renew the lease; False means the job is no longer ours."""
+        with self._session() as db:
+            renewed = db.execute(
+                update(ProcessingJob)
+                .where(
+                    ProcessingJob.id == job_id,
+                    ProcessingJob.status == RUNNING,
+                    ProcessingJob.lease_owner == worker_id,
+                )
+                .values(lease_expires_at=_utcnow() + timedelta(seconds=self.lease_seconds))
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.commit()
+        return bool(renewed)
+
+    def _update_owned(self, job_id: uuid.UUID, worker_id: str, apply) -> bool:
+        """Run ``apply(job)`` and commit, if *worker_id* still holds the job."""
+        with self._session() as db:
+            job = db.execute(
+                select(ProcessingJob)
+                .where(ProcessingJob.id == job_id)
+                .with_for_update()
+            ).scalar_one_or_none()
+            if job is None or job.status != RUNNING or job.lease_owner != worker_id:
+                db.rollback()
+                return False
+            apply(job)
+            db.commit()
+            return True
+
+    def set_stage(
+        self,
+        job_id: uuid.UUID,
+        worker_id: str,
+        stage: str,
+        status: str,
+        **details,
+    ) -> bool:
+        """Record *stage*'s status (plus timings/details such as `ocr_result`)."""
+        ocr_result = details.pop("ocr_result", None)
+
+        def apply(job: ProcessingJob) -> None:
+            stages = dict(job.stages or {})
+            entry = dict(stages.get(stage) or {})
+            entry["status"] = status
+            timestamp = _isoformat(_utcnow())
+            if status == STAGE_RUNNING:
+                entry["started_at"] = timestamp
+            elif status in (STAGE_DONE, STAGE_FAILED):
+                entry["finished_at"] = timestamp
+            entry.update(details)
+            # Reassign so SQLAlchemy sees the JSON change.
+            stages[stage] = entry
+            job.stages = stages
+            job.stage = stage
+            if ocr_result is not None:
+                job.ocr_result = ocr_result
+
+        return self._update_owned(job_id, worker_id, apply)
+
+    def complete(self, job_id: uuid.UUID, worker_id: str, result: dict) -> bool:
+        def apply(job: ProcessingJob) -> None:
+            job.status = COMPLETED
+            job.result = result
+            job.error = None
+            job.lease_owner = None
+            job.lease_expires_at = None
+            job.finished_at = _utcnow()
+
+        return self._update_owned(job_id, worker_id, apply)
+
+    def fail(self, job_id: uuid.UUID, worker_id: str, error: str) -> bool:
+        def apply(job: ProcessingJob) -> None:
+            job.status = FAILED
+            job.error = error[:2000]
+            job.lease_owner = None
+            job.lease_expires_at = None
+            job.finished_at = _utcnow()
+
+        return self._update_owned(job_id, worker_id, apply)
+
+    def requeue(self, job_id: uuid.UUID, worker_id: str, error: Optional[str] = None) -> bool:
+        """
+        Hand a job back to the queue.
+
+        With *error*, the attempt counts towards JOBS_MAX_ATTEMPTS and the
+        job waits out a back-off before it can be claimed again; without one
+        (a worker shutting down mid-job) it does neither.
+        """
+        def apply(job: ProcessingJob) -> None:
+            job.status = QUEUED
+            job.lease_owner = None
+            job.lease_expires_at = None
+            if error is None:
+                job.attempts = max(0, job.attempts - 1)
+                job.not_before = None
+            else:
+                job.error = error[:2000]
+                job.not_before = _utcnow() + timedelta(seconds=_retry_delay(job.attempts))
+
+        return self._update_owned(job_id, worker_id, apply)
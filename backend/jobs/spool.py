@@ -0,0 +1,25 @@
+"""
+Job Spool
+=========
+Uploaded documents waiting for a job worker are kept in a spool directory
+rather than in the request's temp directory, so they survive restarts
+(`POST /jobs` ingests straight into it, fsynced). Workers running on other
+machines need the same directory mounted.
+"""
+
+import logging
+import os
+
+from ocr.cache import DEFAULT_CACHE_ROOT
+
+logger = logging.getLogger(__name__)
+
+JOBS_SPOOL_DIR = os.getenv("JOBS_SPOOL_DIR", os.path.join(DEFAULT_CACHE_ROOT, "job_spool"))
+
+
+def discard_spooled(path) -> None:
+    if path and os.path.exists(path):
+        try:
+            os.unlink(path)
+        except OSError as exc:
+            logger.warning("[Jobs] could not remove spooled file %s: %s", path, exc)
@@ -0,0 +1,276 @@
+"""
+Job Workers
+===========
+Threads that pull jobs from the `JobQueue` and run the same pipeline as
+`/upload`: `OCREngine.process_detailed`, then `translate_text` with OCR
+repair.
+
+Workers start inside the API process (JOBS_WORKERS, default 1), or run on
+their own so they can be scaled separately from the API:
+
+    python -m jobs
+
+Each job is processed under a lease that a heartbeat thread renews. If a
+worker dies mid-document, the lease expires and another worker picks the
+job up. It resumes at translation if OCR had already finished.
+"""
+
+import logging
+import os
+import signal
+import socket
+import threading
+import time
+import uuid
+from typing import Optional
+
+from db.tables import ProcessingJob
+from jobs.queue import (
+    JOBS_MAX_ATTEMPTS,
+    STAGE_DONE,
+    STAGE_FAILED,
+    STAGE_OCR,
+    STAGE_RUNNING,
+    STAGE_TRANSLATION,
+    JobQueue,
+)
+from jobs.spool import discard_spooled
+from ocr.ocr_engine import OCRCancelled, OCRError
+from ocr.translator import translate_text
+
+logger = logging.getLogger(__name__)
+
+JOBS_WORKERS = int(os.getenv("JOBS_WORKERS", "1"))
+JOBS_POLL_SECONDS = float(os.getenv("JOBS_POLL_SECONDS", "1.0"))
+# Back-off while the queue database is unreachable.
+JOBS_RETRY_SECONDS = 10.0
+
+
+class JobLost(Exception):
+    """Raised when a worker's lease was taken over while it was working."""
+
+
+def _build_result(ocr_result: dict, translated_text, model_used: str) -> dict:
+    pages = ocr_result.get("pages", [])
+    ocr_quality = ocr_result.get("ocr_quality", {})
+    avg_confidence = (
+        sum(p["confidence"] for p in pages) / len(pages) if pages else 0.0
+    )
+    return {
+        "extracted_text": "\n\n".join(p["text"] for p in pages),
+        "translated_text": translated_text,
+        "model_used": model_used,
+        "ocr_confidence": round(avg_confidence, 4),
+        "ocr_pages": pages,
+        "ocr_strategy": ocr_result.get("ocr_strategy", "unknown"),
+        "ocr_quality": ocr_quality,
+        "ocr_review_required": bool(ocr_quality.get("review_required")),
+    }
+
+
+class JobWorker:
+    """One polling worker thread."""
+
+    def __init__(
+        self,
+        queue: JobQueue,
+        ocr_engine,
+        name: Optional[str] = None,
+        poll_seconds: float = JOBS_POLL_SECONDS,
+    ):
+        self.queue = queue
+        self.ocr_engine = ocr_engine
+        self.poll_seconds = poll_seconds
+        self.worker_id = name or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._cancel: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._run, name=f"job-worker-{self.worker_id}", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop polling; a job in progress is cancelled and requeued."""
+        self._stop.set()
+        cancel = self._cancel
+        if cancel is not None:
+            cancel.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        logger.info("[Jobs] worker %s started", self.worker_id)
+        while not self._stop.is_set():
+            try:
+                job = self.queue.claim(self.worker_id)
+            except Exception as exc:
+                logger.warning("[Jobs] worker %s could not poll the queue: %s", self.worker_id, exc)
+                self._stop.wait(max(self.poll_seconds, JOBS_RETRY_SECONDS))
+                continue
+            if job is None:
+                self._stop.wait(self.poll_seconds)
+                continue
+            self.process(job)
+        logger.info("[Jobs] worker %s stopped", self.worker_id)
+
+    # ------------------------------------------------------------------
+    # Processing
+    # ------------------------------------------------------------------
+    def _heartbeat(
+        self,
+        job_id: uuid.UUID,
+        done: threading.Event,
+        lost: threading.Event,
+        cancel: threading.Event,
+    ) -> None:
+        interval = max(1.0, self.queue.lease_seconds / 3)
+        while not done.wait(interval):
+            try:
+                alive = self.queue.heartbeat(job_id, self.worker_id)
+            except Exception as exc:
+                # A short DB outage is survivable while the lease lasts.
+                logger.warning("[Jobs] heartbeat for %s failed: %s", job_id, exc)
+                continue
+            if not alive:
+                logger.warning("[Jobs] lost the lease on %s", job_id)
+                lost.set()
+                cancel.set()
+                return
+
+    def _set_stage(self, job_id: uuid.UUID, stage: str, status: str, **details) -> None:
+        if not self.queue.set_stage(job_id, self.worker_id, stage, status, **details):
+            raise JobLost(f"Job {job_id} is no longer leased to {self.worker_id}")
+
+    def process(self, job: ProcessingJob) -> None:
+        # Failures are given up on directly; this catches jobs whose worker
+        # kept dying before it could record one.
+        if job.attempts > JOBS_MAX_ATTEMPTS:
+            logger.error("[Jobs] %s failed %d times; giving up", job.id, JOBS_MAX_ATTEMPTS)
+            self.queue.fail(job.id, self.worker_id, job.error or f"Gave up after {JOBS_MAX_ATTEMPTS} attempts")
+            discard_spooled(job.spool_path)
+            return
+
+        logger.info("[Jobs] %s claimed by %s (attempt %d)", job.id, self.worker_id, job.attempts)
+        self._cancel = threading.Event()
+        done = threading.Event()
+        lost = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job.id, done, lost, self._cancel), daemon=True
+        )
+        heartbeat.start()
+        try:
+            self._process(job)
+        except (OCRCancelled, JobLost) as exc:
+            if self._stop.is_set() and not lost.is_set():
+                logger.info("[Jobs] %s requeued: worker shutting down", job.id)
+                self.queue.requeue(job.id, self.worker_id)
+            else:
+                logger.warning("[Jobs] %s abandoned: %s", job.id, exc)
+        except OCRError as exc:
+            # Unreadable or unsupported documents will not improve on retry.
+            logger.error("[Jobs] %s failed at OCR: %s", job.id, exc)
+            self.queue.set_stage(job.id, self.worker_id, STAGE_OCR, STAGE_FAILED, error=str(exc))
+            if self.queue.fail(job.id, self.worker_id, str(exc)):
+                discard_spooled(job.spool_path)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+            try:
+                if job.attempts >= JOBS_MAX_ATTEMPTS:
+                    logger.exception("[Jobs] %s failed %d times; giving up", job.id, job.attempts)
+                    if self.queue.fail(job.id, self.worker_id, error):
+                        discard_spooled(job.spool_path)
+                else:
+                    logger.exception("[Jobs] %s failed; will retry", job.id)
+                    self.queue.requeue(job.id, self.worker_id, error=error)
+            except Exception:
+                # The lease expires and the job is retried (or given up) anyway.
+                logger.exception("[Jobs] could not record the failure of %s", job.id)
+        finally:
+            done.set()
+            self._cancel = None
+
+    def _process(self, job: ProcessingJob) -> None:
+        ocr_result = job.ocr_result
+        if ocr_result is None:
+            self._set_stage(job.id, STAGE_OCR, STAGE_RUNNING)
+            t0 = time.time()
+            ocr_result = self.ocr_engine.process_detailed(
+                job.spool_path,
+                content_digest=job.content_digest,
+                cancel_event=self._cancel,
+                use_process_pool=True,
+            )
+            self._set_stage(
+                job.id,
+                STAGE_OCR,
+                STAGE_DONE,
+                seconds=round(time.time() - t0, 2),
+                pages=len(ocr_result.get("pages", [])),
+                ocr_result=ocr_result,
+            )
+        else:
+            logger.info("[Jobs] %s resuming after OCR", job.id)
+
+        self._set_stage(job.id, STAGE_TRANSLATION, STAGE_RUNNING)
+        t0 = time.time()
+        translated_text, model_used = translate_text(
+            [p["text"] for p in ocr_result.get("pages", [])],
+            job.source_lang,
+            job.target_lang,
+            repair_ocr=True,
+        )
+        self._set_stage(
+            job.id,
+            STAGE_TRANSLATION,
+            STAGE_DONE,
+            seconds=round(time.time() - t0, 2),
+            model_used=model_used,
+        )
+
+        if not self.queue.complete(job.id, self.worker_id, _build_result(ocr_result, translated_text, model_used)):
+            raise JobLost(f"Job {job.id} is no longer leased to {self.worker_id}")
+        discard_spooled(job.spool_path)
+        logger.info("[Jobs] %s completed", job.id)
+
+
+def start_job_workers(queue: JobQueue, ocr_engine, count: int = JOBS_WORKERS) -> list[JobWorker]:
+    workers = [JobWorker(queue, ocr_engine) for _ in range(max(0, count))]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def stop_job_workers(workers: list[JobWorker], timeout: float = 30.0) -> None:
+    for worker in workers:
+        worker._stop.set()
+    for worker in workers:
+        worker.stop(timeout)
+
+
+def main() -> None:
+    """Run job workers without the API (see jobs/__main__.py)."""
+    from execution.pools import shutdown_pools, start_pools
+    from ocr.ocr_engine import OCREngine, shutdown_pdf_page_pool
+
+    queue = JobQueue()
+    if queue.engine.dialect.name == "sqlite":
+        queue.create_table()
+    start_pools()
+    workers = start_job_workers(queue, OCREngine(), max(1, JOBS_WORKERS))
+
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    try:
+        stopping.wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stop_job_workers(workers)
+        shutdown_pools()
+        shutdown_pdf_page_pool()
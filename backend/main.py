@@ -1,8 +1,9 @@
 import os
+import json
 import logging
 import tempfile
 import uuid
-from pathlib import Path
+from contextlib import aclosing
 from dotenv import load_dotenv, find_dotenv
 
 # Load environment variables at the very beginning
@@ -14,8 +15,9 @@ logging.basicConfig(
     format="%(levelname)s:     %(message)s",
 )
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request, WebSocket, WebSocketDisconnect
 from fastapi.websockets import WebSocketState
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from db.connection import engine, SessionLocal
 from sqlalchemy.exc import SQLAlchemyError
@@ -37,15 +39,44 @@ print(f"DEBUG: Database connecting to -> {safe_url}")
 
 from db.tables import Base, Document, OCRResult, Translation, AudioTranscription
 from ocr.preprocessing import preprocess_image
-from ocr.ocr_engine import OCREngine, OCRError, SUPPORTED_EXTENSIONS
-from ocr.translator import translate_text, detect_language
+from ocr.ocr_engine import OCREngine, OCRError, shutdown_pdf_page_pool
+from ocr.translator import (
+    translate_text_async,
+    translate_text_stream,
+    detect_language,
+    translation_coalescer,
+    translation_dispatcher,
+)
+from ocr.model_health import get_model_health
+from ocr.document_pipeline import document_events
 from audio.transcription_service import (
     TranscriptionService,
     TranscriptionError,
-    SUPPORTED_AUDIO_EXTENSIONS,
     AVAILABLE_MODELS,
 )
 
+from execution.pools import start_pools, shutdown_pools, pool_stats
+from jobs.queue import JobQueue
+from jobs.spool import JOBS_SPOOL_DIR, discard_spooled
+from ingestion import (
+    AUDIO_KINDS,
+    DOCUMENT_KINDS,
+    IngestedFile,
+    RequestBodyLimitMiddleware,
+    UploadRejected,
+    ingest_upload,
+)
+from jobs.worker import JOBS_WORKERS, start_job_workers, stop_job_workers
+from execution.offload import (
+    ClientDisconnected,
+    DB_RESOURCE,
+    IO_RESOURCE,
+    TRANSCRIPTION_RESOURCE,
+    offload_stats,
+    run_blocking,
+    run_cancellable,
+    run_ocr,
+)
 from fastapi.middleware.cors import CORSMiddleware
 
 
@@ -58,10 +89,15 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Refuses oversized request bodies before Starlette spools the multipart form
+app.add_middleware(RequestBodyLimitMiddleware)
 
 # Temporary directory for file processing (cleaned up after each request)
 # Java/Angular backend handles permanent file storage separately
 TEMP_PROCESSING_DIR = tempfile.mkdtemp(prefix="ocr_processing_")
+# Translate each page of /upload as soon as its OCR finishes (0 = OCR the
+# whole document first, then translate all pages).
+UPLOAD_PIPELINE = os.getenv("UPLOAD_PIPELINE", "1") != "0"
 logger.info("Temp processing directory: %s", TEMP_PROCESSING_DIR)
 
 # Create database tables on startup
@@ -75,8 +111,29 @@ ocr_engine = OCREngine()
 model_size = os.getenv("WHISPER_MODEL", "tiny")
 transcription_engine = TranscriptionService(model_size=model_size)
 
+# Durable queue for /jobs (main database unless JOBS_DATABASE_URL is set)
+job_queue = JobQueue()
+job_workers = []
+
+
+
 
 
+@app.on_event("startup")
+async def start_executors():
+    """Create the shared OCR/LLM thread pools before the first request."""
+    start_pools()
+    if job_queue.engine.dialect.name == "sqlite":
+        # Local queue; on Postgres the table comes from the Alembic migration.
+        job_queue.create_table()
+    job_workers.extend(start_job_workers(job_queue, ocr_engine, JOBS_WORKERS))
+
+
+@app.on_event("shutdown")
+async def stop_executors():
+    stop_job_workers(job_workers)
+    shutdown_pools()
+    shutdown_pdf_page_pool()
 
 
 @app.get("/")
@@ -84,6 +141,20 @@ async def root():
     """Health check / status endpoint."""
     return {"status": "running", "message": "OCR & Translation API is live"}
 
+@app.get("/health/executors")
+async def executor_health():
+    """Queue depth and task counters for the shared execution pools."""
+    return {"pools": pool_stats(), "offload": offload_stats()}
+
+@app.get("/health/models")
+async def model_health():
+    """Circuit breaker state and dispatch latency stats per Gemini model."""
+    return {
+        "breakers": get_model_health().snapshot(),
+        "translation_dispatch": translation_dispatcher.stats(),
+        "translation_coalescer": translation_coalescer.stats(),
+    }
+
 @app.get("/transcription-models")
 async def get_transcription_models():
     """
@@ -93,6 +164,137 @@ async def get_transcription_models():
 
 
 
+async def _save_upload(
+    file: UploadFile,
+    prefix: str,
+    kinds: frozenset,
+    dest_dir: str = TEMP_PROCESSING_DIR,
+    durable: bool = False,
+) -> IngestedFile:
+    """Stream an upload to disk (hashed, type-checked, size-limited); see ingestion/."""
+    try:
+        return await ingest_upload(file, dest_dir, prefix, allowed_kinds=kinds, durable=durable)
+    except UploadRejected as exc:
+        logger.warning("Upload %s rejected: %s", file.filename, exc.detail)
+        raise HTTPException(status_code=exc.status_code, detail=exc.detail)
+
+
+def _remove_temp_file(file_path) -> None:
+    if file_path and os.path.exists(file_path):
+        try:
+            os.unlink(file_path)
+        except OSError:
+            pass
+
+
+def _ocr_summary(detailed_result: dict) -> tuple[str, float, dict, str | None]:
+    """(extracted_text, avg_confidence, ocr_quality, quality warning) for a process_detailed result."""
+    pages = detailed_result["pages"]
+    extracted_text = "\n\n".join(p["text"] for p in pages)
+    avg_confidence = sum(p["confidence"] for p in pages) / len(pages) if pages else 0.0
+    ocr_quality = detailed_result.get("ocr_quality", {})
+    ocr_quality_warning = ocr_quality.get("message") if ocr_quality.get("review_required") else None
+    return extracted_text, avg_confidence, ocr_quality, ocr_quality_warning
+
+
+def _document_response(
+    filename: str,
+    detailed_result: dict,
+    translated_text,
+    model_used: str,
+    ids: tuple[uuid.UUID, uuid.UUID, uuid.UUID],
+    saved: bool,
+    timing: dict,
+) -> dict:
+    """Response body shared by /upload and the "done" event of /upload/stream."""
+    extracted_text, avg_confidence, ocr_quality, ocr_quality_warning = _ocr_summary(detailed_result)
+    db_warning = None if saved else "Database unavailable; processed without saving records"
+    doc_id, ocr_result_id, translation_id = ids
+    return {
+        "message": (
+            "Document processed successfully"
+            if saved
+            else "Document processed successfully, but database save was skipped"
+        ),
+        "document_id": doc_id,
+        "ocr_result_id": ocr_result_id,
+        "translation_id": translation_id,
+        "persistence_status": "saved" if saved else "skipped",
+        "warning": " ".join(
+            warning
+            for warning in (db_warning, ocr_quality_warning)
+            if warning
+        ) or None,
+        "extracted_text": extracted_text,
+        "translated_text": translated_text,
+        "model_used": model_used,
+        "original_filename": filename,
+        "ocr_confidence": round(avg_confidence, 4),
+        "ocr_pages": detailed_result["pages"],
+        "ocr_strategy": detailed_result.get("ocr_strategy", "unknown"),
+        "ocr_quality": ocr_quality,
+        "ocr_review_required": bool(ocr_quality.get("review_required")),
+        "debug_image_urls": detailed_result.get("debug_images", []),
+        "timing": timing,
+    }
+
+
+def _save_document_results(
+    filename: str,
+    extracted_text: str,
+    avg_confidence: float,
+    translated_text: str,
+    model_used: str,
+) -> tuple[uuid.UUID, uuid.UUID, uuid.UUID] | None:
+    """Persist a processed document in one transaction; None if the DB is unavailable."""
+    doc_id, ocr_result_id, translation_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    db = SessionLocal()
+    try:
+        db.add(Document(id=doc_id, original_filename=filename, stored_path=filename, status="Completed"))
+        db.add(OCRResult(
+            id=ocr_result_id,
+            document_id=doc_id,
+            extracted_text=extracted_text,
+            confidence=avg_confidence,
+            status="Extracted",
+        ))
+        db.add(Translation(
+            id=translation_id,
+            document_id=doc_id,
+            translated_text=translated_text,
+            model_used=model_used,
+            status="Completed",
+        ))
+        db.commit()
+        return doc_id, ocr_result_id, translation_id
+    except SQLAlchemyError as exc:
+        db.rollback()
+        logger.warning("DB unavailable while saving document results: %s", exc)
+        return None
+    finally:
+        db.close()
+
+
+def _sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+
+def _client_closed() -> HTTPException:
+    # 499 "Client Closed Request" (nginx); nobody is left to read it.
+    return HTTPException(status_code=499, detail="Client closed request")
+
+
+def _validate_translation_text(text) -> None:
+    if isinstance(text, str):
+        if not text.strip():
+            raise HTTPException(status_code=400, detail="Text for translation cannot be empty")
+    elif isinstance(text, list):
+        if not any(t.strip() for t in text if isinstance(t, str)):
+            raise HTTPException(status_code=400, detail="Text list for translation cannot be empty")
+    else:
+         raise HTTPException(status_code=400, detail="Invalid text format. Expected string or list of strings.")
+
+
 @app.post("/translate")
 async def translate_only(request: TranslationRequest):
     """
@@ -102,17 +304,10 @@ async def translate_only(request: TranslationRequest):
     import time
     t0 = time.time()
 
-    if isinstance(request.text, str):
-        if not request.text.strip():
-            raise HTTPException(status_code=400, detail="Text for translation cannot be empty")
-    elif isinstance(request.text, list):
-        if not any(t.strip() for t in request.text if isinstance(t, str)):
-            raise HTTPException(status_code=400, detail="Text list for translation cannot be empty")
-    else:
-         raise HTTPException(status_code=400, detail="Invalid text format. Expected string or list of strings.")
+    _validate_translation_text(request.text)
 
     try:
-        translated_text, model_used = translate_text(
+        translated_text, model_used = await translate_text_async(
             request.text,
             request.source_lang,
             request.target_lang,
@@ -134,37 +329,59 @@ async def translate_only(request: TranslationRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/translate/stream")
+async def translate_stream(request: TranslationRequest):
+    """
+    Streaming variant of /translate for long pastes.
+
+    Returns NDJSON: a "start" event, "delta" events with model tokens for
+    the first chunk, one "chunk" event per translated chunk (with its index)
+    as soon as it finishes, and a final "done" event carrying model_used
+    and timing. Clients assemble the text by chunk index.
+    """
+    _validate_translation_text(request.text)
+
+    async def ndjson_events():
+        try:
+            async for event in translate_text_stream(
+                request.text,
+                request.source_lang,
+                request.target_lang,
+                repair_ocr=request.repair_ocr,
+            ):
+                yield json.dumps(event, ensure_ascii=False) + "\n"
+        except Exception as e:
+            logger.error(f"Streaming translation failed: {e}")
+            yield json.dumps({"type": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(
+        ndjson_events(),
+        media_type="application/x-ndjson",
+        # Stop reverse proxies from buffering the stream.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.post("/detect_language")
-async def language_detection_endpoint(file: UploadFile = File(...)):
+async def language_detection_endpoint(request: Request, file: UploadFile = File(...)):
     """
     Detect the language of an uploaded document (image or PDF).
     Uses professional OCR and LLM-based identification for Himalayan languages.
     """
     filename = file.filename or "unknown"
-    ext = Path(filename).suffix.lower()
-
-    if ext not in SUPPORTED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Unsupported file type '{ext}'. "
-                f"Accepted: {sorted(SUPPORTED_EXTENSIONS)}"
-            ),
-        )
-
     import time
     t0 = time.time()
-    file_path = None
-    
+
+    # 1. Save File to temp directory (auto-cleaned after processing)
+    upload = await _save_upload(file, "detect_", DOCUMENT_KINDS)
+    file_path = upload.path
+
     try:
-        # 1. Save File to temp directory (auto-cleaned after processing)
-        suffix = Path(filename).suffix
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False, dir=TEMP_PROCESSING_DIR, prefix="detect_") as tmp:
-            tmp.write(await file.read())
-            file_path = tmp.name
-        
         # 2. OCR Extraction (Focusing on first page for speed/efficiency)
-        extracted_pages = ocr_engine.process(file_path)
+        detailed_result = await run_ocr(
+            ocr_engine, file_path, request=request, content_digest=upload.sha256
+        )
+        extracted_pages = [p["text"] for p in detailed_result["pages"]]
         if not extracted_pages:
             return {
                 "message": "No text extracted from document",
@@ -176,7 +393,7 @@ async def language_detection_endpoint(file: UploadFile = File(...)):
         first_page_text = extracted_pages[0]
         
         # 3. Language Identification (LLM based snippet analysis)
-        detection_result = detect_language(first_page_text)
+        detection_result = await run_blocking(IO_RESOURCE, detect_language, first_page_text)
         
         duration = time.time() - t0
         
@@ -191,19 +408,19 @@ async def language_detection_endpoint(file: UploadFile = File(...)):
                 "total_processing_seconds": round(duration, 2)
             }
         }
+    except ClientDisconnected:
+        logger.info("Language detection abandoned: client disconnected")
+        raise _client_closed()
     except Exception as e:
         logger.error(f"Language detection failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if file_path and os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
+        await run_blocking(IO_RESOURCE, _remove_temp_file, file_path)
 
 
 @app.post("/upload")
 async def upload_file(
+    request: Request,
     file: UploadFile = File(...),
     source_lang: str = Form("Tamang"),
     target_lang: str = Form("Nepali")
@@ -211,38 +428,21 @@ async def upload_file(
     """
     Upload a document (image or PDF) for OCR and translation.
     """
-    # --- validate file type ---
     filename = file.filename or "unknown"
-    ext = Path(filename).suffix.lower()
-
-    if ext not in SUPPORTED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Unsupported file type '{ext}'. "
-                f"Accepted: {sorted(SUPPORTED_EXTENSIONS)}"
-            ),
-        )
 
     import time
     t0 = time.time()  # Start of request
-    file_path = None
-    
+
+    # --- 1. File Save (Temporary — cleaned up after processing) ---
+    t_upload_start = time.time()
+    upload = await _save_upload(file, "upload_", DOCUMENT_KINDS)
+    file_path = upload.path
+    t_upload_end = time.time()
+    upload_duration = t_upload_end - t_upload_start
+
     db = SessionLocal()
     db_available = True
-    db_warning = None
     try:
-        # --- 1. File Save (Temporary — cleaned up after processing) ---
-        t_upload_start = time.time()
-        suffix = Path(filename).suffix
-        file_content = await file.read()
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False, dir=TEMP_PROCESSING_DIR, prefix="upload_") as tmp:
-            tmp.write(file_content)
-            file_path = tmp.name
-        
-        t_upload_end = time.time()
-        upload_duration = t_upload_end - t_upload_start
-
         doc_id = uuid.uuid4()
         doc = None
         try:
@@ -255,48 +455,57 @@ async def upload_file(
                 status="Processing",
             )
             db.add(doc)
-            db.flush() # Get the ID without full commit yet
+            await run_blocking(DB_RESOURCE, db.flush) # Get the ID without full commit yet
         except SQLAlchemyError as exc:
-            db.rollback()
+            await run_blocking(DB_RESOURCE, db.rollback)
             db_available = False
-            db_warning = "Database unavailable; processed without saving records"
             logger.warning("DB unavailable during upload init; continuing without persistence: %s", exc)
         
         t_db_init_end = time.time()
         db_init_duration = t_db_init_end - t_upload_end
 
-        # --- 2. OCR Processing ---
-        t_ocr_start = time.time()
-        # Detailed result includes text, confidence, and bounding boxes
-        detailed_result = ocr_engine.process_detailed(file_path)
-        extracted_pages = [p["text"] for p in detailed_result["pages"]]
-        extracted_text = "\n\n".join(extracted_pages)
-        ocr_quality = detailed_result.get("ocr_quality", {})
-        ocr_quality_warning = (
-            ocr_quality.get("message")
-            if ocr_quality.get("review_required")
-            else None
-        )
-        avg_confidence = (
-            sum(p["confidence"] for p in detailed_result["pages"])
-            / len(detailed_result["pages"])
-            if detailed_result["pages"] else 0.0
-        )
-        
-        t_ocr_end = time.time()
-        ocr_duration = t_ocr_end - t_ocr_start
+        if UPLOAD_PIPELINE:
+            # --- 2+3. OCR and LLM translation, overlapped per page ---
+            t_ocr_start = time.time()
+            async with aclosing(
+                document_events(
+                    ocr_engine,
+                    file_path,
+                    source_lang,
+                    target_lang,
+                    request=request,
+                    content_digest=upload.sha256,
+                )
+            ) as events:
+                async for event in events:
+                    if event["type"] == "document":
+                        break
+            detailed_result = event["ocr_result"]
+            translated_text, model_used = event["translated_text"], event["model_used"]
+            ocr_duration = event["ocr_seconds"]
+            # Only the translation tail after the last page's OCR.
+            llm_duration = max(0.0, time.time() - t_ocr_start - ocr_duration)
+        else:
+            # --- 2. OCR Processing ---
+            t_ocr_start = time.time()
+            # Detailed result includes text, confidence, and bounding boxes
+            detailed_result = await run_ocr(
+                ocr_engine, file_path, request=request, content_digest=upload.sha256
+            )
+            ocr_duration = time.time() - t_ocr_start
+
+            # --- 3. LLM API Response ---
+            t_llm_start = time.time()
+            # Passing the list of pages triggers parallel translation in the translator module
+            translated_text, model_used = await translate_text_async(
+                [p["text"] for p in detailed_result["pages"]],
+                source_lang,
+                target_lang,
+                repair_ocr=True,
+            )
+            llm_duration = time.time() - t_llm_start
 
-        # --- 3. LLM API Response ---
-        t_llm_start = time.time()
-        # Passing the list of pages triggers parallel translation in the translator module
-        translated_text, model_used = translate_text(
-            extracted_pages,
-            source_lang,
-            target_lang,
-            repair_ocr=True,
-        )
-        t_llm_end = time.time()
-        llm_duration = t_llm_end - t_llm_start
+        extracted_text, avg_confidence, _, _ = _ocr_summary(detailed_result)
 
         # --- 4. Final DB Updates (Consolidated) ---
         t_db_final_start = time.time()
@@ -326,11 +535,10 @@ async def upload_file(
 
                 if doc is not None:
                     doc.status = "Completed"
-                db.commit() # Single commit for all results
+                await run_blocking(DB_RESOURCE, db.commit) # Single commit for all results
             except SQLAlchemyError as exc:
-                db.rollback()
+                await run_blocking(DB_RESOURCE, db.rollback)
                 db_available = False
-                db_warning = "Database unavailable; processed without saving records"
                 logger.warning("DB unavailable during upload final save; returning unsaved result: %s", exc)
         
         t_db_final_end = time.time()
@@ -350,96 +558,199 @@ async def upload_file(
         logger.info(telemetry)
         print(telemetry) # Ensure it's visible in terminal
 
-        return {
-            "message": (
-                "Document processed successfully"
-                if db_available
-                else "Document processed successfully, but database save was skipped"
-            ),
-            "document_id": doc_id,
-            "ocr_result_id": ocr_result_id,
-            "translation_id": translation_id,
-            "persistence_status": "saved" if db_available else "skipped",
-            "warning": " ".join(
-                warning
-                for warning in (db_warning, ocr_quality_warning)
-                if warning
-            ) or None,
-            "extracted_text": extracted_text,
-            "translated_text": translated_text,
-            "original_filename": filename,
-            "ocr_confidence": round(avg_confidence, 4),
-            "ocr_pages": detailed_result["pages"],
-            "ocr_strategy": detailed_result.get("ocr_strategy", "unknown"),
-            "ocr_quality": ocr_quality,
-            "ocr_review_required": bool(
-                ocr_quality.get("review_required")
-            ),
-            "debug_image_urls": detailed_result.get("debug_images", []),
-            "timing": {
+        return _document_response(
+            filename,
+            detailed_result,
+            translated_text,
+            model_used,
+            (doc_id, ocr_result_id, translation_id),
+            saved=db_available,
+            timing={
                 "file_upload_seconds": round(upload_duration, 2),
                 "db_init_seconds": round(db_init_duration, 2),
                 "ocr_processing_seconds": round(ocr_duration, 2),
                 "llm_api_response_seconds": round(llm_duration, 2),
                 "db_final_seconds": round(db_final_duration, 2),
                 "total_processing_seconds": round(total_duration, 2)
-            }
-        }
+            },
+        )
+    except ClientDisconnected:
+        logger.info("Upload abandoned: client disconnected")
+        if db_available:
+            await run_blocking(DB_RESOURCE, db.rollback)
+        raise _client_closed()
     except OCRError as e:
         logger.error("OCR failed: %s", e)
         if db_available:
-            db.rollback()
+            await run_blocking(DB_RESOURCE, db.rollback)
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.exception("Upload processing failed")
         if db_available:
-            db.rollback()
+            await run_blocking(DB_RESOURCE, db.rollback)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        db.close()
-        if file_path and os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
+        await run_blocking(DB_RESOURCE, db.close)
+        await run_blocking(IO_RESOURCE, _remove_temp_file, file_path)
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(
+    file: UploadFile = File(...),
+    source_lang: str = Form("Tamang"),
+    target_lang: str = Form("Nepali"),
+):
+    """
+    Queue a document (image or PDF) for OCR and translation.
+
+    Returns a job id straight away; poll GET /jobs/{job_id} for per-stage
+    status and the result (same fields as /upload).
+    """
+    filename = file.filename or "unknown"
+    upload = await _save_upload(file, "job_", DOCUMENT_KINDS, dest_dir=JOBS_SPOOL_DIR, durable=True)
+    spool_path = upload.path
+    try:
+        job_id = await run_blocking(
+            DB_RESOURCE,
+            job_queue.enqueue,
+            spool_path,
+            filename,
+            source_lang,
+            target_lang,
+            content_digest=upload.sha256,
+        )
+    except SQLAlchemyError as exc:
+        await run_blocking(IO_RESOURCE, discard_spooled, spool_path)
+        logger.error("Job queue unavailable: %s", exc)
+        raise HTTPException(status_code=503, detail="Job queue unavailable; try /upload instead")
+
+    logger.info("Queued job %s for %s", job_id, filename)
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": f"/jobs/{job_id}",
+    }
+
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: uuid.UUID):
+    """Per-stage status of a queued job, plus its result once completed."""
+    try:
+        job = await run_blocking(DB_RESOURCE, job_queue.get, job_id)
+    except SQLAlchemyError as exc:
+        logger.error("Job queue unavailable: %s", exc)
+        raise HTTPException(status_code=503, detail="Job queue unavailable")
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+
+@app.post("/upload/stream")
+async def upload_stream(
+    file: UploadFile = File(...),
+    source_lang: str = Form("Tamang"),
+    target_lang: str = Form("Nepali"),
+):
+    """
+    Streaming variant of /upload for long documents (Server-Sent Events).
+
+    Events: "start"; per page, "page_rasterized", "page_ocr" (text,
+    confidence, ocr_strategy, ocr_quality) and "page_translated" as each
+    page finishes, so the first page can be shown while later pages are
+    still processing; then "done" with the same fields as the /upload
+    response, or "error" with a status and detail.
+    """
+    filename = file.filename or "unknown"
+    import time
+    t0 = time.time()
+    # Saved before responding: the upload is closed once the handler returns.
+    upload = await _save_upload(file, "stream_", DOCUMENT_KINDS)
+    file_path = upload.path
+
+    async def sse_events():
+        first_page_seconds = None
+        try:
+            yield _sse({"type": "start", "filename": filename})
+            async for event in document_events(
+                ocr_engine, file_path, source_lang, target_lang, content_digest=upload.sha256
+            ):
+                if event["type"] == "page_ocr" and first_page_seconds is None:
+                    first_page_seconds = time.time() - t0
+                if event["type"] != "document":
+                    yield _sse(event)
+                    continue
+
+                detailed_result = event["ocr_result"]
+                extracted_text, avg_confidence, _, _ = _ocr_summary(detailed_result)
+                t_db_start = time.time()
+                saved = await run_blocking(
+                    DB_RESOURCE,
+                    _save_document_results,
+                    filename,
+                    extracted_text,
+                    avg_confidence,
+                    event["translated_text"],
+                    event["model_used"],
+                )
+                total_duration = time.time() - t0
+                logger.info(
+                    "TELEMETRY [STREAM]: Total=%.2fs | FirstPage=%.2fs | OCR=%.2fs",
+                    total_duration,
+                    first_page_seconds or 0.0,
+                    event["ocr_seconds"],
+                )
+                response = _document_response(
+                    filename,
+                    detailed_result,
+                    event["translated_text"],
+                    event["model_used"],
+                    saved or (uuid.uuid4(), uuid.uuid4(), uuid.uuid4()),
+                    saved=saved is not None,
+                    timing={
+                        "first_page_seconds": round(first_page_seconds or 0.0, 2),
+                        "ocr_processing_seconds": event["ocr_seconds"],
+                        "db_final_seconds": round(time.time() - t_db_start, 2),
+                        "total_processing_seconds": round(total_duration, 2),
+                    },
+                )
+                yield _sse({"type": "done", **response})
+        except OCRError as e:
+            logger.error("Streaming OCR failed: %s", e)
+            yield _sse({"type": "error", "status": 422, "detail": str(e)})
+        except Exception as e:
+            logger.exception("Streaming upload processing failed")
+            yield _sse({"type": "error", "status": 500, "detail": str(e)})
+        finally:
+            # Not offloaded: after a disconnect, awaits here would be cancelled too.
+            _remove_temp_file(file_path)
+
+    return StreamingResponse(
+        sse_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/ocrextraction")
-async def ocr_extraction_only(file: UploadFile = File(...)):
+async def ocr_extraction_only(request: Request, file: UploadFile = File(...)):
     """
     Upload a document (image or PDF) for OCR only.
     The extracted text can be reviewed/edited by the UI and then sent to /translate.
     """
     filename = file.filename or "unknown"
-    ext = Path(filename).suffix.lower()
-
-    if ext not in SUPPORTED_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Unsupported file type '{ext}'. "
-                f"Accepted: {sorted(SUPPORTED_EXTENSIONS)}"
-            ),
-        )
-
     import time
     t0 = time.time()
-    file_path = None
+
+    t_upload_start = time.time()
+    upload = await _save_upload(file, "ocr_", DOCUMENT_KINDS)
+    file_path = upload.path
+    t_upload_end = time.time()
+    upload_duration = t_upload_end - t_upload_start
 
     db = SessionLocal()
     db_available = True
     db_warning = None
     try:
-        t_upload_start = time.time()
-        suffix = Path(filename).suffix
-        file_content = await file.read()
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False, dir=TEMP_PROCESSING_DIR, prefix="ocr_") as tmp:
-            tmp.write(file_content)
-            file_path = tmp.name
-
-        t_upload_end = time.time()
-        upload_duration = t_upload_end - t_upload_start
-
         doc_id = uuid.uuid4()
         doc = None
         try:
@@ -450,9 +761,9 @@ async def ocr_extraction_only(file: UploadFile = File(...)):
                 status="OCR Processing",
             )
             db.add(doc)
-            db.flush()
+            await run_blocking(DB_RESOURCE, db.flush)
         except SQLAlchemyError as exc:
-            db.rollback()
+            await run_blocking(DB_RESOURCE, db.rollback)
             db_available = False
             db_warning = "Database unavailable; OCR processed without saving records"
             logger.warning("DB unavailable during OCR extraction init; continuing without persistence: %s", exc)
@@ -461,7 +772,9 @@ async def ocr_extraction_only(file: UploadFile = File(...)):
         db_init_duration = t_db_init_end - t_upload_end
 
         t_ocr_start = time.time()
-        detailed_result = ocr_engine.process_detailed(file_path)
+        detailed_result = await run_ocr(
+            ocr_engine, file_path, request=request, content_digest=upload.sha256
+        )
         extracted_pages = [p["text"] for p in detailed_result["pages"]]
         extracted_text = "\n\n".join(extracted_pages)
         ocr_quality = detailed_result.get("ocr_quality", {})
@@ -494,9 +807,9 @@ async def ocr_extraction_only(file: UploadFile = File(...)):
 
                 if doc is not None:
                     doc.status = "OCR Extracted"
-                db.commit()
+                await run_blocking(DB_RESOURCE, db.commit)
             except SQLAlchemyError as exc:
-                db.rollback()
+                await run_blocking(DB_RESOURCE, db.rollback)
                 db_available = False
                 db_warning = "Database unavailable; OCR processed without saving records"
                 logger.warning("DB unavailable during OCR extraction final save; returning unsaved result: %s", exc)
@@ -550,27 +863,29 @@ async def ocr_extraction_only(file: UploadFile = File(...)):
                 "total_processing_seconds": round(total_duration, 2)
             }
         }
+    except ClientDisconnected:
+        logger.info("OCR extraction abandoned: client disconnected")
+        if db_available:
+            await run_blocking(DB_RESOURCE, db.rollback)
+        raise _client_closed()
     except OCRError as e:
         logger.error("OCR extraction failed: %s", e)
         if db_available:
-            db.rollback()
+            await run_blocking(DB_RESOURCE, db.rollback)
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         logger.exception("OCR extraction processing failed")
         if db_available:
-            db.rollback()
+            await run_blocking(DB_RESOURCE, db.rollback)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        db.close()
-        if file_path and os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
+        await run_blocking(DB_RESOURCE, db.close)
+        await run_blocking(IO_RESOURCE, _remove_temp_file, file_path)
 
 
 @app.post("/upload_audio")
 async def upload_audio(
+    request: Request,
     file: UploadFile = File(...),
     source_lang: str = Form("Nepali"),
     target_lang: str = Form("Nepali"),
@@ -584,34 +899,19 @@ async def upload_audio(
     Supported formats: .mp3, .wav, .m4a, .ogg, .webm, .weba, .flac
     """
     filename = file.filename or "unknown"
-    ext = Path(filename).suffix.lower()
-
-    if ext not in SUPPORTED_AUDIO_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Unsupported audio format '{ext}'. "
-                f"Accepted: {sorted(SUPPORTED_AUDIO_EXTENSIONS)}"
-            ),
-        )
 
     import time
     t0 = time.time()
-    file_path = None
+
+    # 1. Save Audio File (Temporary — cleaned up after processing)
+    t_upload_start = time.time()
+    upload = await _save_upload(file, "audio_", AUDIO_KINDS)
+    file_path = upload.path
+    t_upload_end = time.time()
+    upload_duration = t_upload_end - t_upload_start
 
     db = SessionLocal()
     try:
-        # 1. Save Audio File (Temporary — cleaned up after processing)
-        t_upload_start = time.time()
-        suffix = Path(filename).suffix
-        file_content = await file.read()
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False, dir=TEMP_PROCESSING_DIR, prefix="audio_") as tmp:
-            tmp.write(file_content)
-            file_path = tmp.name
-
-        t_upload_end = time.time()
-        upload_duration = t_upload_end - t_upload_start
-
         # Create Document record
         # stored_path records original filename for reference (Java/Angular stores the actual file)
         doc = Document(
@@ -620,7 +920,7 @@ async def upload_audio(
             status="Processing",
         )
         db.add(doc)
-        db.flush() #pushes data to db but doesn't save permanently(still in temporary state)
+        await run_blocking(DB_RESOURCE, db.flush) #pushes data to db but doesn't save permanently(still in temporary state)
         doc_id = doc.id
 
         t_db_init_end = time.time()
@@ -628,8 +928,12 @@ async def upload_audio(
 
         # 2. Audio Transcription 
         t_transcribe_start = time.time()
-        transcription_result = transcription_engine.transcribe(
-            file_path, source_language=source_lang
+        transcription_result = await run_cancellable(
+            TRANSCRIPTION_RESOURCE,
+            transcription_engine.transcribe,
+            file_path,
+            source_language=source_lang,
+            request=request,
         )
         extracted_text = transcription_result["transcribed_text"]
 
@@ -638,7 +942,7 @@ async def upload_audio(
 
         # 3. LLM Translation
         t_llm_start = time.time()
-        translated_text, model_used = translate_text(
+        translated_text, model_used = await translate_text_async(
             extracted_text, source_lang, target_lang
         )
         t_llm_end = time.time()
@@ -665,7 +969,13 @@ async def upload_audio(
         db.add(translated_result)
 
         doc.status = "Completed"
-        db.commit()
+
+        def save_results():
+            db.commit()
+            # Read the ids here: after commit they are reloaded from the DB.
+            return audio_record.id, translated_result.id
+
+        audio_record_id, translation_id = await run_blocking(DB_RESOURCE, save_results)
 
         t_db_final_end = time.time()
         db_final_duration = t_db_final_end - t_db_final_start
@@ -685,8 +995,8 @@ async def upload_audio(
         return {
             "message": "Audio processed successfully",
             "document_id": doc_id,
-            "audio_transcription_id": audio_record.id,
-            "translation_id": translated_result.id,
+            "audio_transcription_id": audio_record_id,
+            "translation_id": translation_id,
             "extracted_text": extracted_text,
             "translated_text": translated_text,
             "language_detected": transcription_result.get("language_detected", ""),
@@ -701,26 +1011,27 @@ async def upload_audio(
                 "total_processing_seconds": round(total_duration, 2),
             },
         }
+    except ClientDisconnected:
+        logger.info("Audio upload abandoned: client disconnected")
+        await run_blocking(DB_RESOURCE, db.rollback)
+        raise _client_closed()
     except TranscriptionError as e:
         logger.error("Transcription failed: %s", e)
-        db.rollback()
+        await run_blocking(DB_RESOURCE, db.rollback)
         raise HTTPException(status_code=422, detail=str(e))
     except Exception as e:
         import traceback
         traceback.print_exc()
-        db.rollback()
+        await run_blocking(DB_RESOURCE, db.rollback)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        db.close()
-        if file_path and os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
+        await run_blocking(DB_RESOURCE, db.close)
+        await run_blocking(IO_RESOURCE, _remove_temp_file, file_path)
 
 
 @app.post("/transcribe")
 async def transcribe_audio_only(
+    request: Request,
     file: UploadFile = File(...),
     source_lang: str = Form("Nepali"),
     force_model: str | None = Form(None),
@@ -730,30 +1041,21 @@ async def transcribe_audio_only(
     Used for live recordings where user may want to review text before translating.
     """
     filename = file.filename or "unknown"
-    ext = Path(filename).suffix.lower()
-
-    if ext not in SUPPORTED_AUDIO_EXTENSIONS:
-        raise HTTPException(
-            status_code=400,
-            detail=(
-                f"Unsupported audio format '{ext}'. "
-                f"Accepted: {sorted(SUPPORTED_AUDIO_EXTENSIONS)}"
-            ),
-        )
 
     import time
     t0 = time.time()
-    file_path = None
+
+    upload = await _save_upload(file, "transcribe_", AUDIO_KINDS)
+    file_path = upload.path
 
     try:
-        suffix = Path(filename).suffix
-        file_content = await file.read()
-        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False, dir=TEMP_PROCESSING_DIR, prefix="transcribe_") as tmp:
-            tmp.write(file_content)
-            file_path = tmp.name
-
-        result = transcription_engine.transcribe(
-            file_path, source_language=source_lang, force_model=force_model
+        result = await run_cancellable(
+            TRANSCRIPTION_RESOURCE,
+            transcription_engine.transcribe,
+            file_path,
+            source_language=source_lang,
+            force_model=force_model,
+            request=request,
         )
 
         duration = time.time() - t0
@@ -768,6 +1070,9 @@ async def transcribe_audio_only(
                 "total_processing_seconds": round(duration, 2),
             },
         }
+    except ClientDisconnected:
+        logger.info("Transcription abandoned: client disconnected")
+        raise _client_closed()
     except TranscriptionError as e:
         logger.error("Transcription failed: %s", e)
         raise HTTPException(status_code=422, detail=str(e))
@@ -775,11 +1080,7 @@ async def transcribe_audio_only(
         logger.error("Transcription error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
     finally:
-        if file_path and os.path.exists(file_path):
-            try:
-                os.unlink(file_path)
-            except OSError:
-                pass
+        await run_blocking(IO_RESOURCE, _remove_temp_file, file_path)
 
 
 @app.websocket("/ws/transcribe")
@@ -5,7 +5,7 @@ from sqlalchemy import pool
 
 from alembic import context
 
-from db.tables import Document, OCRResult, Translation
+from db.tables import Document, OCRResult, Translation, ProcessingJob
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
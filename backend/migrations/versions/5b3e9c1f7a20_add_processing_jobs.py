@@ -0,0 +1,50 @@
+"""add processing_jobs
+
+Revision ID: 5b3e9c1f7a20
+Revises: d69b2716210f
+Create Date: 2026-10-17 10:12:31.482913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b3e9c1f7a20'
+down_revision: Union[str, Sequence[str], None] = 'd69b2716210f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('processing_jobs',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=True),
+    sa.Column('stages', sa.JSON(), nullable=True),
+    sa.Column('original_filename', sa.String(), nullable=True),
+    sa.Column('spool_path', sa.String(), nullable=True),
+    sa.Column('content_digest', sa.String(), nullable=True),
+    sa.Column('source_lang', sa.String(), nullable=False),
+    sa.Column('target_lang', sa.String(), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('lease_owner', sa.String(), nullable=True),
+    sa.Column('lease_expires_at', sa.DateTime(), nullable=True),
+    sa.Column('ocr_result', sa.JSON(), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_processing_jobs_status'), 'processing_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_processing_jobs_status'), table_name='processing_jobs')
+    op.drop_table('processing_jobs')
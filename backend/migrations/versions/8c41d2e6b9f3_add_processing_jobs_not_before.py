@@ -0,0 +1,28 @@
+"""add processing_jobs.not_before
+
+Revision ID: 8c41d2e6b9f3
+Revises: 5b3e9c1f7a20
+Create Date: 2026-10-17 14:05:12.318406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41d2e6b9f3'
+down_revision: Union[str, Sequence[str], None] = '5b3e9c1f7a20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('processing_jobs', sa.Column('not_before', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('processing_jobs', 'not_before')
@@ -0,0 +1,248 @@
+"""
+Result Cache Module
+===================
+A small two-tier, content-addressed cache for JSON-serializable results
+(OCR page results, translations).
+
+- **Memory tier**: an LRU of serialized entries bounded by entry count and
+  by approximate size (serialized length), so hits never hand out a dict
+  that another request could mutate and a few large OCR results with word
+  boxes cannot pin hundreds of megabytes.
+- **Disk tier**: one JSON file per key under a sharded directory, written
+  atomically. When the directory grows past its byte budget the least
+  recently used files (by mtime, refreshed on every hit) are evicted.
+
+Keys are built with `make_cache_key` from any JSON-serializable parts,
+typically a content digest plus a configuration fingerprint.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_ROOT = os.path.join(os.path.expanduser("~"), ".cache", "neptext")
+# Evict down to this fraction of the disk budget, so eviction runs rarely.
+_DISK_EVICT_TARGET = 0.9
+_HASH_CHUNK_BYTES = 1024 * 1024
+# Marks a memory-tier hit whose payload has not been parsed yet.
+_UNPARSED = object()
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Stable SHA-256 key over JSON-serializable parts."""
+    payload = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def file_sha256(file_path: str) -> str:
+    """SHA-256 hex digest of a file's bytes, read in chunks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(_HASH_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Memory LRU in front of a size-bounded on-disk JSON store."""
+
+    def __init__(
+        self,
+        name: str,
+        directory: Optional[str],
+        memory_entries: int = 128,
+        memory_max_bytes: int = 64 * 1024 * 1024,
+        disk_max_bytes: int = 512 * 1024 * 1024,
+    ):
+        self.name = name
+        self.directory = directory
+        self.memory_entries = max(0, memory_entries)
+        self.memory_max_bytes = max(0, memory_max_bytes)
+        self.disk_max_bytes = max(0, disk_max_bytes)
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._disk_bytes: Optional[int] = None
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh copy of the cached value, or None on a miss."""
+        with self._lock:
+            payload = self._memory.get(key)
+            if payload is not None:
+                self._memory.move_to_end(key)
+        value = _UNPARSED
+        if payload is None:
+            payload = self._read_disk(key)
+            if payload is not None:
+                try:
+                    value = json.loads(payload)
+                except ValueError as exc:
+                    # A truncated or corrupt file is a miss; drop it so it is rewritten.
+                    logger.warning("[%s cache] discarding corrupt entry %s: %s", self.name, key[:12], exc)
+                    self._discard_disk(key)
+                    payload = None
+                else:
+                    self._remember(key, payload)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return json.loads(payload) if value is _UNPARSED else value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store *value* in both tiers; unserializable values are skipped."""
+        try:
+            payload = json.dumps(value, ensure_ascii=False)
+        except (TypeError, ValueError) as exc:
+            logger.warning("[%s cache] value for %s is not cacheable: %s", self.name, key[:12], exc)
+            return
+        self._remember(key, payload)
+        self._write_disk(key, payload)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "name": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
+
+    # ------------------------------------------------------------------
+    # Memory tier
+    # ------------------------------------------------------------------
+    def _remember(self, key: str, payload: str) -> None:
+        # String length approximates the footprint; exact sizes do not matter.
+        size = len(payload)
+        if not self.memory_entries or size > self.memory_max_bytes:
+            return
+        with self._lock:
+            previous = self._memory.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= len(previous)
+            self._memory[key] = payload
+            self._memory_bytes += size
+            while (
+                len(self._memory) > self.memory_entries
+                or self._memory_bytes > self.memory_max_bytes
+            ):
+                _, evicted = self._memory.popitem(last=False)
+                self._memory_bytes -= len(evicted)
+
+    # ------------------------------------------------------------------
+    # Disk tier
+    # ------------------------------------------------------------------
+    def _path_for(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def _read_disk(self, key: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        path = self._path_for(key)
+        try:
+            with open(path, "r", encoding="utf-8") as handle:
+                payload = handle.read()
+            # mtime doubles as the LRU clock for eviction.
+            os.utime(path, None)
+            return payload
+        except FileNotFoundError:
+            return None
+        except OSError as exc:
+            logger.warning("[%s cache] could not read %s: %s", self.name, path, exc)
+            return None
+
+    def _discard_disk(self, key: str) -> None:
+        path = self._path_for(key)
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._disk_bytes is not None:
+                self._disk_bytes = max(0, self._disk_bytes - size)
+
+    def _write_disk(self, key: str, payload: str) -> None:
+        if not self.directory or not self.disk_max_bytes:
+            return
+        path = self._path_for(key)
+        data = payload.encode("utf-8")
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as handle:
+                handle.write(data)
+            try:
+                replaced = os.path.getsize(path)
+            except FileNotFoundError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as exc:
+            logger.warning("[%s cache] could not write %s: %s", self.name, path, exc)
+            return
+
+        with self._lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = self._scan_disk_bytes()
+            else:
+                # Overwriting an entry only adds the size difference.
+                self._disk_bytes += len(data) - replaced
+            over_budget = self._disk_bytes > self.disk_max_bytes
+        if over_budget:
+            self._evict()
+
+    def _iter_disk_entries(self):
+        for root, _, files in os.walk(self.directory):
+            for filename in files:
+                if not filename.endswith(".json"):
+                    continue
+                path = os.path.join(root, filename)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                yield stat.st_mtime, stat.st_size, path
+
+    def _scan_disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._iter_disk_entries())
+
+    def _evict(self) -> None:
+        """Delete least recently used files until under the target size."""
+        started = time.time()
+        entries = sorted(self._iter_disk_entries())
+        total = sum(size for _, size, _ in entries)
+        target = int(self.disk_max_bytes * _DISK_EVICT_TARGET)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        with self._lock:
+            self._disk_bytes = total
+        logger.info(
+            "[%s cache] evicted %d file(s) in %.2fs; %d bytes on disk",
+            self.name,
+            removed,
+            time.time() - started,
+            total,
+        )
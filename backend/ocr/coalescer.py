@@ -0,0 +1,138 @@
+"""
+Request Coalescer Module
+========================
+Cross-request micro-batching for asyncio callers.
+
+Concurrent requests that share a key (for translation: source language,
+target language, repair mode) are held for at most `max_wait` seconds and
+handed to one `batch_fn(key, items)` call, whose results are fanned back
+to each waiting caller in order. A batch is flushed early once it reaches
+`max_items` or `max_weight`, so the added latency is bounded by `max_wait`
+and batches never exceed what one model request can carry.
+
+Under bursts of small requests this turns many model calls into a few,
+which is what counts against per-minute request quotas.
+"""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingBatch:
+    items: list = field(default_factory=list)
+    futures: list = field(default_factory=list)
+    weight: int = 0
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class RequestCoalescer:
+    """Merge concurrent same-key requests into batched calls."""
+
+    def __init__(
+        self,
+        batch_fn: Callable[[Hashable, list], Awaitable[list]],
+        max_wait: float = 0.015,
+        max_items: int = 50,
+        max_weight: Optional[int] = None,
+        name: str = "coalescer",
+    ):
+        self.batch_fn = batch_fn
+        self.max_wait = max(0.0, max_wait)
+        self.max_items = max(1, max_items)
+        self.max_weight = max_weight
+        self.name = name
+        self._pending: dict[Hashable, _PendingBatch] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, key: Hashable, item: Any, weight: int = 1) -> Any:
+        """Queue *item* under *key* and wait for its result from `batch_fn`."""
+        loop = asyncio.get_running_loop()
+        batch = self._pending.get(key)
+        if batch is not None and self.max_weight is not None and batch.items and (
+            batch.weight + weight > self.max_weight
+        ):
+            self._flush(key)
+            batch = None
+        if batch is None:
+            batch = self._pending[key] = _PendingBatch()
+            batch.timer = loop.call_later(self.max_wait, self._flush, key, batch)
+
+        future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        batch.weight += weight
+        if len(batch.items) >= self.max_items:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Hashable, expected: Optional[_PendingBatch] = None) -> None:
+        batch = self._pending.get(key)
+        # A timer can fire after its batch was already flushed for size.
+        if batch is None or (expected is not None and batch is not expected):
+            return
+        del self._pending[key]
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        # Callers that gave up (client disconnects) are dropped before the call.
+        live = [
+            (item, future)
+            for item, future in zip(batch.items, batch.futures)
+            if not future.cancelled()
+        ]
+        if not live:
+            return
+        task = asyncio.ensure_future(self._run(key, live))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: Hashable, live: list[tuple[Any, asyncio.Future]]) -> None:
+        started = time.time()
+        items = [item for item, _ in live]
+        self.batches += 1
+        self.items += len(items)
+        try:
+            results = await self.batch_fn(key, items)
+            if len(results) != len(items):
+                raise RuntimeError(
+                    f"{self.name}: batch_fn returned {len(results)} results for {len(items)} items"
+                )
+        except Exception as exc:
+            logger.warning("[%s] batch of %d failed: %s", self.name, len(items), exc)
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        except BaseException:
+            # Cancelled (shutdown, or inside batch_fn): fail the waiters
+            # rather than leave them pending forever.
+            error = RuntimeError(f"{self.name}: batch was cancelled")
+            for _, future in live:
+                if not future.done():
+                    future.set_exception(error)
+            raise
+        for (_, future), result in zip(live, results):
+            if not future.done():
+                future.set_result(result)
+        if len(items) > 1:
+            logger.info(
+                "[%s] coalesced %d requests in %.2fs",
+                self.name,
+                len(items),
+                time.time() - started,
+            )
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "pending_keys": len(self._pending),
+        }
@@ -0,0 +1,185 @@
+"""
+Document Pipeline Module
+========================
+OCR + translation of a whole document as a stream of per-page events.
+
+`document_events` runs `OCREngine.process_detailed` off the event loop (see
+execution/offload.py) and starts translating each page as soon as that
+page's OCR finishes, instead of waiting for the whole document. It yields:
+
+- ``page_rasterized``: a page image was produced and queued for OCR.
+- ``page_ocr``: a page's text, confidence, OCR strategy and quality.
+- ``page_translated``: a page's translation and the model used.
+- ``document``: last, the full OCR result plus the translated text in page
+  order (joined like `translate_text` joins a list of pages).
+
+Page events arrive in completion order; every event carries its 1-based
+page number. Closing the generator early (client disconnect) cancels the
+remaining OCR and translation work.
+
+OCR'd pages wait for translation in a bounded page queue: with
+DOCUMENT_PIPELINE_MAX_PAGES pages OCR'd but not yet translated, the OCR
+thread blocks until a translation finishes. Total time approaches
+max(OCR, translation) rather than their sum, without piling up pages when
+the model is the slower side.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import AsyncIterator, Optional
+
+from execution.offload import run_ocr
+from ocr.translator import _combine_model_names, translate_text_async
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_PIPELINE_MAX_PAGES = int(os.getenv("DOCUMENT_PIPELINE_MAX_PAGES", "4"))
+# How often a blocked OCR thread checks whether the pipeline was closed.
+_QUEUE_POLL_SECONDS = 0.5
+
+_OCR_FINISHED = object()
+
+
+async def _translate_page(
+    page: int,
+    text: str,
+    source_lang: str,
+    target_lang: str,
+) -> tuple[int, str, str]:
+    translated_text, model_used = await translate_text_async(
+        text,
+        source_lang,
+        target_lang,
+        repair_ocr=True,
+    )
+    return page, translated_text, model_used
+
+
+async def document_events(
+    ocr_engine,
+    file_path: str,
+    source_lang: str,
+    target_lang: str,
+    request=None,
+    content_digest: Optional[str] = None,
+    max_pages: int = DOCUMENT_PIPELINE_MAX_PAGES,
+) -> AsyncIterator[dict]:
+    """
+    OCR *file_path* and translate it page by page, yielding progress events.
+
+    At most *max_pages* OCR'd pages wait for or undergo translation at once.
+
+    Raises:
+        OCRError: If OCR fails.
+        ClientDisconnected: If *request*'s client went away during OCR.
+        Exception: Whatever a page translation raised; the remaining work
+            is cancelled.
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    started = time.time()
+    page_slots = threading.Semaphore(max(1, max_pages))
+    closed = threading.Event()
+
+    def on_progress(event: dict) -> None:
+        # Called on the OCR worker thread.
+        if event.get("type") == "page_ocr":
+            # Backpressure: wait for a free slot in the page queue. Give up
+            # once the pipeline is closed; the OCR's cancel event is set by
+            # then, so no further pages are scheduled.
+            while not page_slots.acquire(timeout=_QUEUE_POLL_SECONDS):
+                if closed.is_set():
+                    return
+        loop.call_soon_threadsafe(events.put_nowait, event)
+
+    ocr_task = asyncio.ensure_future(
+        run_ocr(
+            ocr_engine,
+            file_path,
+            request=request,
+            content_digest=content_digest,
+            progress_callback=on_progress,
+        )
+    )
+    # Queued after every progress event the OCR thread scheduled.
+    ocr_task.add_done_callback(lambda _: events.put_nowait(_OCR_FINISHED))
+
+    translations: dict[int, asyncio.Task] = {}
+    translated: dict[int, tuple[str, str]] = {}
+    # Pages holding a slot in the page queue until their translation is done.
+    queued_pages: set[int] = set()
+    ocr_seconds = 0.0
+
+    def finish_page(page: int, translated_text: str, model_used: str) -> None:
+        translated[page] = (translated_text, model_used)
+        if page in queued_pages:
+            queued_pages.discard(page)
+            page_slots.release()
+
+    def start_translation(page: int, text: str) -> Optional[dict]:
+        if page in translations or page in translated:
+            return None
+        if not text.strip():
+            finish_page(page, "", "")
+            return {"type": "page_translated", "page": page, "translated_text": "", "model_used": None}
+        task = asyncio.ensure_future(_translate_page(page, text, source_lang, target_lang))
+        task.add_done_callback(events.put_nowait)
+        translations[page] = task
+        return None
+
+    try:
+        ocr_done = False
+        while not ocr_done or len(translated) < len(ocr_task.result()["pages"]):
+            item = await events.get()
+
+            if item is _OCR_FINISHED:
+                ocr_done = True
+                ocr_seconds = time.time() - started
+                pages = ocr_task.result()["pages"]
+                # Normally every page was already reported; this covers any
+                # that were not (e.g. an engine without progress events).
+                for idx, page in enumerate(pages):
+                    event = start_translation(idx + 1, page.get("text", ""))
+                    if event is not None:
+                        yield event
+                continue
+
+            if isinstance(item, asyncio.Task):
+                page, translated_text, model_used = item.result()
+                finish_page(page, translated_text, model_used)
+                yield {
+                    "type": "page_translated",
+                    "page": page,
+                    "translated_text": translated_text,
+                    "model_used": model_used,
+                }
+                continue
+
+            if item.get("type") == "page_ocr":
+                queued_pages.add(item["page"])
+            yield item
+            if item.get("type") == "page_ocr":
+                event = start_translation(item["page"], item.get("text", ""))
+                if event is not None:
+                    yield event
+
+        ocr_result = ocr_task.result()
+        page_numbers = range(1, len(ocr_result["pages"]) + 1)
+        yield {
+            "type": "document",
+            "ocr_result": ocr_result,
+            "translated_pages": [translated[page][0] for page in page_numbers],
+            "translated_text": "\n\n".join(translated[page][0] for page in page_numbers),
+            "model_used": _combine_model_names(*(translated[page][1] for page in page_numbers)),
+            "ocr_seconds": round(ocr_seconds, 2),
+        }
+    finally:
+        closed.set()
+        pending = [task for task in (ocr_task, *translations.values()) if not task.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -0,0 +1,384 @@
+"""
+LLM Dispatch Module
+===================
+Latency-aware hedged dispatch across an ordered list of Gemini models.
+
+Instead of sending every request to every model at once, the preferred
+model is called first. A backup ("hedge") is launched only if the first
+call has not finished after a delay derived from that model's observed p90
+latency, or straight away if a call fails. The first valid response wins and
+the remaining calls are cancelled or abandoned.
+
+Per-model latency and error rates are tracked as in-process EWMAs. Batch
+requests (several segments in one JSON call, including coalesced ones) run
+much longer than single segments, so their latency is tracked separately
+and sets only their own hedge delay; errors count against the model either
+way. Models with a high recent error rate are moved behind healthy ones, so
+a model that is out of quota stops being tried first. When a
+`ModelHealthRegistry` is given, models whose circuit breaker is open are
+skipped altogether.
+"""
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, Sequence
+
+from execution.pools import LLM_DISPATCH_POOL, get_pool
+from ocr.model_health import ModelHealthRegistry
+
+logger = logging.getLogger(__name__)
+
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING", "1") != "0"
+# Upper bound on models in flight for one request (including the first).
+LLM_HEDGE_MAX_IN_FLIGHT = int(os.getenv("LLM_HEDGE_MAX_IN_FLIGHT", "2"))
+LLM_HEDGE_INITIAL_DELAY_MS = int(os.getenv("LLM_HEDGE_INITIAL_DELAY_MS", "2500"))
+LLM_HEDGE_MIN_DELAY_MS = int(os.getenv("LLM_HEDGE_MIN_DELAY_MS", "800"))
+LLM_HEDGE_MAX_DELAY_MS = int(os.getenv("LLM_HEDGE_MAX_DELAY_MS", "8000"))
+LLM_EWMA_ALPHA = 0.2
+# Samples needed before a model's own latency replaces the initial delay.
+LLM_MIN_LATENCY_SAMPLES = 5
+# Models whose recent error rate exceeds this are tried after healthy ones.
+LLM_UNHEALTHY_ERROR_RATE = 0.5
+# z-score of the 90th percentile for the normal approximation of latency.
+_P90_Z = 1.2816
+
+
+@dataclass
+class DispatchResult:
+    value: Any
+    model: str
+    hedges: int
+    attempts: int
+    seconds: float
+
+
+class DispatchError(Exception):
+    """Raised when every model failed for a request."""
+
+    def __init__(self, message: str, last_error: Optional[BaseException] = None):
+        super().__init__(message)
+        self.last_error = last_error
+
+
+class ModelStats:
+    """EWMA latency (mean/variance) and error rate for one model."""
+
+    def __init__(self):
+        self.latency_mean = 0.0
+        self.latency_var = 0.0
+        self.error_rate = 0.0
+        self.samples = 0
+        self.errors = 0
+
+    def record_success(self, seconds: float) -> None:
+        if self.samples == 0:
+            self.latency_mean = seconds
+        else:
+            delta = seconds - self.latency_mean
+            self.latency_mean += LLM_EWMA_ALPHA * delta
+            self.latency_var = (1 - LLM_EWMA_ALPHA) * (
+                self.latency_var + LLM_EWMA_ALPHA * delta * delta
+            )
+        self.samples += 1
+        self.error_rate *= 1 - LLM_EWMA_ALPHA
+
+    def record_error(self) -> None:
+        self.errors += 1
+        self.error_rate = self.error_rate * (1 - LLM_EWMA_ALPHA) + LLM_EWMA_ALPHA
+
+    def p90_seconds(self) -> Optional[float]:
+        if self.samples < LLM_MIN_LATENCY_SAMPLES:
+            return None
+        return self.latency_mean + _P90_Z * math.sqrt(max(self.latency_var, 0.0))
+
+    def snapshot(self) -> dict:
+        p90 = self.p90_seconds()
+        return {
+            "latency_mean_seconds": round(self.latency_mean, 3),
+            "latency_p90_seconds": round(p90, 3) if p90 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "samples": self.samples,
+            "errors": self.errors,
+        }
+
+
+class HedgedDispatcher:
+    """Dispatch one call across ordered models with delayed hedging."""
+
+    def __init__(
+        self,
+        models: Sequence[str],
+        max_in_flight: int = LLM_HEDGE_MAX_IN_FLIGHT,
+        hedging: bool = LLM_HEDGING_ENABLED,
+        health: Optional[ModelHealthRegistry] = None,
+    ):
+        self.models = list(models)
+        self.health = health
+        # Hedging off restores the old behaviour: every model at once.
+        self.max_in_flight = max(1, max_in_flight) if hedging else len(self.models)
+        self.hedging = hedging
+        self._stats = {model: ModelStats() for model in self.models}
+        # Latency of batch requests only; their errors go to `_stats`.
+        self._batch_stats = {model: ModelStats() for model in self.models}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Policy
+    # ------------------------------------------------------------------
+    def ranked_models(self) -> list[str]:
+        """Configured order, with recently failing models moved last."""
+        with self._lock:
+            unhealthy = {
+                model for model, stats in self._stats.items()
+                if stats.error_rate > LLM_UNHEALTHY_ERROR_RATE
+            }
+        healthy = [model for model in self.models if model not in unhealthy]
+        return healthy + [model for model in self.models if model in unhealthy]
+
+    def hedge_delay(self, model: str, batch: bool = False) -> float:
+        """Seconds to wait on *model* before launching a backup."""
+        if not self.hedging:
+            return 0.0
+        with self._lock:
+            stats = self._batch_stats if batch else self._stats
+            p90 = stats[model].p90_seconds()
+        delay = p90 if p90 is not None else LLM_HEDGE_INITIAL_DELAY_MS / 1000.0
+        return min(max(delay, LLM_HEDGE_MIN_DELAY_MS / 1000.0), LLM_HEDGE_MAX_DELAY_MS / 1000.0)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                model: {**stats.snapshot(), "batch": self._batch_stats[model].snapshot()}
+                for model, stats in self._stats.items()
+            }
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def _record_success(self, model: str, seconds: float, batch: bool = False) -> None:
+        with self._lock:
+            if batch:
+                self._batch_stats[model].record_success(seconds)
+                # Success still decays the model's error rate.
+                self._stats[model].error_rate *= 1 - LLM_EWMA_ALPHA
+            else:
+                self._stats[model].record_success(seconds)
+        if self.health is not None:
+            self.health.record_success(model)
+
+    def _record_error(self, model: str, exc: BaseException) -> None:
+        with self._lock:
+            self._stats[model].record_error()
+        if self.health is not None:
+            self.health.record_failure(model, exc)
+
+    def _next_model(self, queue: list[str]) -> Optional[str]:
+        """Pop the next model whose circuit breaker admits a call."""
+        while queue:
+            model = queue.pop(0)
+            if self.health is None or self.health.acquire(model):
+                return model
+            logger.info("[LLM dispatch] skipping %s: circuit open", model)
+        return None
+
+    def _timed_call(self, call: Callable[[str], Any], model: str, batch: bool) -> Any:
+        started = time.time()
+        try:
+            value = call(model)
+        except Exception as exc:
+            self._record_error(model, exc)
+            raise
+        self._record_success(model, time.time() - started, batch)
+        return value
+
+    async def _timed_call_async(
+        self,
+        call: Callable[[str], Awaitable[Any]],
+        model: str,
+        batch: bool,
+    ) -> Any:
+        started = time.time()
+        try:
+            value = await call(model)
+        except asyncio.CancelledError:
+            # A cancelled loser says nothing about the model's health.
+            if self.health is not None:
+                self.health.release(model)
+            raise
+        except Exception as exc:
+            self._record_error(model, exc)
+            raise
+        self._record_success(model, time.time() - started, batch)
+        return value
+
+    def dispatch(self, call: Callable[[str], Any], batch: bool = False) -> DispatchResult:
+        """
+        Run ``call(model)`` until one model succeeds.
+
+        *batch* marks a multi-segment request, which is timed and hedged
+        against batch latencies rather than single-segment ones.
+
+        A new model is launched when the oldest in-flight call outlives its
+        hedge delay (a hedge) or when a call fails (a failover), keeping at
+        most `max_in_flight` calls running. Losing calls are cancelled if
+        not yet started; running ones are abandoned but still update stats.
+        Calls run on the shared `llm_dispatch` pool, so callers must not
+        themselves be running on that pool.
+
+        Raises:
+            DispatchError: If every model failed.
+        """
+        started = time.time()
+        queue = self.ranked_models()
+        executor = get_pool(LLM_DISPATCH_POOL)
+        in_flight: dict = {}
+        hedges = 0
+        attempts = 0
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            nonlocal attempts
+            model = self._next_model(queue)
+            if model is None:
+                return False
+            future = executor.submit(self._timed_call, call, model, batch)
+            in_flight[future] = (model, time.time())
+            attempts += 1
+            return True
+
+        try:
+            while queue and len(in_flight) < self.max_in_flight and (
+                not self.hedging or not in_flight
+            ):
+                launch()
+            while in_flight:
+                timeout = None
+                if queue and len(in_flight) < self.max_in_flight:
+                    oldest_model, launched_at = min(in_flight.values(), key=lambda item: item[1])
+                    timeout = max(
+                        0.0,
+                        launched_at + self.hedge_delay(oldest_model, batch) - time.time(),
+                    )
+                done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                if not done:
+                    if launch():
+                        hedges += 1
+                    continue
+                for future in done:
+                    model, _ = in_flight.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as exc:
+                        last_error = exc
+                        logger.info("[LLM dispatch] %s failed: %s", model, exc)
+                        continue
+                    for pending in in_flight:
+                        pending.cancel()
+                    return DispatchResult(
+                        value=value,
+                        model=model,
+                        hedges=hedges,
+                        attempts=attempts,
+                        seconds=time.time() - started,
+                    )
+                # Fail over immediately instead of waiting for a hedge delay.
+                while queue and len(in_flight) < self.max_in_flight and (
+                    not self.hedging or not in_flight
+                ):
+                    launch()
+        finally:
+            for pending in in_flight:
+                pending.cancel()
+
+        if not attempts:
+            raise DispatchError("No model available: every circuit breaker is open")
+        raise DispatchError(f"All {attempts} model(s) failed", last_error)
+
+    async def dispatch_async(
+        self,
+        call: Callable[[str], Awaitable[Any]],
+        batch: bool = False,
+    ) -> DispatchResult:
+        """
+        Async variant of `dispatch` for coroutine calls.
+
+        Same hedge/failover policy, but calls run as tasks on the running
+        event loop instead of the `llm_dispatch` pool, and losing calls are
+        actually cancelled rather than abandoned.
+
+        Raises:
+            DispatchError: If every model failed.
+        """
+        started = time.time()
+        queue = self.ranked_models()
+        in_flight: dict[asyncio.Task, tuple[str, float]] = {}
+        hedges = 0
+        attempts = 0
+        last_error: Optional[BaseException] = None
+
+        def launch() -> bool:
+            nonlocal attempts
+            model = self._next_model(queue)
+            if model is None:
+                return False
+            task = asyncio.ensure_future(self._timed_call_async(call, model, batch))
+            in_flight[task] = (model, time.time())
+            attempts += 1
+            return True
+
+        try:
+            while queue and len(in_flight) < self.max_in_flight and (
+                not self.hedging or not in_flight
+            ):
+                launch()
+            while in_flight:
+                timeout = None
+                if queue and len(in_flight) < self.max_in_flight:
+                    oldest_model, launched_at = min(in_flight.values(), key=lambda item: item[1])
+                    timeout = max(
+                        0.0,
+                        launched_at + self.hedge_delay(oldest_model, batch) - time.time(),
+                    )
+                done, _ = await asyncio.wait(
+                    in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    if launch():
+                        hedges += 1
+                    continue
+                for task in done:
+                    model, _ = in_flight.pop(task)
+                    try:
+                        value = task.result()
+                    except Exception as exc:
+                        last_error = exc
+                        logger.info("[LLM dispatch] %s failed: %s", model, exc)
+                        continue
+                    return DispatchResult(
+                        value=value,
+                        model=model,
+                        hedges=hedges,
+                        attempts=attempts,
+                        seconds=time.time() - started,
+                    )
+                # Fail over immediately instead of waiting for a hedge delay.
+                while queue and len(in_flight) < self.max_in_flight and (
+                    not self.hedging or not in_flight
+                ):
+                    launch()
+        finally:
+            # Runs on success, failure and caller cancellation alike.
+            for pending in in_flight:
+                pending.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+        if not attempts:
+            raise DispatchError("No model available: every circuit breaker is open")
+        raise DispatchError(f"All {attempts} model(s) failed", last_error)
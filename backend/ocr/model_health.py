@@ -0,0 +1,197 @@
+"""
+Model Health Module
+===================
+Per-model circuit breakers shared by the Gemini OCR fallbacks and the
+translator.
+
+Each model name has a breaker with three states:
+
+- **closed**: calls go through; consecutive failures are counted.
+- **open**: after `MODEL_BREAKER_FAILURE_THRESHOLD` consecutive failures or
+  timeouts the model is skipped immediately, without waiting for its
+  request timeout, for `MODEL_BREAKER_COOLDOWN_SECONDS`.
+- **half-open**: once the cooldown has passed, a single probe call is let
+  through. Success closes the breaker; failure opens it again.
+
+State is per process. PDF pages OCR'd in the page process pool keep their
+own breakers, which still spares the remaining pages of a document.
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MODEL_BREAKER_ENABLED = os.getenv("MODEL_CIRCUIT_BREAKER", "1") != "0"
+MODEL_BREAKER_FAILURE_THRESHOLD = int(os.getenv("MODEL_BREAKER_FAILURE_THRESHOLD", "3"))
+MODEL_BREAKER_COOLDOWN_SECONDS = float(os.getenv("MODEL_BREAKER_COOLDOWN_SECONDS", "60"))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def is_timeout_error(exc: BaseException) -> bool:
+    """Best-effort check for client/SDK timeouts across httpx and google-genai."""
+    if isinstance(exc, TimeoutError):
+        return True
+    if "timeout" in type(exc).__name__.lower():
+        return True
+    message = str(exc).lower()
+    return "timed out" in message or "deadline" in message or "timeout" in message
+
+
+def _is_request_error(exc: BaseException) -> bool:
+    """400-class request problems say nothing about the model's health."""
+    return getattr(exc, "code", None) == 400
+
+
+class ModelBreaker:
+    """Circuit breaker state for one model."""
+
+    def __init__(self):
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.probe_started: Optional[float] = None
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.skipped = 0
+        self.last_error = ""
+
+    def snapshot(self, now: float, cooldown_seconds: float) -> dict:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = max(0.0, self.opened_at + cooldown_seconds - now)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": round(retry_in, 1) if retry_in is not None else None,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "skipped": self.skipped,
+            "last_error": self.last_error,
+        }
+
+
+class ModelHealthRegistry:
+    """Thread-safe registry of per-model circuit breakers."""
+
+    def __init__(
+        self,
+        failure_threshold: int = MODEL_BREAKER_FAILURE_THRESHOLD,
+        cooldown_seconds: float = MODEL_BREAKER_COOLDOWN_SECONDS,
+        enabled: bool = MODEL_BREAKER_ENABLED,
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = max(0.0, cooldown_seconds)
+        self.enabled = enabled
+        self._breakers: dict[str, ModelBreaker] = {}
+        self._lock = threading.Lock()
+
+    def _breaker(self, model: str) -> ModelBreaker:
+        breaker = self._breakers.get(model)
+        if breaker is None:
+            breaker = self._breakers[model] = ModelBreaker()
+        return breaker
+
+    # ------------------------------------------------------------------
+    # Call gating
+    # ------------------------------------------------------------------
+    def acquire(self, model: str) -> bool:
+        """
+        Whether a call to *model* may start now.
+
+        An open breaker whose cooldown has passed turns half-open and hands
+        out one probe; further callers are refused until the probe reports
+        back (or has been outstanding for a whole cooldown, in case its
+        caller was abandoned).
+        """
+        if not self.enabled:
+            return True
+        now = time.time()
+        with self._lock:
+            breaker = self._breaker(model)
+            if breaker.state == CLOSED:
+                return True
+            if breaker.state == OPEN and now - breaker.opened_at >= self.cooldown_seconds:
+                breaker.state = HALF_OPEN
+                breaker.probe_started = None
+                logger.info("[Model health] %s half-open, probing", model)
+            if breaker.state == HALF_OPEN and (
+                breaker.probe_started is None
+                or now - breaker.probe_started >= self.cooldown_seconds
+            ):
+                breaker.probe_started = now
+                return True
+            breaker.skipped += 1
+            return False
+
+    # ------------------------------------------------------------------
+    # Outcomes
+    # ------------------------------------------------------------------
+    def record_success(self, model: str) -> None:
+        with self._lock:
+            breaker = self._breaker(model)
+            breaker.successes += 1
+            breaker.consecutive_failures = 0
+            breaker.probe_started = None
+            if breaker.state != CLOSED:
+                logger.info("[Model health] %s recovered, breaker closed", model)
+                breaker.state = CLOSED
+
+    def record_failure(self, model: str, exc: BaseException) -> None:
+        """Count a failed call; request-specific 400 errors are ignored."""
+        if _is_request_error(exc):
+            self.release(model)
+            return
+        timed_out = is_timeout_error(exc)
+        with self._lock:
+            breaker = self._breaker(model)
+            breaker.failures += 1
+            breaker.timeouts += 1 if timed_out else 0
+            breaker.consecutive_failures += 1
+            breaker.last_error = f"{type(exc).__name__}: {exc}"[:300]
+            breaker.probe_started = None
+            trip = breaker.state == HALF_OPEN or (
+                breaker.state == CLOSED
+                and breaker.consecutive_failures >= self.failure_threshold
+            )
+            if trip:
+                breaker.state = OPEN
+                breaker.opened_at = time.time()
+            consecutive_failures = breaker.consecutive_failures
+            last_error = breaker.last_error
+        if trip:
+            logger.warning(
+                "[Model health] %s breaker open for %.0fs after %d failure(s): %s",
+                model,
+                self.cooldown_seconds,
+                consecutive_failures,
+                last_error,
+            )
+
+    def release(self, model: str) -> None:
+        """Give back a half-open probe whose call was cancelled or inconclusive."""
+        with self._lock:
+            breaker = self._breakers.get(model)
+            if breaker is not None:
+                breaker.probe_started = None
+
+    def snapshot(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {model: breaker.snapshot(now, self.cooldown_seconds) for model, breaker in self._breakers.items()}
+
+
+_registry = ModelHealthRegistry()
+
+
+def get_model_health() -> ModelHealthRegistry:
+    """Process-wide model health registry."""
+    return _registry
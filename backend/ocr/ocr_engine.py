@@ -18,12 +18,23 @@ intelligent fallback mechanism.
 
 """
 # pyre-ignore-all-errors
+import itertools
 import json
+import multiprocessing
 import os
+import re
 import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
-from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, Optional
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    as_completed,
+    wait,
+)
+from concurrent.futures.process import BrokenProcessPool
 
 # Suppress OpenMP/Threading warnings from PyTorch/OpenCV conflict
 os.environ["KMP_DUPLICATE_LIB_OK"] = "TRUE"
@@ -40,8 +51,14 @@ from PIL import Image as PILImage
 
 from ocr.preprocessing import (
     preprocess_array,
+    resize_image,
+    PreprocessingGraph,
     DEFAULT_CONFIG as PREPROCESS_DEFAULT_CONFIG,
 )
+from ocr.psm_scheduler import get_psm_scheduler, page_features
+from ocr.cache import DEFAULT_CACHE_ROOT, ResultCache, file_sha256, make_cache_key
+from ocr.model_health import get_model_health
+from execution.pools import IMAGE_POOL, POOL_SIZES, TESSERACT_POOL, get_pool, is_pool_thread
 
 logger = logging.getLogger(__name__)
 
@@ -49,8 +66,9 @@ SUPPORTED_IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".bmp", ".tiff", ".tif"}
 SUPPORTED_PDF_EXTENSIONS = {".pdf"}
 SUPPORTED_WORD_EXTENSIONS = {".docx", ".doc"}
 SUPPORTED_EXTENSIONS = SUPPORTED_IMAGE_EXTENSIONS | SUPPORTED_PDF_EXTENSIONS | SUPPORTED_WORD_EXTENSIONS
-PDF_DIRECT_TEXT_MIN_CHARS = 80
-PDF_DIRECT_TEXT_MIN_WORDS = 12
+# A PDF page whose text layer reaches either threshold skips OCR.
+PDF_PAGE_TEXT_MIN_CHARS = 40
+PDF_PAGE_TEXT_MIN_WORDS = 6
 PDF_SCANNER_ARTIFACT_LINES = {
     "camscanner",
     "scanned with camscanner",
@@ -67,9 +85,34 @@ AI_OCR_MODELS = (
     "gemini-2.5-pro",
 )
 AI_OCR_TIMEOUT_MS = 30000
+# Rasterization resolution for scanned PDF pages (see _iter_pdf_page_images).
+PDF_RASTER_DPI = 150
+# Scanned pages whose single embedded image covers at least this fraction of
+# the page are OCR'd from that image at native resolution (no re-render).
+PDF_EMBEDDED_IMAGE_MIN_COVERAGE = 0.9
+PDF_EMBEDDED_IMAGE_EXTRACTION = os.getenv("OCR_PDF_EMBEDDED_IMAGES", "1") != "0"
+# Shared process pool for PDF pages, and the per-document cap on pages in
+# flight so one large PDF cannot occupy every worker.
+PDF_PAGE_POOL_WORKERS = int(os.getenv("OCR_PDF_POOL_WORKERS", str(os.cpu_count() or 1)))
+PDF_MAX_PARALLEL_PAGES = int(os.getenv("OCR_PDF_MAX_PARALLEL_PAGES", "4"))
+# How often a document waiting on its pages checks its cancel event.
+PDF_CANCEL_POLL_SECONDS = 0.5
 SPECIAL_SCRIPT_NAMES = {"ranjana", "prachalit", "tamyig", "tibetan"}
 SPECIAL_SCRIPT_MIN_CONFIDENCE = 0.55
 WRONG_SCRIPT_AI_SCORE_THRESHOLD = 0.68
+# Bump whenever a pipeline change alters OCR output, to invalidate cached results.
+OCR_ENGINE_VERSION = "2026.10.2"
+OCR_CACHE_ENABLED = os.getenv("OCR_CACHE", "1") != "0"
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", os.path.join(DEFAULT_CACHE_ROOT, "ocr"))
+OCR_CACHE_MEMORY_ENTRIES = int(os.getenv("OCR_CACHE_MEMORY_ENTRIES", "128"))
+OCR_CACHE_MEMORY_MB = int(os.getenv("OCR_CACHE_MEMORY_MB", "64"))
+OCR_CACHE_MAX_MB = int(os.getenv("OCR_CACHE_MAX_MB", "512"))
+# "cli" forks the tesseract binary per call via pytesseract; "api" keeps
+# in-process tesserocr handles loaded (see TesseractAPIPool).
+TESSERACT_BACKEND = os.getenv("OCR_TESSERACT_BACKEND", "cli").strip().lower()
+TESSERACT_API_MAX_IDLE_HANDLES = int(
+    os.getenv("OCR_TESSERACT_API_MAX_IDLE_HANDLES", str((os.cpu_count() or 4) * 2))
+)
 _ai_ocr_client = None
 
 
@@ -77,6 +120,63 @@ class OCRError(Exception):
     """Raised when an OCR operation fails."""
 
 
+class OCRCancelled(OCRError):
+    """Raised when OCR is stopped through its cancel event (e.g. client disconnect)."""
+
+
+def _check_cancelled(cancel_event: Optional[threading.Event]) -> None:
+    if cancel_event is not None and cancel_event.is_set():
+        raise OCRCancelled("OCR cancelled")
+
+
+# Receives progress events (plain dicts with a "type") from the thread
+# coordinating a document; see `OCREngine.process_detailed`.
+ProgressCallback = Callable[[dict], None]
+
+
+def _emit_progress(progress_callback: Optional[ProgressCallback], event: dict) -> None:
+    if progress_callback is None:
+        return
+    try:
+        progress_callback(event)
+    except Exception as exc:
+        # A broken listener must not fail the OCR itself.
+        logger.warning("OCR progress callback failed: %s", exc)
+
+
+def _page_ocr_event(
+    page_index: int,
+    page_count: int,
+    page: dict,
+    ocr_strategy: Optional[str],
+    ocr_quality: Optional[dict],
+) -> dict:
+    return {
+        "type": "page_ocr",
+        "page": page_index + 1,
+        "page_count": page_count,
+        "text": page.get("text", ""),
+        "confidence": page.get("confidence", 0.0),
+        "ocr_strategy": ocr_strategy,
+        "ocr_quality": ocr_quality,
+    }
+
+
+def _emit_result_pages(progress_callback: Optional[ProgressCallback], result: dict) -> None:
+    """Report every page of an already complete result (cache hits, text layers)."""
+    if progress_callback is None:
+        return
+    pages = result.get("pages", [])
+    quality = result.get("ocr_quality") or {}
+    page_qualities = quality.get("pages") or []
+    for idx, page in enumerate(pages):
+        page_quality = page_qualities[idx] if len(page_qualities) == len(pages) else (quality or None)
+        _emit_progress(
+            progress_callback,
+            _page_ocr_event(idx, len(pages), page, result.get("ocr_strategy"), page_quality),
+        )
+
+
 # ===================================================================
 # Result helpers
 # ===================================================================
@@ -96,6 +196,19 @@ def _make_result(pages: list[dict]) -> dict:
     return {"pages": pages}
 
 
+def _is_cacheable_result(result: dict) -> bool:
+    """
+    False when an AI OCR fallback errored (timeout, quota, outage), since a
+    retry may produce a better result than the conventional OCR kept here.
+    """
+    quality = result.get("ocr_quality") or {}
+    for page_quality in [quality, *quality.get("pages", [])]:
+        ai_fallback = page_quality.get("ai_fallback") or {}
+        if ai_fallback.get("error"):
+            return False
+    return True
+
+
 def _ocr_page_quality(page: dict) -> dict:
     """Score OCR output using confidence, script coherence, and text sanity."""
     text = (page.get("text") or "").strip()
@@ -362,8 +475,14 @@ Return only JSON:
 {"script":"...", "is_special_lipi":true/false, "confidence":0.0, "reason":"short visual reason"}
 """.strip()
 
+    health = get_model_health()
     last_error = None
     for model_name in AI_OCR_MODELS:
+        # Models with an open circuit breaker are skipped without waiting
+        # for their timeout.
+        if not health.acquire(model_name):
+            logger.info("[AI OCR] script preflight skipping model=%s: circuit open", model_name)
+            continue
         try:
             thinking_config = (
                 genai_types.ThinkingConfig(thinking_budget=0)
@@ -386,15 +505,28 @@ Return only JSON:
                     ),
                 ),
             )
-            return _script_detection_json(response.text or ""), model_name
         except Exception as exc:
+            health.record_failure(model_name, exc)
             last_error = exc
             logger.warning(
                 "[AI OCR] script preflight model=%s failed: %s",
                 model_name,
                 exc,
             )
+            continue
+        health.record_success(model_name)
+        try:
+            return _script_detection_json(response.text or ""), model_name
+        except Exception as exc:
+            last_error = exc
+            logger.warning(
+                "[AI OCR] script preflight model=%s returned unusable output: %s",
+                model_name,
+                exc,
+            )
 
+    if last_error is None:
+        raise OCRError("Gemini script preflight skipped: every model's circuit breaker is open")
     raise OCRError(f"All Gemini script preflight models failed: {last_error}")
 
 
@@ -441,8 +573,12 @@ Rules:
 - Return only the transcription, with no markdown fences or commentary.
 """.strip()
 
+    health = get_model_health()
     last_error = None
     for model_name in AI_OCR_MODELS:
+        if not health.acquire(model_name):
+            logger.info("[AI OCR] skipping model=%s: circuit open", model_name)
+            continue
         try:
             thinking_config = (
                 genai_types.ThinkingConfig(thinking_budget=0)
@@ -464,18 +600,30 @@ Rules:
                     ),
                 ),
             )
-            transcription = _clean_ai_transcription(response.text or "")
-            if not transcription:
-                raise ValueError("Gemini returned an empty transcription")
-            return transcription, model_name
         except Exception as exc:
+            health.record_failure(model_name, exc)
             last_error = exc
             logger.warning(
                 "[AI OCR] model=%s failed: %s",
                 model_name,
                 exc,
             )
+            continue
+        # The model answered; an empty transcription is a page problem,
+        # not a model outage, so it does not count against the breaker.
+        health.record_success(model_name)
+        transcription = _clean_ai_transcription(response.text or "")
+        if transcription:
+            return transcription, model_name
+        last_error = ValueError("Gemini returned an empty transcription")
+        logger.warning(
+            "[AI OCR] model=%s failed: %s",
+            model_name,
+            last_error,
+        )
 
+    if last_error is None:
+        raise OCRError("Gemini OCR fallback skipped: every model's circuit breaker is open")
     raise OCRError(f"All Gemini OCR fallback models failed: {last_error}")
 
 
@@ -498,18 +646,189 @@ def _direct_pdf_text_stats(page_texts: list[str]) -> tuple[int, int]:
     return len("".join(combined.split())), len(combined.split())
 
 
-def _is_meaningful_direct_pdf_text(page_texts: list[str]) -> bool:
-    char_count, word_count = _direct_pdf_text_stats(page_texts)
-    return (
-        char_count >= PDF_DIRECT_TEXT_MIN_CHARS
-        or word_count >= PDF_DIRECT_TEXT_MIN_WORDS
-    )
+def _is_usable_pdf_text_layer(page_text: str, has_images: bool) -> bool:
+    """
+    Decide whether a PDF page's text layer can replace OCR for that page.
+
+    Substantial text is trusted outright. A short text layer (a heading, a
+    signature line) is trusted only when the page has no images, since a
+    scanned page always carries its scan as an image.
+    """
+    char_count, word_count = _direct_pdf_text_stats([page_text])
+    if char_count >= PDF_PAGE_TEXT_MIN_CHARS or word_count >= PDF_PAGE_TEXT_MIN_WORDS:
+        return True
+    return char_count > 0 and not has_images
 
 
 # ===================================================================
 # Tesseract Engine
 # ===================================================================
 
+_TESSERACT_DATA_KEYS = (
+    "text", "conf", "block_num", "par_num", "line_num",
+    "left", "top", "width", "height",
+)
+
+
+def _parse_tesseract_config(tesseract_config: str) -> tuple[int, dict[str, str]]:
+    """Extract `--psm N` and `-c name=value` options from a CLI config string."""
+    config = tesseract_config or ""
+    psm_match = re.search(r"--psm\s+(\d+)", config)
+    psm = int(psm_match.group(1)) if psm_match else 3
+    variables = dict(re.findall(r"-c\s+([\w.]+)=(\S+)", config))
+    return psm, variables
+
+
+def _tesseract_pixels(image: np.ndarray) -> np.ndarray:
+    """
+    Convert an OpenCV BGR(A) image to RGB for Tesseract; grayscale passes through.
+
+    Both backends get the same array: pytesseract reads numpy input as RGB,
+    so passing BGR would swap channels before Tesseract's own grayscale
+    conversion.
+    """
+    if image.ndim == 3 and image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_BGRA2RGB)
+    if image.ndim == 3:
+        return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    return image
+
+
+def _import_tesserocr():
+    try:
+        import tesserocr
+    except ImportError as exc:
+        raise OCRError(
+            "tesserocr is not installed. "
+            "Install with: pip install tesserocr (requires libtesseract-dev)"
+        ) from exc
+    return tesserocr
+
+
+class TesseractAPIPool:
+    """
+    Pool of long-lived in-process Tesseract API handles.
+
+    Forking the `tesseract` binary reloads the `nep+eng` traineddata on
+    every call, which dominates the cost of small crops. Handles created
+    here keep their languages loaded and are checked out by one thread at
+    a time (the Tesseract API is not thread-safe), so the pool grows to the
+    peak number of concurrent OCR threads and then stays warm.
+    """
+
+    def __init__(self, max_idle_per_lang: int = TESSERACT_API_MAX_IDLE_HANDLES):
+        self.max_idle_per_lang = max(1, max_idle_per_lang)
+        # Keyed by (lang, -c variables): `Clear()` does not reset variables
+        # set on a handle, so handles are never shared across variable sets.
+        self._idle: dict[tuple, list] = {}
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def handle(self, lang: str, variables: Optional[dict[str, str]] = None):
+        """Check out a handle with *lang* loaded and *variables* set for the duration of the block."""
+        key = (lang, tuple(sorted((variables or {}).items())))
+        api = self._checkout(key)
+        try:
+            yield api
+        finally:
+            self._checkin(key, api)
+
+    def _checkout(self, key: tuple):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop()
+
+        lang, variables = key
+        tesserocr = _import_tesserocr()
+        try:
+            api = tesserocr.PyTessBaseAPI(lang=lang, variables=dict(variables))
+        except RuntimeError as exc:
+            raise OCRError(f"Could not initialise Tesseract API for '{lang}': {exc}") from exc
+        with self._lock:
+            self._created += 1
+            created = self._created
+        logger.info("[Tesseract API] created handle #%d (lang=%s, variables=%s)", created, lang, dict(variables))
+        return api
+
+    def _checkin(self, key: tuple, api) -> None:
+        api.Clear()
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_lang:
+                idle.append(api)
+                return
+        api.End()
+
+    def image_to_data(self, image: np.ndarray, lang: str, tesseract_config: str) -> dict:
+        """
+        In-process equivalent of `pytesseract.image_to_data(..., Output.DICT)`.
+
+        The numpy buffer is handed to Tesseract as raw pixels, so there is
+        no PNG encode, temp file, or process start per call. *image* is
+        grayscale or RGB (see `_tesseract_pixels`).
+        """
+        tesserocr = _import_tesserocr()
+        psm, variables = _parse_tesseract_config(tesseract_config)
+
+        pixels = np.ascontiguousarray(image)
+        height, width = pixels.shape[:2]
+        bytes_per_pixel = 1 if pixels.ndim == 2 else 3
+
+        data = {key: [] for key in _TESSERACT_DATA_KEYS}
+        with self.handle(lang, variables) as api:
+            api.SetPageSegMode(psm)
+            api.SetImageBytes(
+                pixels.tobytes(), width, height,
+                bytes_per_pixel, bytes_per_pixel * width,
+            )
+            if api.Recognize() != 0:
+                raise OCRError("Tesseract API recognition failed")
+
+            iterator = api.GetIterator()
+            if iterator is None:
+                return data
+
+            RIL = tesserocr.RIL
+            block_num = par_num = line_num = 0
+            for word in tesserocr.iterate_level(iterator, RIL.WORD):
+                if word.IsAtBeginningOf(RIL.BLOCK):
+                    block_num += 1
+                    par_num = line_num = 0
+                if word.IsAtBeginningOf(RIL.PARA):
+                    par_num += 1
+                    line_num = 0
+                if word.IsAtBeginningOf(RIL.TEXTLINE):
+                    line_num += 1
+
+                bbox = word.BoundingBox(RIL.WORD)
+                if bbox is None:
+                    continue
+                x1, y1, x2, y2 = bbox
+                data["text"].append(word.GetUTF8Text(RIL.WORD) or "")
+                data["conf"].append(word.Confidence(RIL.WORD))
+                data["block_num"].append(block_num)
+                data["par_num"].append(par_num)
+                data["line_num"].append(line_num)
+                data["left"].append(int(x1))
+                data["top"].append(int(y1))
+                data["width"].append(int(x2 - x1))
+                data["height"].append(int(y2 - y1))
+        return data
+
+    def close(self) -> None:
+        """Release all idle handles (used on shutdown)."""
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for handles in idle.values():
+            for api in handles:
+                api.End()
+
+
+_tesseract_api_pool = TesseractAPIPool()
+
+
 class TesseractOCREngine:
     """
     Tesseract-based OCR engine wrapper.
@@ -518,18 +837,26 @@ class TesseractOCREngine:
     and `eng` (English) language packs. This engine is the primary workhorse 
     for standard document extraction due to its high performance and native 
     script support.
+
+    Two backends produce identical results: ``"cli"`` calls the tesseract
+    binary through pytesseract, while ``"api"`` runs in-process on a warm
+    handle from `TesseractAPIPool` and falls back to the CLI when tesserocr
+    is not installed.
     """
     _available_languages: set[str] | None = None
+    _api_backend_ready: bool | None = None
 
     def __init__(
         self,
         lang: str = "nep+eng",
         tesseract_config: str = "--psm 3",
         preprocess_config: Optional[dict] = None,
+        backend: Optional[str] = None,
     ):
         self.lang = lang
         self.tesseract_config = tesseract_config
         self.preprocess_config = preprocess_config
+        self.backend = (backend or TESSERACT_BACKEND).lower()
 
     @classmethod
     def _get_available_languages(cls) -> set[str]:
@@ -554,6 +881,28 @@ class TesseractOCREngine:
             "Devanagari text may be misread as English gibberish."
         )
 
+    @classmethod
+    def _api_backend_available(cls) -> bool:
+        if cls._api_backend_ready is None:
+            try:
+                _import_tesserocr()
+                cls._api_backend_ready = True
+            except OCRError as exc:
+                logger.warning("%s Falling back to the tesseract CLI.", exc)
+                cls._api_backend_ready = False
+        return cls._api_backend_ready
+
+    def _image_to_data(self, image: np.ndarray) -> dict:
+        pixels = _tesseract_pixels(image)
+        if self.backend == "api" and self._api_backend_available():
+            return _tesseract_api_pool.image_to_data(
+                pixels, self.lang, self.tesseract_config,
+            )
+        return pt.image_to_data(
+            pixels, lang=self.lang, config=self.tesseract_config,
+            output_type=pt.Output.DICT,
+        )
+
     def process_image(self, image: np.ndarray) -> dict:
         """
         Run Tesseract OCR on a preprocessed image with structured text reconstruction.
@@ -576,7 +925,8 @@ class TesseractOCREngine:
                 }
 
         Internal Logic:
-        1. Calls `pt.image_to_data` to get word-level coordinates and confidence.
+        1. Gets word-level coordinates and confidence from the configured
+           backend (`pt.image_to_data` or the in-process API pool).
         2. Groups words into `(block, paragraph, line)` buckets.
         3. Joins words into lines and separates blocks with double newlines.
         4. Calculates a weighted average confidence based on word-level results.
@@ -585,10 +935,7 @@ class TesseractOCREngine:
             self._validate_language_packs()
 
             # Single Tesseract call — get everything from image_to_data
-            data = pt.image_to_data(
-                image, lang=self.lang, config=self.tesseract_config,
-                output_type=pt.Output.DICT,
-            )
+            data = self._image_to_data(image)
 
             # Reconstruct structured text preserving line/paragraph breaks
             confidences, boxes = [], []
@@ -734,6 +1081,53 @@ class DocTROCREngine:
 
 
 
+# ===================================================================
+# Page layout context
+# ===================================================================
+
+class PageLayoutContext:
+    """
+    Layout analysis of one page, computed once and shared between variants.
+
+    Built by `HybridOCREngine.analyze_layout`. Callers that already know a
+    page's layout (or OCR the same page repeatedly) can pass it to
+    `process_image` / `process_image_adaptive` to skip the line-box,
+    projection-column, merge and pruning passes.
+    """
+
+    def __init__(
+        self,
+        image: np.ndarray,
+        binary: np.ndarray,
+        regions: list[dict],
+        complex_layout: bool,
+    ):
+        self.image = image
+        self.binary = binary
+        self.regions = regions
+        self.complex_layout = complex_layout
+        self._ink_density: Optional[float] = None
+
+    @property
+    def ink_density(self) -> float:
+        """
+        Fraction of dark pixels on a downscaled Otsu-binarized copy of the page.
+
+        This is the PSM scheduler's ink feature, whose buckets and learned
+        statistics were calibrated on Otsu. It deliberately does not reuse
+        the adaptive-threshold layout `binary`, which measures differently.
+        """
+        if self._ink_density is None:
+            image = self.image
+            gray = image if len(image.shape) == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+            scale = 800.0 / max(gray.shape[:2])
+            if scale < 1.0:
+                gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+            _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY_INV + cv2.THRESH_OTSU)
+            self._ink_density = float(cv2.countNonZero(binary)) / float(max(1, binary.size))
+        return self._ink_density
+
+
 # ===================================================================
 # Hybrid Engine (docTR + Tesseract fallback)
 # ===================================================================
@@ -761,6 +1155,7 @@ class HybridOCREngine:
         lang: str = "nep+eng",
         tesseract_config: str = "--psm 3",
         preprocess_config: Optional[dict] = None,
+        tesseract_backend: Optional[str] = None,
     ):
         self.threshold = confidence_threshold
         self.doctr = DocTROCREngine(preprocess_config=preprocess_config)
@@ -768,25 +1163,36 @@ class HybridOCREngine:
             lang=lang,
             tesseract_config=tesseract_config,
             preprocess_config=preprocess_config,
+            backend=tesseract_backend,
         )
         self.preprocess_config = preprocess_config
+        self.psm_scheduler = get_psm_scheduler(FAST_PATH_PSM_MODES)
+        # Constructor arguments, used to rebuild this engine in worker processes.
+        self._options = {
+            "confidence_threshold": confidence_threshold,
+            "lang": lang,
+            "tesseract_config": tesseract_config,
+            "preprocess_config": preprocess_config,
+            "tesseract_backend": tesseract_backend,
+        }
+
+    def _tesseract_for(self, psm: str) -> TesseractOCREngine:
+        """Tesseract engine sharing this engine's language and backend."""
+        return TesseractOCREngine(
+            lang=self.tesseract.lang,
+            tesseract_config=psm,
+            preprocess_config=self.preprocess_config,
+            backend=self.tesseract.backend,
+        )
 
     # ------------------------------------------------------------------
     # OpenCV layout helpers
     # ------------------------------------------------------------------
-    def _detect_text_line_boxes(self, image: np.ndarray) -> list[list[int]]:
-        """
-        Detect line-like printed-text boxes without assuming a document format.
-
-        The detector is used only for layout decisions and cropping. It favors
-        conservative text-line candidates and rejects large photo/illustration
-        regions, so clean newspaper, book, notice, and form layouts can all be
-        handled by the same downstream OCR logic.
-        """
-        h_img, w_img = image.shape[:2]
+    def _binarize_for_layout(self, image: np.ndarray) -> np.ndarray:
+        """Inverted adaptive-threshold page (ink = 255) used by layout detectors."""
         gray = image if len(image.shape) == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-        binary = cv2.adaptiveThreshold(
+        return cv2.adaptiveThreshold(
             blurred,
             255,
             cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
@@ -795,6 +1201,23 @@ class HybridOCREngine:
             11,
         )
 
+    def _detect_text_line_boxes(
+        self,
+        image: np.ndarray,
+        binary: Optional[np.ndarray] = None,
+    ) -> list[list[int]]:
+        """
+        Detect line-like printed-text boxes without assuming a document format.
+
+        The detector is used only for layout decisions and cropping. It favors
+        conservative text-line candidates and rejects large photo/illustration
+        regions, so clean newspaper, book, notice, and form layouts can all be
+        handled by the same downstream OCR logic.
+        """
+        h_img, w_img = image.shape[:2]
+        if binary is None:
+            binary = self._binarize_for_layout(image)
+
         kernel_w = max(16, w_img // 90)
         kernel_h = max(1, h_img // 700)
         kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (kernel_w, kernel_h))
@@ -1050,16 +1473,54 @@ class HybridOCREngine:
         flush_pending()
         return ordered
 
-    def _detect_layout_regions(self, image: np.ndarray) -> list[dict]:
-        line_boxes = self._detect_text_line_boxes(image)
+    def _detect_layout_regions(
+        self,
+        image: np.ndarray,
+        binary: Optional[np.ndarray] = None,
+    ) -> list[dict]:
+        if binary is None:
+            binary = self._binarize_for_layout(image)
+        # The two detectors are independent: run the projection scan on the
+        # image pool while line detection runs here (inline when already on
+        # an image pool thread, so the pool cannot wait on itself).
+        projection_future = (
+            None
+            if is_pool_thread(IMAGE_POOL)
+            else get_pool(IMAGE_POOL).submit(self._detect_projection_columns, image, binary)
+        )
+        line_boxes = self._detect_text_line_boxes(image, binary)
         regions = self._group_lines_into_regions(line_boxes, image.shape)
-        projection_regions = self._detect_projection_columns(image)
+        projection_regions = (
+            projection_future.result()
+            if projection_future is not None
+            else self._detect_projection_columns(image, binary)
+        )
         if len(projection_regions) >= 2:
             regions = self._replace_overlapping_regions(regions, projection_regions)
         regions = self._remove_redundant_regions(regions, image.shape)
         return self._sort_regions_for_reading(regions, image.shape[1])
 
-    def _detect_projection_columns(self, image: np.ndarray) -> list[dict]:
+    def analyze_layout(self, image: np.ndarray) -> "PageLayoutContext":
+        """
+        Run page layout analysis once so it can be shared across OCR variants.
+
+        Pass the returned context to `process_image` / `process_image_adaptive`
+        to skip recomputing the binarized page, regions and complexity.
+        """
+        binary = self._binarize_for_layout(image)
+        regions = self._detect_layout_regions(image, binary)
+        return PageLayoutContext(
+            image=image,
+            binary=binary,
+            regions=regions,
+            complex_layout=self._is_complex_layout(regions, image.shape[1]),
+        )
+
+    def _detect_projection_columns(
+        self,
+        image: np.ndarray,
+        binary: Optional[np.ndarray] = None,
+    ) -> list[dict]:
         """
         Detect multi-column body regions using vertical whitespace gutters.
 
@@ -1070,16 +1531,8 @@ class HybridOCREngine:
         columns may appear near the top, middle, bottom, or only in one section.
         """
         h_img, w_img = image.shape[:2]
-        gray = image if len(image.shape) == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-        blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-        binary = cv2.adaptiveThreshold(
-            blurred,
-            255,
-            cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY_INV,
-            51,
-            11,
-        )
+        if binary is None:
+            binary = self._binarize_for_layout(image)
 
         row_counts = np.count_nonzero(binary, axis=1)
         min_row_ink = max(3, int(w_img * 0.003))
@@ -1327,11 +1780,7 @@ class HybridOCREngine:
             else:
                 scaled = False
 
-            engine = TesseractOCREngine(
-                lang=self.tesseract.lang,
-                tesseract_config=psm,
-                preprocess_config=self.preprocess_config,
-            )
+            engine = self._tesseract_for(psm)
             region_res = engine.process_image(crop)
             page = region_res["pages"][0]
             if not page["text"].strip():
@@ -1345,9 +1794,7 @@ class HybridOCREngine:
 
             return idx, page
 
-        max_workers = min(len(regions), 6)
-        with ThreadPoolExecutor(max_workers=max_workers) as pool:
-            results = list(pool.map(_process_region, enumerate(regions)))
+        results = list(get_pool(TESSERACT_POOL).map(_process_region, enumerate(regions)))
 
         results.sort(key=lambda item: item[0])
         text_parts = []
@@ -1363,13 +1810,152 @@ class HybridOCREngine:
         avg_conf = sum(confidences) / len(confidences) if confidences else 0.0
         return _make_result([_make_page_result("\n\n".join(text_parts), avg_conf, boxes)])
 
-    def process_image(self, image: np.ndarray, layout_image: Optional[np.ndarray] = None) -> dict:
+    def _run_psm_candidates(
+        self,
+        image: np.ndarray,
+        psm_modes: tuple[str, ...],
+        stop_early: bool = True,
+    ) -> list[dict]:
+        """
+        Run fast-path PSM modes concurrently on a bounded pool.
+
+        Each mode is an independent single-threaded Tesseract job. As soon as
+        one candidate clears `OCR_HIGH_QUALITY_SCORE`, modes that have not
+        started are cancelled (unless *stop_early* is False); runs already
+        in flight finish in the background and are ignored. Candidates come
+        back in `psm_modes` order so the caller's tie-breaking matches a
+        sequential loop.
+        """
+        def _run(psm: str) -> tuple[dict, dict]:
+            result = self._tesseract_for(psm).process_image(image)
+            return result, _ocr_page_quality(result["pages"][0])
+
+        candidates = []
+        collected = set()
+
+        def _collect(future, order: int, psm: str) -> Optional[dict]:
+            collected.add(future)
+            try:
+                result, quality = future.result()
+            except OCRError as exc:
+                logger.warning("[Hybrid] %s failed: %s", psm, exc)
+                return None
+            page = result["pages"][0]
+            logger.info(
+                "[Hybrid] Tried %s: text_len=%d, conf=%.4f, quality=%.4f",
+                psm,
+                len(page["text"].strip()),
+                page["confidence"],
+                quality["score"],
+            )
+            candidate = {"order": order, "psm": psm, "result": result, "quality": quality}
+            candidates.append(candidate)
+            return candidate
+
+        executor = get_pool(TESSERACT_POOL)
+        futures = {
+            executor.submit(_run, psm): (order, psm)
+            for order, psm in enumerate(psm_modes)
+        }
+        try:
+            for future in as_completed(futures):
+                candidate = _collect(future, *futures[future])
+                if (
+                    stop_early
+                    and candidate
+                    and candidate["quality"]["score"] >= OCR_HIGH_QUALITY_SCORE
+                ):
+                    cancelled = sum(pending.cancel() for pending in futures if not pending.done())
+                    # Keep anything that finished alongside the winner.
+                    for other, (order, psm) in futures.items():
+                        if other not in collected and other.done() and not other.cancelled():
+                            _collect(other, order, psm)
+                    logger.info(
+                        "[Hybrid] %s cleared quality %.2f; cancelled %d pending PSM run(s)",
+                        candidate["psm"],
+                        OCR_HIGH_QUALITY_SCORE,
+                        cancelled,
+                    )
+                    break
+        finally:
+            for pending in futures:
+                pending.cancel()
+
+        candidates.sort(key=lambda item: item["order"])
+        return candidates
+
+    def _run_scheduled_fast_path(
+        self,
+        image: np.ndarray,
+        layout: "PageLayoutContext",
+    ) -> list[dict]:
+        """
+        Run fast-path PSM modes in the order the scheduler expects to win.
+
+        When the top-ranked mode has a strong track record for pages like
+        this one it runs alone first, and the remaining modes only start if
+        it misses `OCR_HIGH_QUALITY_SCORE`. Every completed run is fed back
+        into the scheduler's per-feature statistics; modes cancelled after
+        another one won are not, so exploration pages run every mode to
+        completion (see ocr/psm_scheduler.py).
+        """
+        if self.psm_scheduler is None:
+            return self._run_psm_candidates(image, FAST_PATH_PSM_MODES)
+
+        features = page_features(
+            layout.image.shape,
+            len(layout.regions),
+            layout.complex_layout,
+            layout.ink_density,
+        )
+        ranked, try_top_first, explore = self.psm_scheduler.plan(features)
+        logger.info(
+            "[Hybrid] PSM schedule %s (top_first=%s, explore=%s, features=%s)",
+            ", ".join(psm.replace("--", "") for psm in ranked),
+            try_top_first,
+            explore,
+            features,
+        )
+
+        candidates = []
+        remaining = tuple(ranked)
+        if try_top_first:
+            candidates = self._run_psm_candidates(image, remaining[:1])
+            remaining = remaining[1:]
+            if any(
+                candidate["quality"]["score"] >= OCR_HIGH_QUALITY_SCORE
+                for candidate in candidates
+            ):
+                logger.info("[Hybrid] Early exit: %s met the quality target", ranked[0])
+                remaining = ()
+        if remaining:
+            candidates.extend(
+                self._run_psm_candidates(image, remaining, stop_early=not explore)
+            )
+
+        self.psm_scheduler.record(features, {
+            candidate["psm"]: candidate["quality"]["score"] >= OCR_HIGH_QUALITY_SCORE
+            for candidate in candidates
+        })
+        # Restore configured order so tie-breaking is schedule-independent.
+        candidates.sort(key=lambda item: FAST_PATH_PSM_MODES.index(item["psm"]))
+        return candidates
+
+    def process_image(
+        self,
+        image: np.ndarray,
+        layout_image: Optional[np.ndarray] = None,
+        layout_context: Optional["PageLayoutContext"] = None,
+    ) -> dict:
         """
         Execute the primary Hybrid OCR pipeline for an image.
 
         Args:
             image (np.ndarray): The source image as a numpy array.
-            debug_filename (Optional[str]): Filename for saving diagnostic images.
+            layout_image (Optional[np.ndarray]): Unprocessed page used for
+                layout analysis, region crops, and AI OCR.
+            layout_context (Optional[PageLayoutContext]): Precomputed layout
+                from `analyze_layout`; takes precedence over `layout_image`.
 
         Returns:
             dict: The final OCR results, including strategy metadata and 
@@ -1378,10 +1964,13 @@ class HybridOCREngine:
         ### Detailed Flow:
         
         #### Phase 1: Fast Path (Multi-PSM Tesseract)
-        Tesseract is run sequentially with PSM 4, 6, and 3. The engine 
-        constantly evaluates the character count and confidence score.
-        - **Success Condition**: > 500 characters and > 85% confidence.
-        - **Fallback Trigger**: If ALL modes result in < 100 characters.
+        Tesseract runs PSM 3, 4, 6, 11 and 1 concurrently on a bounded pool,
+        in the order `PSMScheduler` ranks them for this page's features.
+        A mode with a strong track record runs alone first; pending modes
+        are cancelled once one clears `OCR_HIGH_QUALITY_SCORE`.
+        - **Success Condition**: > 100 characters and quality above
+          `OCR_REVIEW_REQUIRED_SCORE` on a simple layout.
+        - **Fallback Trigger**: Otherwise regional layout OCR, AI OCR, or docTR.
 
         #### Phase 2: Slow Path (docTR Layout + Parallel Tesseract)
         Used for documents with low contrast, handwritten elements, or 
@@ -1403,36 +1992,33 @@ class HybridOCREngine:
         # --psm 11: Sparse text in no particular order (screenshots/forms)
         # --psm 1: Automatic segmentation with orientation/script detection
         # ============================================================
+        # Layout is analysed first: it feeds the PSM scheduler's page features
+        # and the regional OCR decision below.
+        if layout_context is None:
+            layout_context = self.analyze_layout(
+                layout_image if layout_image is not None else image
+            )
+        layout_source = layout_context.image
+        regions = layout_context.regions
+        complex_layout = layout_context.complex_layout
+        logger.info(
+            "[Hybrid] OpenCV layout detected %d region(s), complex_layout=%s",
+            len(regions), complex_layout,
+        )
+
         best_result = None
         best_text_len = 0
         best_conf = 0.0
         best_psm = ""
         best_quality = None
 
-        for psm in FAST_PATH_PSM_MODES:
-            engine = TesseractOCREngine(
-                lang=self.tesseract.lang,
-                tesseract_config=psm,
-                preprocess_config=self.preprocess_config,
-            )
-            try:
-                result = engine.process_image(image)
-            except OCRError as exc:
-                logger.warning("[Hybrid] %s failed: %s", psm, exc)
-                continue
-
+        for candidate in self._run_scheduled_fast_path(image, layout_context):
+            psm = candidate["psm"]
+            result = candidate["result"]
+            quality = candidate["quality"]
             page = result["pages"][0]
             text = page["text"].strip()
             conf = page["confidence"]
-            quality = _ocr_page_quality(page)
-
-            logger.info(
-                "[Hybrid] Tried %s: text_len=%d, conf=%.4f, quality=%.4f",
-                psm,
-                len(text),
-                conf,
-                quality["score"],
-            )
 
             # Prefer reliable, coherent OCR over a longer noisy transcription.
             if (
@@ -1460,16 +2046,9 @@ class HybridOCREngine:
             best_quality["score"] if best_quality else 0.0,
         )
 
-        # Detect printed text regions even when the global pass returned text.
-        # Multi-column pages can otherwise look "successful" while being
-        # incomplete or out of reading order.
-        layout_source = layout_image if layout_image is not None else image
-        regions = self._detect_layout_regions(layout_source)
-        complex_layout = self._is_complex_layout(regions, layout_source.shape[1])
-        logger.info(
-            "[Hybrid] OpenCV layout detected %d region(s), complex_layout=%s",
-            len(regions), complex_layout,
-        )
+        # Printed text regions are used even when the global pass returned
+        # text. Multi-column pages can otherwise look "successful" while
+        # being incomplete or out of reading order.
         diagnostics = {
             "complex_layout": complex_layout,
             "region_count": len(regions),
@@ -1492,7 +2071,7 @@ class HybridOCREngine:
             layout_result = self._process_regions_with_tesseract(
                 image,
                 regions,
-                region_source=layout_source if layout_image is not None else None,
+                region_source=layout_source if layout_source is not image else None,
             )
             layout_page = layout_result["pages"][0]
             layout_text_len = len(layout_page["text"].strip())
@@ -1660,11 +2239,7 @@ class HybridOCREngine:
             else:
                 psm = "--psm 6"
 
-            engine = TesseractOCREngine(
-                lang=self.tesseract.lang,
-                tesseract_config=psm,
-                preprocess_config=self.preprocess_config
-            )
+            engine = self._tesseract_for(psm)
             region_res = engine.process_image(crop)
             region_page = region_res["pages"][0]
 
@@ -1681,10 +2256,8 @@ class HybridOCREngine:
 
             return idx, region_page
 
-        # Run blocks in parallel (up to 6 threads)
-        max_workers = min(len(blocks), 6)
-        with ThreadPoolExecutor(max_workers=max_workers) as pool:
-            results = list(pool.map(_process_block, enumerate(blocks)))
+        # Run blocks in parallel on the shared Tesseract pool
+        results = list(get_pool(TESSERACT_POOL).map(_process_block, enumerate(blocks)))
 
         # Sort by original index and stitch
         results.sort(key=lambda x: x[0])
@@ -1720,7 +2293,11 @@ class HybridOCREngine:
             return best_result
         return result
 
-    def process_image_adaptive(self, original: np.ndarray) -> dict:
+    def process_image_adaptive(
+        self,
+        original: np.ndarray,
+        layout_context: Optional["PageLayoutContext"] = None,
+    ) -> dict:
         """
         Compare OCR-safe image variants and retain the strongest result.
 
@@ -1728,6 +2305,9 @@ class HybridOCREngine:
         faded scans benefit from denoising and contrast enhancement. Colored
         artifact removal is evaluated only as a fallback because a page-wide
         color cast can otherwise erase legitimate text.
+
+        Layout is analysed once on `original` (or taken from
+        `layout_context`) and shared by every variant.
         """
         special_script_detection = None
         try:
@@ -1811,6 +2391,10 @@ class HybridOCREngine:
 
         candidates = []
         seen_signatures = set()
+        # Variants share resize/grayscale/deskew work and the page layout;
+        # only the differing preprocessing tails and OCR runs are repeated.
+        preprocessing = PreprocessingGraph(original)
+        layout = layout_context or self.analyze_layout(original)
         for variant_name, overrides in candidate_configs:
             config = {
                 **PREPROCESS_DEFAULT_CONFIG,
@@ -1826,8 +2410,8 @@ class HybridOCREngine:
                 continue
             seen_signatures.add(signature)
 
-            processed = preprocess_array(original, config)
-            result = self.process_image(processed, layout_image=original)
+            processed = preprocessing.run(config)
+            result = self.process_image(processed, layout_context=layout)
             page = result["pages"][0]
             quality = _ocr_page_quality(page)
             strategy = result.get("ocr_strategy", "unknown")
@@ -2018,26 +2602,217 @@ class HybridOCREngine:
         }
         return result
 
-    def process_pdf(self, pdf_path: str, poppler_path: Optional[str] = None) -> dict:
-        """Per-page hybrid: each page independently evaluated."""
-        images = _convert_pdf_to_images(pdf_path, poppler_path)
+    def _ocr_pages(
+        self,
+        page_images,
+        page_count: int,
+        max_parallel_pages: int,
+        cancel_event: Optional[threading.Event] = None,
+        use_process_pool: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> list[dict]:
+        """
+        Run `process_image_adaptive` on every page, in page order.
+
+        Pages are independent, so they are scheduled on the shared PDF page
+        process pool with at most *max_parallel_pages* in flight for this
+        document. Single pages run in-process unless *use_process_pool* is
+        set (keeping CPU-bound OCR off a server's event-loop process), and
+        everything finishes in-process if the pool breaks. Setting
+        *cancel_event* stops scheduling further pages and raises
+        `OCRCancelled`. *progress_callback* gets a "page_rasterized" event
+        as each page image is produced and a "page_ocr" event as each page
+        finishes (in completion order).
+        """
+        results: dict[int, dict] = {}
+        pending = iter(enumerate(page_images))
+        parallel = max(1, min(max_parallel_pages, PDF_PAGE_POOL_WORKERS, page_count))
+        rasterized: set[int] = set()
+
+        def _rasterized(idx: int) -> None:
+            # Pages re-run after a pool failure are only reported once.
+            if idx not in rasterized:
+                rasterized.add(idx)
+                _emit_progress(
+                    progress_callback,
+                    {"type": "page_rasterized", "page": idx + 1, "page_count": page_count},
+                )
+
+        def _store(idx: int, result: dict) -> None:
+            results[idx] = result
+            logger.info("Hybrid processed page %d/%d", idx + 1, page_count)
+            _emit_progress(
+                progress_callback,
+                _page_ocr_event(
+                    idx,
+                    page_count,
+                    result["pages"][0],
+                    result.get("ocr_strategy"),
+                    result.get("ocr_quality"),
+                ),
+            )
+
+        def _collect(in_flight: dict) -> None:
+            # Poll so a cancellation is noticed while long pages are running.
+            done, _ = wait(
+                in_flight,
+                timeout=PDF_CANCEL_POLL_SECONDS,
+                return_when=FIRST_COMPLETED,
+            )
+            _check_cancelled(cancel_event)
+            for future in done:
+                _store(in_flight[future][0], future.result())
+                del in_flight[future]
+
+        if parallel > 1 or use_process_pool:
+            # future -> (page index, page image); images are kept only while
+            # in flight so they can be re-run if a worker process dies.
+            in_flight: dict = {}
+            try:
+                pool = _get_pdf_page_pool()
+                for idx, page_bgr in pending:
+                    _check_cancelled(cancel_event)
+                    _rasterized(idx)
+                    future = pool.submit(_ocr_page_in_worker, self._options, page_bgr)
+                    in_flight[future] = (idx, page_bgr)
+                    while len(in_flight) >= parallel:
+                        _collect(in_flight)
+                while in_flight:
+                    _collect(in_flight)
+            except BrokenProcessPool as exc:
+                logger.warning(
+                    "PDF page pool failed (%s); finishing %d in-flight page(s) in-process",
+                    exc,
+                    len(in_flight),
+                )
+                _reset_pdf_page_pool()
+                pending = itertools.chain(
+                    sorted(in_flight.values(), key=lambda item: item[0]),
+                    pending,
+                )
+            finally:
+                # Only reached with pages still in flight on an error or a
+                # cancellation; queued pages are dropped, running ones finish.
+                for future in in_flight:
+                    future.cancel()
+
+        for idx, page_bgr in pending:
+            _check_cancelled(cancel_event)
+            _rasterized(idx)
+            _store(idx, self.process_image_adaptive(page_bgr))
+
+        return [results[idx] for idx in sorted(results)]
+
+    def process_pdf(
+        self,
+        pdf_path: str,
+        poppler_path: Optional[str] = None,
+        max_parallel_pages: int = PDF_MAX_PARALLEL_PAGES,
+        text_layer_pages: Optional[dict[int, str]] = None,
+        cancel_event: Optional[threading.Event] = None,
+        use_process_pool: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> dict:
+        """
+        Per-page hybrid: each page independently evaluated.
+
+        Pages run in parallel on the shared page process pool, capped per
+        document by *max_parallel_pages*, and are reassembled in page order.
+        Pages listed in *text_layer_pages* (0-based index -> text) already
+        have a usable text layer; they are not rasterized and are merged
+        into the result with the `pdf_text_layer` strategy. *cancel_event*
+        and *use_process_pool* are passed on to `_ocr_pages`, and progress
+        events carry document page numbers.
+        """
+        text_layer_pages = text_layer_pages or {}
+        ocr_indices: list[int] = []
+        page_count = 0
+
+        def _document_progress(event: dict) -> None:
+            # `_ocr_pages` counts only the pages it OCRs.
+            _emit_progress(
+                progress_callback,
+                {**event, "page": ocr_indices[event["page"] - 1] + 1, "page_count": page_count},
+            )
+
+        def _start(count: int) -> Optional[ProgressCallback]:
+            nonlocal page_count
+            page_count = count
+            ocr_indices[:] = [idx for idx in range(page_count) if idx not in text_layer_pages]
+            for idx in sorted(text_layer_pages):
+                _emit_progress(
+                    progress_callback,
+                    _page_ocr_event(
+                        idx,
+                        page_count,
+                        _make_page_result(text_layer_pages[idx], 1.0),
+                        "pdf_text_layer",
+                        None,
+                    ),
+                )
+            return _document_progress if progress_callback is not None else None
+
+        try:
+            doc = fitz.open(pdf_path)
+        except Exception as exc:
+            logger.warning("PyMuPDF could not open %s (%s); rasterizing with poppler", pdf_path, exc)
+            images = _convert_pdf_to_images(pdf_path, poppler_path)
+            page_progress = _start(len(images))
+            page_images = (
+                cv2.cvtColor(np.array(images[idx].convert("RGB")), cv2.COLOR_RGB2BGR)
+                for idx in ocr_indices
+            )
+            ocr_results = self._ocr_pages(
+                page_images,
+                len(ocr_indices),
+                max_parallel_pages,
+                cancel_event=cancel_event,
+                use_process_pool=use_process_pool,
+                progress_callback=page_progress,
+            )
+        else:
+            with doc:
+                page_progress = _start(doc.page_count)
+                # Pages are rendered lazily as `_ocr_pages` pulls them, so only
+                # the pages in flight are held in memory. The RGB view is only
+                # valid until the next page; cvtColor makes the one BGR copy.
+                page_images = (
+                    cv2.cvtColor(page_rgb, cv2.COLOR_RGB2BGR)
+                    for page_rgb in _iter_pdf_page_images(
+                        doc,
+                        page_numbers=ocr_indices,
+                        max_dim={**PREPROCESS_DEFAULT_CONFIG, **(self.preprocess_config or {})}["max_dim"],
+                    )
+                )
+                ocr_results = self._ocr_pages(
+                    page_images,
+                    len(ocr_indices),
+                    max_parallel_pages,
+                    cancel_event=cancel_event,
+                    use_process_pool=use_process_pool,
+                    progress_callback=page_progress,
+                )
+
+        results_by_page = dict(zip(ocr_indices, ocr_results))
+        page_results = [
+            results_by_page.get(idx)
+            or {
+                "pages": [_make_page_result(text_layer_pages.get(idx, ""), 1.0)],
+                "ocr_strategy": "pdf_text_layer",
+            }
+            for idx in range(page_count)
+        ]
 
         pages = []
         strategies = []
         page_qualities = []
-        for idx, pil_img in enumerate(images):
-            page_rgb = np.array(pil_img.convert("RGB"))
-            page_bgr = cv2.cvtColor(page_rgb, cv2.COLOR_RGB2BGR)
-            result = self.process_image_adaptive(page_bgr)
+        for result in page_results:
             strategy = result.get("ocr_strategy")
             if strategy:
                 strategies.append(strategy)
             if result.get("ocr_quality"):
                 page_qualities.append(result["ocr_quality"])
-            
-            p = result["pages"][0]
-            pages.append(p)
-            logger.info("Hybrid processed page %d/%d", idx + 1, len(images))
+            pages.append(result["pages"][0])
 
         pdf_result = _make_result(pages)
         if strategies:
@@ -2061,10 +2836,172 @@ class HybridOCREngine:
         return pdf_result
 
 
+# ===================================================================
+# PDF page process pool
+# ===================================================================
+
+_pdf_page_pool: Optional[ProcessPoolExecutor] = None
+_pdf_page_pool_lock = threading.Lock()
+_worker_engines: dict[str, HybridOCREngine] = {}
+
+
+def _init_pdf_page_worker() -> None:
+    # Pages already run in parallel across processes: keep Tesseract itself
+    # single-threaded and size this worker's Tesseract and image pools to one
+    # thread, so PSM candidates and region/block runs queue up inside the
+    # page instead of multiplying the process count. Runs before the worker's
+    # first get_pool(), so the pools are created with these sizes.
+    os.environ.setdefault("OMP_THREAD_LIMIT", "1")
+    POOL_SIZES[TESSERACT_POOL] = 1
+    POOL_SIZES[IMAGE_POOL] = 1
+
+
+def _get_pdf_page_pool() -> ProcessPoolExecutor:
+    """Create the shared page pool on first use (spawned: safe with threads)."""
+    global _pdf_page_pool
+    with _pdf_page_pool_lock:
+        if _pdf_page_pool is None:
+            _pdf_page_pool = ProcessPoolExecutor(
+                max_workers=max(1, PDF_PAGE_POOL_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_pdf_page_worker,
+            )
+            logger.info("Started PDF page pool with %d worker(s)", PDF_PAGE_POOL_WORKERS)
+        return _pdf_page_pool
+
+
+def _reset_pdf_page_pool() -> None:
+    global _pdf_page_pool
+    with _pdf_page_pool_lock:
+        pool, _pdf_page_pool = _pdf_page_pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_pdf_page_pool() -> None:
+    """Stop the page pool's worker processes (call on application shutdown)."""
+    _reset_pdf_page_pool()
+
+
+def _ocr_page_in_worker(engine_options: dict, page_bgr: np.ndarray) -> dict:
+    """Process-pool entry point: adaptive OCR of one page with a cached engine."""
+    key = json.dumps(engine_options, sort_keys=True, default=str)
+    try:
+        engine = _worker_engines.get(key)
+        if engine is None:
+            engine = _worker_engines[key] = HybridOCREngine(**engine_options)
+        return engine.process_image_adaptive(page_bgr)
+    except OCRError:
+        raise
+    except Exception as exc:
+        # Some library exceptions (e.g. pytesseract's) cannot be unpickled in
+        # the parent, which would break the whole pool; re-raise as OCRError.
+        raise OCRError(f"{type(exc).__name__}: {exc}") from None
+
+
 # ===================================================================
 # Shared utilities
 # ===================================================================
 
+def _extract_page_scan(doc: "fitz.Document", page: "fitz.Page") -> Optional["fitz.Pixmap"]:
+    """
+    Decode a scanned page's embedded image directly, without rendering.
+
+    Only applies when the page shows exactly one unmasked image, drawn
+    upright (no page rotation, no rotated/sheared/mirrored placement) over
+    nearly the whole page, with no vector drawings or visible text on top.
+    Anything else is composite content and returns None so the caller
+    rasterizes the page instead.
+
+    Returns:
+        Optional[fitz.Pixmap]: An RGB pixmap without alpha, or None.
+    """
+    if page.rotation:
+        return None
+    images = page.get_images(full=True)
+    if len(images) != 1:
+        return None
+    xref, smask = images[0][0], images[0][1]
+    if smask:
+        return None
+
+    placements = page.get_image_info(xrefs=True)
+    if len(placements) != 1 or placements[0].get("xref") != xref:
+        return None
+    a, b, c, d, _, _ = placements[0]["transform"]
+    if abs(b) > 1e-3 or abs(c) > 1e-3 or a <= 0 or d <= 0:
+        return None
+    page_area = abs(page.rect)
+    covered_area = abs(fitz.Rect(placements[0]["bbox"]) & page.rect)
+    if not page_area or covered_area / page_area < PDF_EMBEDDED_IMAGE_MIN_COVERAGE:
+        return None
+
+    if page.get_drawings():
+        return None
+    # Invisible text (render mode 3) is an OCR layer from the scanner; any
+    # other text is drawn over the image and must be rendered with it.
+    if any(span.get("type") != 3 for span in page.get_texttrace()):
+        return None
+
+    try:
+        pixmap = fitz.Pixmap(doc, xref)
+        if pixmap.colorspace is None or pixmap.colorspace.n != 3:
+            pixmap = fitz.Pixmap(fitz.csRGB, pixmap)
+        if pixmap.alpha:
+            pixmap = fitz.Pixmap(pixmap, 0)
+    except Exception as exc:
+        logger.debug("Embedded image extraction failed on page %d: %s", page.number + 1, exc)
+        return None
+    return pixmap
+
+
+def _iter_pdf_page_images(
+    doc: "fitz.Document",
+    dpi: int = PDF_RASTER_DPI,
+    page_numbers: Optional[list[int]] = None,
+    max_dim: int = PREPROCESS_DEFAULT_CONFIG["max_dim"],
+) -> Iterator[np.ndarray]:
+    """
+    Rasterize PDF pages one at a time with PyMuPDF.
+
+    Scanned pages that are just one embedded image are decoded directly at
+    their native resolution (see `_extract_page_scan`), downscaled so the
+    longest side is at most *max_dim*; all other pages are rendered at *dpi*.
+
+    Args:
+        doc (fitz.Document): An open PDF document.
+        dpi (int): Render resolution (150 DPI, see `_convert_pdf_to_images`).
+        page_numbers (Optional[list[int]]): 0-based pages to render, in
+            order. Defaults to every page.
+        max_dim (int): Cap on an embedded scan's longest side, matching the
+            preprocessing `max_dim`, so 600 DPI scans do not reach layout
+            analysis, AI OCR or the page process pool at full size.
+
+    Yields:
+        np.ndarray: An HxWx3 RGB uint8 array. Unless it was downscaled, it
+        is a view over the page pixmap's buffer (no copy), only valid until
+        the next page is requested; callers that keep it must copy it.
+    """
+    matrix = fitz.Matrix(dpi / 72.0, dpi / 72.0)
+    if page_numbers is None:
+        page_numbers = range(doc.page_count)
+    for page_number in page_numbers:
+        page = doc[page_number]
+        try:
+            pixmap = _extract_page_scan(doc, page) if PDF_EMBEDDED_IMAGE_EXTRACTION else None
+            if pixmap is None:
+                pixmap = page.get_pixmap(matrix=matrix, colorspace=fitz.csRGB, alpha=False)
+        except Exception as exc:
+            raise OCRError(f"Failed to rasterize PDF page {page.number + 1}: {exc}") from exc
+        page_rgb = np.frombuffer(pixmap.samples_mv, dtype=np.uint8).reshape(
+            pixmap.height, pixmap.width, pixmap.n
+        )
+        if max(pixmap.width, pixmap.height) > max_dim:
+            page_rgb = resize_image(page_rgb, max_dim=max_dim)
+        yield page_rgb
+        del page_rgb, pixmap
+
+
 def _convert_pdf_to_images(pdf_path: str, poppler_path: Optional[str] = None) -> list:
     """
     Convert all pages of a PDF into high-quality reference images.
@@ -2119,6 +3056,7 @@ class OCREngine:
         poppler_path: Optional[str] = None,
         confidence_threshold: float = 0.85,
         preprocess_config: Optional[dict] = None,
+        tesseract_backend: Optional[str] = None,
     ):
         self.lang = lang
         self.tesseract_config = tesseract_config
@@ -2130,7 +3068,35 @@ class OCREngine:
             lang=lang,
             tesseract_config=tesseract_config,
             preprocess_config=preprocess_config,
+            tesseract_backend=tesseract_backend,
         )
+        self._cache = (
+            ResultCache(
+                "ocr",
+                OCR_CACHE_DIR,
+                memory_entries=OCR_CACHE_MEMORY_ENTRIES,
+                memory_max_bytes=OCR_CACHE_MEMORY_MB * 1024 * 1024,
+                disk_max_bytes=OCR_CACHE_MAX_MB * 1024 * 1024,
+            )
+            if OCR_CACHE_ENABLED
+            else None
+        )
+        # Everything besides the file bytes that determines the OCR output.
+        # The Tesseract backend is left out: both backends produce the same text.
+        options = dict(self._hybrid._options)
+        options.pop("tesseract_backend", None)
+        self._cache_fingerprint = {
+            "engine_version": OCR_ENGINE_VERSION,
+            "options": options,
+            "ai_ocr_models": AI_OCR_MODELS,
+            "pdf": {
+                "raster_dpi": PDF_RASTER_DPI,
+                "embedded_images": PDF_EMBEDDED_IMAGE_EXTRACTION,
+                "embedded_image_min_coverage": PDF_EMBEDDED_IMAGE_MIN_COVERAGE,
+                "text_min_chars": PDF_PAGE_TEXT_MIN_CHARS,
+                "text_min_words": PDF_PAGE_TEXT_MIN_WORDS,
+            },
+        }
 
     # ------------------------------------------------------------------
     # Backward-compatible API  (returns list[str])
@@ -2139,57 +3105,28 @@ class OCREngine:
         """
         Legacy text extraction API used for language detection and simple text views with via endpoint detect-language.
 
+        Routes exactly like `process_detailed`, so both endpoints see the
+        same text for the same document.
+
         Args:
             file_path (str): File system path to the document.
 
         Returns:
             list[str]: One string for each detected page.
         """
-        path = Path(file_path)
-
-        if not path.exists():
-            raise OCRError(f"File not found: {file_path}")
-
-        ext = path.suffix.lower()
-        if ext not in SUPPORTED_EXTENSIONS:
-            raise OCRError(
-                f"Unsupported file type '{ext}'. "
-                f"Supported: {sorted(SUPPORTED_EXTENSIONS)}"
-            )
-
-        if ext in SUPPORTED_WORD_EXTENSIONS:
-            logger.info("Processing Word document: %s", file_path)
-            return self._process_word(str(path))
-
-        if ext in SUPPORTED_PDF_EXTENSIONS:
-            logger.info("Processing PDF: %s", file_path)
-            # Try direct text extraction first (born-digital PDFs)
-            direct_text = _strip_pdf_text_artifacts(self._process_pdf_direct(str(path)))
-            if direct_text and _is_meaningful_direct_pdf_text(direct_text):
-                logger.info("Direct extraction successful for PDF")
-                return direct_text
-            char_count, word_count = _direct_pdf_text_stats(direct_text)
-            logger.info(
-                "Direct extraction not meaningful (chars=%d, words=%d); falling back to OCR",
-                char_count,
-                word_count,
-            )
-            result = self._hybrid.process_pdf(str(path), self.poppler_path)
-            return [p["text"] for p in result["pages"]]
-
-        # Image
-        logger.info("Processing image: %s", file_path)
-        original = cv2.imread(str(path))
-        if original is None:
-            raise OCRError(f"Could not read image from path: {file_path}")
-        result = self._hybrid.process_image_adaptive(original)
-
-        return [p["text"] for p in result["pages"]]
+        return [p["text"] for p in self.process_detailed(file_path)["pages"]]
 
     # ------------------------------------------------------------------
     # Detailed API  (returns structured dict)
     # ------------------------------------------------------------------
-    def process_detailed(self, file_path: str) -> dict:
+    def process_detailed(
+        self,
+        file_path: str,
+        content_digest: Optional[str] = None,
+        cancel_event: Optional[threading.Event] = None,
+        use_process_pool: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> dict:
         """
         Full feature extraction API for modern web-based result views.
 
@@ -2197,8 +3134,22 @@ class OCREngine:
         returns the text contents alongside full bounding boxes and 
         confidence scores for every word detected(that's why it is called detailed).
 
+        Results are cached by the SHA-256 of the file bytes plus the engine
+        configuration, so re-uploads of the same document return instantly.
+
         Args:
             file_path (str): File system path to the document.
+            content_digest (Optional[str]): SHA-256 hex digest of the file,
+                if the caller already computed it while receiving the upload.
+            cancel_event (Optional[threading.Event]): When set, OCR stops
+                between pages and raises `OCRCancelled`.
+            use_process_pool (bool): OCR images and single-page PDFs on the
+                page process pool too, not just multi-page PDFs.
+            progress_callback (Optional[ProgressCallback]): Called from the
+                OCR thread with "page_rasterized" and "page_ocr" events
+                (1-based "page", "page_count", and for page_ocr the page's
+                text, confidence, ocr_strategy and ocr_quality) as pages
+                finish. Cached and text-layer pages are reported at once.
 
         Returns:
             dict: Structured data containing pages, text, and bboxes.
@@ -2215,33 +3166,95 @@ class OCREngine:
                 f"Supported: {sorted(SUPPORTED_EXTENSIONS)}"
             )
 
+        if self._cache is None:
+            return self._process_detailed_uncached(
+                path, ext, cancel_event, use_process_pool, progress_callback
+            )
+
+        cache_key = make_cache_key(
+            content_digest or file_sha256(str(path)),
+            ext,
+            self._cache_fingerprint,
+        )
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.info("OCR cache hit for %s", file_path)
+            _emit_result_pages(progress_callback, cached)
+            return cached
+
+        result = self._process_detailed_uncached(
+            path, ext, cancel_event, use_process_pool, progress_callback
+        )
+        if _is_cacheable_result(result):
+            self._cache.set(cache_key, result)
+        return result
+
+    def _process_detailed_uncached(
+        self,
+        path: Path,
+        ext: str,
+        cancel_event: Optional[threading.Event] = None,
+        use_process_pool: bool = False,
+        progress_callback: Optional[ProgressCallback] = None,
+    ) -> dict:
+        """Route a validated document to Word, PDF or image extraction."""
+        file_path = str(path)
         if ext in SUPPORTED_WORD_EXTENSIONS:
+            logger.info("Processing Word document: %s", file_path)
             texts = self._process_word(str(path))
-            return _make_result(
+            result = _make_result(
                 [_make_page_result(t, 1.0) for t in texts]
             )
+            _emit_result_pages(progress_callback, result)
+            return result
 
         if ext in SUPPORTED_PDF_EXTENSIONS:
-            direct_text = _strip_pdf_text_artifacts(self._process_pdf_direct(str(path)))
-            if direct_text and _is_meaningful_direct_pdf_text(direct_text):
-                return _make_result(
-                    [_make_page_result(t, 1.0) for t in direct_text]
+            logger.info("Processing PDF: %s", file_path)
+            # Born-digital pages keep their text layer; only the rest are OCR'd.
+            page_texts = self._process_pdf_direct(str(path))
+            if page_texts and all(text is not None for text in page_texts):
+                logger.info("Direct extraction successful for all %d PDF page(s)", len(page_texts))
+                result = _make_result(
+                    [_make_page_result(t, 1.0) for t in page_texts]
                 )
+                _emit_result_pages(progress_callback, {**result, "ocr_strategy": "pdf_text_layer"})
+                return result
 
-            char_count, word_count = _direct_pdf_text_stats(direct_text)
+            text_layer_pages = {
+                idx: text for idx, text in enumerate(page_texts) if text is not None
+            }
             logger.info(
-                "Direct extraction not meaningful (chars=%d, words=%d); falling back to OCR",
-                char_count,
-                word_count,
+                "Text layer usable on %d of %d PDF page(s); OCR for the rest",
+                len(text_layer_pages),
+                len(page_texts),
+            )
+            return self._hybrid.process_pdf(
+                str(path),
+                self.poppler_path,
+                text_layer_pages=text_layer_pages,
+                cancel_event=cancel_event,
+                use_process_pool=use_process_pool,
+                progress_callback=progress_callback,
             )
-            result = self._hybrid.process_pdf(str(path), self.poppler_path)
-            return result
 
         # Image
+        logger.info("Processing image: %s", file_path)
         original = cv2.imread(str(path))
         if original is None:
             raise OCRError(f"Could not read image from path: {file_path}")
+        if use_process_pool:
+            return self._hybrid._ocr_pages(
+                [original],
+                1,
+                1,
+                cancel_event=cancel_event,
+                use_process_pool=True,
+                progress_callback=progress_callback,
+            )[0]
+        _check_cancelled(cancel_event)
+        _emit_progress(progress_callback, {"type": "page_rasterized", "page": 1, "page_count": 1})
         result = self._hybrid.process_image_adaptive(original)
+        _emit_result_pages(progress_callback, result)
         
         return result
 
@@ -2271,14 +3284,23 @@ class OCREngine:
     # ------------------------------------------------------------------
     # Direct PDF text extraction (PyMuPDF)
     # ------------------------------------------------------------------
-    def _process_pdf_direct(self, pdf_path: str) -> list[str]:
-        """Extract text directly from a born-digital PDF using PyMuPDF."""
+    def _process_pdf_direct(self, pdf_path: str) -> list[Optional[str]]:
+        """
+        Extract the text layer of each PDF page using PyMuPDF.
+
+        Returns one entry per page: the cleaned text when the page's text
+        layer is usable (see `_is_usable_pdf_text_layer`), otherwise None to
+        mark the page for OCR. Returns an empty list if the PDF cannot be read.
+        """
         try:
-            doc = fitz.open(pdf_path)
             page_texts = []
-            for page in doc:
-                text = page.get_text("text")
-                page_texts.append(text.strip())
+            with fitz.open(pdf_path) as doc:
+                for page in doc:
+                    text = _strip_pdf_text_artifacts([page.get_text("text")])[0]
+                    has_images = bool(page.get_images(full=False))
+                    page_texts.append(
+                        text if _is_usable_pdf_text_layer(text, has_images) else None
+                    )
             return page_texts
         except Exception as e:
             logger.warning(f"Direct PDF extraction failed: {e}")
@@ -2290,14 +3312,16 @@ class OCREngine:
 #  while the simpler `process` is used for language detection via /detect-language)
 #
 # 1. Born-Digital/Word Check: 
-#    If the file is a Born-Digital PDF or Word doc, it uses PyMuPDF or docx2txt directly.
+#    Word docs use python-docx/docx2txt directly. PDFs are classified page by page: pages
+#    with a usable text layer are read with PyMuPDF, the rest are OCR'd and merged in order.
 #
 # 2. Hybrid OCR Entry: 
 #    If it's a scanned Image or PDF, `HybridOCREngine` takes over.
 #
 # 3. Fast Path (Tesseract):
-#    It tries Tesseract with PSM 4, 6, and 3.
-#    - Optimization: If it sees > 500 chars and > 85% confidence, it exits early to save time.
+#    It tries Tesseract with PSM 3, 4, 6, 11 and 1 concurrently, ordered by `PSMScheduler`.
+#    - Optimization: The learned top PSM runs alone first and exits early once it clears
+#      OCR_HIGH_QUALITY_SCORE; otherwise pending modes are cancelled at the first such hit.
 #    - Fallback: If ALL modes fail to extract at least 100 characters, it triggers the "Slow Path."
 #
 # 4. Slow Path (docTR + Parallel Tesseract):
@@ -2306,5 +3330,9 @@ class OCREngine:
 #    - Merges the result for the final high-precision output.
 #
 # 5. PDF Workflow:
-#    `HybridOCREngine.process_pdf` uses `_convert_pdf_to_images` (at 150 DPI) and 
-#    loops over the `process_image` logic (Fast/Slow Path) for every page.
+#    `HybridOCREngine.process_pdf` streams pages from `_iter_pdf_page_images` (the
+#    embedded scan at native resolution for single-image pages, otherwise PyMuPDF
+#    at 150 DPI, poppler's `_convert_pdf_to_images` only if PyMuPDF cannot open the file)
+#    and runs the adaptive `process_image` logic (Fast/Slow Path) for every page on a
+#    shared process pool (OCR_PDF_POOL_WORKERS), at most OCR_PDF_MAX_PARALLEL_PAGES
+#    pages per document at a time, reassembling the results in page order.
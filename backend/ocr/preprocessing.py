@@ -71,91 +71,126 @@ def preprocess_array(image: np.ndarray, config: Optional[dict] = None) -> np.nda
     Core entry point: apply the full configurable preprocessing pipeline
     on a BGR numpy array.
     """
-    cfg = {**DEFAULT_CONFIG, **(config or {})}
-    debug = cfg["debug"]
-    debug_dir = cfg["debug_output_dir"]
+    return PreprocessingGraph(image).run(config)
 
-    if debug:
-        os.makedirs(debug_dir, exist_ok=True)
-        _save_debug(debug_dir, "00_original", image)
 
-    # 1. Resize
-    if cfg["resize"]:
-        image = resize_image(image, max_dim=cfg["max_dim"])
-        if debug:
-            _save_debug(debug_dir, "01_resized", image)
-
-    # 2. Remove Colored Artifacts (Stamps/Signatures) BEFORE grayscale
-    if cfg["remove_colors"] and len(image.shape) == 3:
-        image = remove_colored_artifacts(image)
-        if debug:
-            _save_debug(debug_dir, "01b_colors_removed", image)
-
-    # 3. Convert to grayscale
-    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image.copy()
-
-    # 4. Deskew
-    if cfg["deskew"]:
-        gray = deskew(gray)
-        if debug:
-            _save_debug(debug_dir, "02_deskewed", gray)
-
-    # 4. Denoise
-    if cfg["denoise"]:
-        gray = denoise(gray)
-        if debug:
-            _save_debug(debug_dir, "03_denoised", gray)
-
-    # 5. Contrast Enhancement (CLAHE)
-    if cfg["contrast_enhance"]:
-        gray = enhance_contrast(gray)
-        if debug:
-            _save_debug(debug_dir, "04_contrast", gray)
-
-    # 6. Binarization (Sauvola-style)
-    if cfg["binarize"]:
-        gray = binarize_sauvola(gray)
-        if debug:
-            _save_debug(debug_dir, "05_binarized", gray)
+# ===================================================================
+# Memoized pipeline
+# ===================================================================
 
-    # 7. Morphological cleanup
-    if cfg["morphological_cleanup"]:
-        gray = morphological_cleanup(gray)
-        if debug:
-            _save_debug(debug_dir, "06_morphological", gray)
+def _to_grayscale(image: np.ndarray) -> np.ndarray:
+    return cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if len(image.shape) == 3 else image.copy()
+
+
+# (node name, config keys the node depends on, step, debug image name)
+# Order matters: a node's output feeds the next enabled node.
+PIPELINE_STEPS = (
+    ("resize", ("resize", "max_dim"),
+     lambda image, cfg: resize_image(image, max_dim=cfg["max_dim"]) if cfg["resize"] else image,
+     "01_resized"),
+    # Remove Colored Artifacts (Stamps/Signatures) BEFORE grayscale
+    ("remove_colors", ("remove_colors",),
+     lambda image, cfg: (
+         remove_colored_artifacts(image)
+         if cfg["remove_colors"] and len(image.shape) == 3
+         else image
+     ),
+     "01b_colors_removed"),
+    ("grayscale", (), lambda image, cfg: _to_grayscale(image), None),
+    ("deskew", ("deskew",),
+     lambda gray, cfg: deskew(gray) if cfg["deskew"] else gray,
+     "02_deskewed"),
+    ("denoise", ("denoise",),
+     lambda gray, cfg: denoise(gray) if cfg["denoise"] else gray,
+     "03_denoised"),
+    # Contrast Enhancement (CLAHE)
+    ("contrast_enhance", ("contrast_enhance",),
+     lambda gray, cfg: enhance_contrast(gray) if cfg["contrast_enhance"] else gray,
+     "04_contrast"),
+    # Binarization (Sauvola-style)
+    ("binarize", ("binarize",),
+     lambda gray, cfg: binarize_sauvola(gray) if cfg["binarize"] else gray,
+     "05_binarized"),
+    ("morphological_cleanup", ("morphological_cleanup",),
+     lambda gray, cfg: morphological_cleanup(gray) if cfg["morphological_cleanup"] else gray,
+     "06_morphological"),
+    # Line / border removal
+    ("remove_lines", ("remove_lines",),
+     lambda gray, cfg: remove_lines(gray) if cfg["remove_lines"] else gray,
+     "07_lines_removed"),
+    # Target vertical noise specifically
+    ("remove_vertical_noise", ("remove_vertical_noise",),
+     lambda gray, cfg: remove_vertical_noise(gray) if cfg["remove_vertical_noise"] else gray,
+     "07b_vertical_noise_removed"),
+    # Aggressive Sidebar Cleaning (Right 15%)
+    ("remove_sidebar_noise", ("remove_sidebar_noise",),
+     lambda gray, cfg: remove_sidebar_noise(gray) if cfg["remove_sidebar_noise"] else gray,
+     "07c_sidebar_cleaned"),
+    # Thin characters (Erosion)
+    ("thin_characters", ("thin_characters",),
+     lambda gray, cfg: thin_characters(gray) if cfg["thin_characters"] else gray,
+     "07d_thinned"),
+    # Sharpening (optional)
+    ("sharpen", ("sharpen",),
+     lambda gray, cfg: sharpen(gray) if cfg["sharpen"] else gray,
+     "08_sharpened"),
+)
+
+
+class PreprocessingGraph:
+    """
+    Per-page preprocessing with shared intermediate results.
 
-    # 8. Line / border removal
-    if cfg["remove_lines"]:
-        gray = remove_lines(gray)
-        if debug:
-            _save_debug(debug_dir, "07_lines_removed", gray)
+    The pipeline is a chain of nodes; each node's cache key is the chain of
+    (node, relevant config values) leading up to it. Variants that only
+    differ in later steps (e.g. denoise/contrast on or off) therefore reuse
+    the resized, color-cleaned, grayscale and deskewed arrays computed for
+    the first variant, and only the differing tail is recomputed.
 
-    # 8b. Target vertical noise specifically
-    if cfg["remove_vertical_noise"]:
-        gray = remove_vertical_noise(gray)
-        if debug:
-            _save_debug(debug_dir, "07b_vertical_noise_removed", gray)
+    Cached arrays are shared between variants, so steps and callers must
+    treat them as read-only (all pipeline steps return new arrays).
+    """
 
-    # 8c. Aggressive Sidebar Cleaning (Right 15%)
-    if cfg["remove_sidebar_noise"]:
-        gray = remove_sidebar_noise(gray)
-        if debug:
-            _save_debug(debug_dir, "07c_sidebar_cleaned", gray)
+    def __init__(self, image: np.ndarray):
+        self.image = image
+        self._cache: dict[tuple, np.ndarray] = {}
+        self.hits = 0
+        self.misses = 0
 
-    # 8d. Thin characters (Erosion)
-    if cfg["thin_characters"]:
-        gray = thin_characters(gray)
-        if debug:
-            _save_debug(debug_dir, "07d_thinned", gray)
+    def run(self, config: Optional[dict] = None) -> np.ndarray:
+        """Return the preprocessed grayscale image for *config*."""
+        cfg = {**DEFAULT_CONFIG, **(config or {})}
+        debug = cfg["debug"]
+        debug_dir = cfg["debug_output_dir"]
 
-    # 9. Sharpening (optional)
-    if cfg["sharpen"]:
-        gray = sharpen(gray)
         if debug:
-            _save_debug(debug_dir, "08_sharpened", gray)
-
-    logger.debug("Preprocessing complete — output shape %s", gray.shape)
-    return gray
+            os.makedirs(debug_dir, exist_ok=True)
+            _save_debug(debug_dir, "00_original", self.image)
+
+        image = self.image
+        key: tuple = ()
+        for name, config_keys, step, debug_name in PIPELINE_STEPS:
+            key = key + ((name, tuple(cfg[k] for k in config_keys)),)
+            cached = self._cache.get(key)
+            if cached is not None:
+                self.hits += 1
+                image = cached
+                continue
+
+            self.misses += 1
+            output = step(image, cfg)
+            self._cache[key] = output
+            if debug and debug_name and cfg[config_keys[0]]:
+                _save_debug(debug_dir, debug_name, output)
+            image = output
+
+        logger.debug(
+            "Preprocessing complete — output shape %s (cache hits=%d, misses=%d)",
+            image.shape,
+            self.hits,
+            self.misses,
+        )
+        return image
 
 
 # ===================================================================
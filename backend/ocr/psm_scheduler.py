@@ -0,0 +1,316 @@
+"""
+PSM Scheduler Module
+====================
+Learns which Tesseract page segmentation modes succeed on which kinds of
+pages, so the Hybrid fast path can try the likeliest winner first and stop
+as soon as it meets the quality target.
+
+Pages are described by a few cheap features (layout region count, complex
+layout flag, aspect ratio, ink density). For every PSM run the scheduler
+records whether that mode "hit" the quality target, bucketed per feature
+value. Rankings combine the per-feature hit rates naive-Bayes style in
+log-odds space, which stays useful while individual feature combinations
+are still rare.
+
+Only runs that completed are recorded. On most pages the fast path stops
+as soon as one mode meets the target and cancels the modes that have not
+started, so lower-ranked modes collect fewer trials than the leaders. To
+keep that from locking in an early ordering, a PSM_EXPLORE_RATE fraction of
+pages runs every mode to completion and records them all.
+
+Statistics persist to a JSON file and are merged (not overwritten) on save,
+under an exclusive lock on a sidecar ``.lock`` file, so several worker
+processes (including the PDF page pool) can share one file.
+"""
+
+import atexit
+import json
+import logging
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: saves are not serialised across processes
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+PSM_STATS_PATH = os.getenv(
+    "OCR_PSM_STATS_PATH",
+    os.path.join(os.path.expanduser("~"), ".cache", "neptext", "psm_stats.json"),
+)
+PSM_SCHEDULER_ENABLED = os.getenv("OCR_PSM_SCHEDULER", "1") != "0"
+# Minimum runs of the top-ranked PSM before it may be tried on its own.
+PSM_MIN_TRIALS_FOR_EARLY_EXIT = 20
+# Predicted hit probability required to try only the top-ranked PSM first.
+PSM_EARLY_EXIT_MIN_PROBABILITY = 0.70
+# Fraction of pages that run every PSM to completion so all modes keep learning.
+PSM_EXPLORE_RATE = float(os.getenv("OCR_PSM_EXPLORE_RATE", "0.05"))
+PSM_SAVE_EVERY_UPDATES = 25
+PSM_SAVE_INTERVAL_SECONDS = 60.0
+# Pseudo-trials pulling sparse per-feature rates towards the PSM's overall rate.
+_SMOOTHING_TRIALS = 4.0
+_STATS_VERSION = 1
+
+
+def _bucket_region_count(count: int) -> str:
+    if count <= 0:
+        return "0"
+    if count == 1:
+        return "1"
+    if count <= 3:
+        return "2-3"
+    if count <= 7:
+        return "4-7"
+    return "8+"
+
+
+def _bucket_aspect_ratio(height: int, width: int) -> str:
+    ratio = height / float(max(1, width))
+    if ratio < 0.9:
+        return "landscape"
+    if ratio < 1.2:
+        return "square"
+    if ratio < 1.6:
+        return "portrait"
+    return "tall"
+
+
+def _bucket_ink_density(density: float) -> str:
+    if density < 0.03:
+        return "sparse"
+    if density < 0.08:
+        return "light"
+    if density < 0.16:
+        return "normal"
+    return "dense"
+
+
+def page_features(
+    image_shape: tuple[int, ...],
+    region_count: int,
+    complex_layout: bool,
+    ink_density: float,
+) -> dict[str, str]:
+    """Bucket cheap page measurements into categorical scheduler features."""
+    height, width = image_shape[:2]
+    return {
+        "regions": _bucket_region_count(region_count),
+        "complex": "yes" if complex_layout else "no",
+        "aspect": _bucket_aspect_ratio(height, width),
+        "ink": _bucket_ink_density(ink_density),
+    }
+
+
+def _logit(p: float) -> float:
+    p = min(max(p, 1e-4), 1.0 - 1e-4)
+    return math.log(p / (1.0 - p))
+
+
+def _sigmoid(x: float) -> float:
+    return 1.0 / (1.0 + math.exp(-x))
+
+
+class PSMScheduler:
+    """Ranks PSM modes per page and learns from every completed run."""
+
+    def __init__(self, psm_modes: tuple[str, ...], stats_path: Optional[str] = PSM_STATS_PATH):
+        self.psm_modes = tuple(psm_modes)
+        self.stats_path = stats_path
+        self._lock = threading.Lock()
+        # {psm: [trials, hits]} and {feature: {value: {psm: [trials, hits]}}}
+        self._totals: dict[str, list[float]] = {}
+        self._features: dict[str, dict[str, dict[str, list[float]]]] = {}
+        self._pending: dict = {"totals": {}, "features": {}}
+        self._pending_updates = 0
+        self._last_save = time.time()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Ranking
+    # ------------------------------------------------------------------
+    def predict(self, features: dict[str, str]) -> dict[str, float]:
+        """Predicted probability that each PSM meets the quality target."""
+        predictions = {}
+        with self._lock:
+            for order, psm in enumerate(self.psm_modes):
+                trials, hits = self._totals.get(psm, [0.0, 0.0])
+                # Unseen modes keep the configured order via a tiny prior.
+                prior = 0.5 - order * 0.01
+                base = (hits + prior * _SMOOTHING_TRIALS) / (trials + _SMOOTHING_TRIALS)
+                log_odds = _logit(base)
+                for name, value in features.items():
+                    f_trials, f_hits = (
+                        self._features.get(name, {}).get(value, {}).get(psm, [0.0, 0.0])
+                    )
+                    rate = (f_hits + base * _SMOOTHING_TRIALS) / (f_trials + _SMOOTHING_TRIALS)
+                    log_odds += _logit(rate) - _logit(base)
+                predictions[psm] = _sigmoid(log_odds)
+        return predictions
+
+    def plan(self, features: dict[str, str]) -> tuple[list[str], bool, bool]:
+        """
+        Order PSM modes for a page.
+
+        Returns the ranked modes, whether the top mode is trusted enough to
+        be run alone before the others are started, and whether this is an
+        exploration page on which every mode should run to completion.
+        """
+        predictions = self.predict(features)
+        ranked = sorted(
+            self.psm_modes,
+            key=lambda psm: (-predictions[psm], self.psm_modes.index(psm)),
+        )
+        with self._lock:
+            top_trials = self._totals.get(ranked[0], [0.0, 0.0])[0]
+        explore = random.random() < PSM_EXPLORE_RATE
+        try_top_first = (
+            not explore
+            and top_trials >= PSM_MIN_TRIALS_FOR_EARLY_EXIT
+            and predictions[ranked[0]] >= PSM_EARLY_EXIT_MIN_PROBABILITY
+        )
+        return ranked, try_top_first, explore
+
+    # ------------------------------------------------------------------
+    # Learning
+    # ------------------------------------------------------------------
+    def record(self, features: dict[str, str], outcomes: dict[str, bool]) -> None:
+        """Record whether each PSM that ran on this page met the quality target."""
+        if not outcomes:
+            return
+        with self._lock:
+            for psm, hit in outcomes.items():
+                for totals in (self._totals, self._pending["totals"]):
+                    entry = totals.setdefault(psm, [0.0, 0.0])
+                    entry[0] += 1
+                    entry[1] += 1 if hit else 0
+                for name, value in features.items():
+                    for table in (self._features, self._pending["features"]):
+                        entry = (
+                            table.setdefault(name, {})
+                            .setdefault(value, {})
+                            .setdefault(psm, [0.0, 0.0])
+                        )
+                        entry[0] += 1
+                        entry[1] += 1 if hit else 0
+            self._pending_updates += 1
+            due = (
+                self._pending_updates >= PSM_SAVE_EVERY_UPDATES
+                or time.time() - self._last_save >= PSM_SAVE_INTERVAL_SECONDS
+            )
+        if due:
+            self.save()
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _read_file(self) -> dict:
+        if not self.stats_path or not os.path.exists(self.stats_path):
+            return {}
+        try:
+            with open(self.stats_path, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, json.JSONDecodeError) as exc:
+            logger.warning("[PSM scheduler] ignoring unreadable stats %s: %s", self.stats_path, exc)
+            return {}
+        if data.get("version") != _STATS_VERSION:
+            return {}
+        return data
+
+    def _load(self) -> None:
+        data = self._read_file()
+        self._totals = data.get("totals", {})
+        self._features = data.get("features", {})
+        if self._totals:
+            logger.info(
+                "[PSM scheduler] loaded stats for %d PSM mode(s) from %s",
+                len(self._totals),
+                self.stats_path,
+            )
+
+    @contextmanager
+    def _file_lock(self):
+        """Hold an exclusive inter-process lock for a read-merge-write of the stats file."""
+        if fcntl is None:
+            yield
+            return
+        with open(f"{self.stats_path}.lock", "a") as handle:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+    def save(self) -> None:
+        """Merge unsaved updates into the stats file (locked, atomic replace)."""
+        if not self.stats_path:
+            return
+        with self._lock:
+            pending = self._pending
+            self._pending = {"totals": {}, "features": {}}
+            self._pending_updates = 0
+            self._last_save = time.time()
+        if not pending["totals"]:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.stats_path) or ".", exist_ok=True)
+            with self._file_lock():
+                data = self._read_file() or {"version": _STATS_VERSION, "totals": {}, "features": {}}
+                _merge_stats(data, pending)
+                tmp_path = f"{self.stats_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as handle:
+                    json.dump(data, handle)
+                os.replace(tmp_path, self.stats_path)
+        except OSError as exc:
+            logger.warning("[PSM scheduler] could not save stats to %s: %s", self.stats_path, exc)
+            with self._lock:
+                _merge_stats(self._pending, pending)
+            return
+
+        # Pick up statistics merged in by other worker processes, keeping
+        # anything recorded here while the file was being written.
+        with self._lock:
+            self._totals = data["totals"]
+            self._features = data["features"]
+            _merge_stats({"totals": self._totals, "features": self._features}, self._pending)
+
+
+def _merge_stats(target: dict, source: dict) -> None:
+    """Add the trial/hit counts of *source* into *target* in place."""
+    for psm, (trials, hits) in source["totals"].items():
+        entry = target["totals"].setdefault(psm, [0.0, 0.0])
+        entry[0] += trials
+        entry[1] += hits
+    for name, values in source["features"].items():
+        for value, psms in values.items():
+            for psm, (trials, hits) in psms.items():
+                entry = (
+                    target["features"].setdefault(name, {})
+                    .setdefault(value, {})
+                    .setdefault(psm, [0.0, 0.0])
+                )
+                entry[0] += trials
+                entry[1] += hits
+
+
+_scheduler: Optional[PSMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_psm_scheduler(psm_modes: tuple[str, ...]) -> Optional[PSMScheduler]:
+    """Process-wide scheduler, or None when disabled via OCR_PSM_SCHEDULER=0."""
+    global _scheduler
+    if not PSM_SCHEDULER_ENABLED:
+        return None
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PSMScheduler(psm_modes)
+            atexit.register(_scheduler.save)
+        return _scheduler
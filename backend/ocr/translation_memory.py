@@ -0,0 +1,277 @@
+"""
+Translation Memory Module
+=========================
+Fuzzy translation memory for near-duplicate segments: government letters
+that differ only in dates, names and reference numbers.
+
+Segments are indexed by MinHash signatures over character 3-grams, with
+locality-sensitive hashing (16 bands x 4 rows) so a lookup touches only the
+few stored segments that share a band bucket, not the whole memory. Both the
+segments and the LSH buckets live in SQLite, so lookups stay at a handful of
+indexed reads even with millions of stored segments.
+
+Matches are used two ways by `translator.py`:
+- similarity >= TM_REFERENCE_MIN_SIMILARITY: the stored pair is shown to
+  the model as a reference translation;
+- the same text up to case, spacing and digit script: the stored
+  translation is reused directly without a Gemini call. Near-duplicates
+  never are, however similar: a letter that differs only in a person's
+  name must not come back with the stored person's name.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+import zlib
+from collections import Counter
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from ocr.cache import DEFAULT_CACHE_ROOT, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+TM_ENABLED = os.getenv("TRANSLATION_MEMORY", "1") != "0"
+TM_PATH = os.getenv(
+    "TRANSLATION_MEMORY_PATH",
+    os.path.join(DEFAULT_CACHE_ROOT, "translation_memory.sqlite3"),
+)
+TM_REFERENCE_MIN_SIMILARITY = float(os.getenv("TRANSLATION_MEMORY_REFERENCE_SIMILARITY", "0.6"))
+# Segments shorter than this (after normalization) are too generic to match.
+TM_MIN_SEGMENT_CHARS = 12
+TM_MAX_SEGMENT_CHARS = 4000
+# Segment ids read per LSH bucket, and candidates scored per lookup (those
+# sharing the most buckets); together they bound lookup cost at any size.
+TM_MAX_BUCKET_SCAN = 64
+TM_MAX_CANDIDATES = 32
+
+_NGRAM = 3
+_BANDS = 16
+_ROWS_PER_BAND = 4
+_NUM_PERM = _BANDS * _ROWS_PER_BAND
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed: signatures must be identical across processes and restarts.
+_rng = np.random.RandomState(20240613)
+_PERM_A = _rng.randint(1, 1 << 31, size=_NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, 1 << 31, size=_NUM_PERM, dtype=np.uint64)
+
+_DIGIT_RE = re.compile(r"[0-9०-९]")
+
+
+@dataclass
+class TMMatch:
+    source_text: str
+    target_text: str
+    similarity: float
+    reusable: bool
+
+
+def _normalize_for_matching(text: str) -> str:
+    """NFC, lowercase, collapsed whitespace, digits masked to '#'."""
+    text = unicodedata.normalize("NFC", text).lower()
+    text = _DIGIT_RE.sub("#", text)
+    return " ".join(text.split())
+
+
+def _digits(text: str) -> str:
+    """All digits in order, Devanagari digits mapped to ASCII."""
+    return "".join(
+        str(ord(char) - 0x0966) if "०" <= char <= "९" else char
+        for char in _DIGIT_RE.findall(text)
+    )
+
+
+def _shingles(normalized: str) -> set[str]:
+    if len(normalized) <= _NGRAM:
+        return {normalized}
+    return {normalized[i:i + _NGRAM] for i in range(len(normalized) - _NGRAM + 1)}
+
+
+def _minhash(shingles: set[str]) -> np.ndarray:
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) for shingle in shingles),
+        dtype=np.uint64,
+        count=len(shingles),
+    )
+    # (a*x + b) mod p for every permutation/shingle pair, then min per permutation.
+    permuted = (np.outer(hashes, _PERM_A) + _PERM_B) % np.uint64(_MERSENNE_PRIME)
+    return (permuted & _MAX_HASH).min(axis=0).astype(np.uint32)
+
+
+def _band_keys(signature: np.ndarray, pair: str) -> list[int]:
+    """One signed 63-bit bucket key per LSH band, scoped to the language pair."""
+    pair_seed = zlib.crc32(pair.encode("utf-8"))
+    keys = []
+    for band in range(_BANDS):
+        rows = signature[band * _ROWS_PER_BAND:(band + 1) * _ROWS_PER_BAND]
+        high = zlib.crc32(rows.tobytes(), pair_seed + band)
+        low = zlib.adler32(rows.tobytes(), band + 1)
+        keys.append(((high << 31) ^ low) & ((1 << 62) - 1))
+    return keys
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+class TranslationMemory:
+    """SQLite-backed MinHash/LSH store of source -> target segment pairs."""
+
+    def __init__(self, path: str = TM_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS tm_segments (
+                id INTEGER PRIMARY KEY,
+                digest TEXT UNIQUE NOT NULL,
+                pair TEXT NOT NULL,
+                source_text TEXT NOT NULL,
+                target_text TEXT NOT NULL,
+                signature BLOB NOT NULL,
+                created_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tm_lsh (
+                bucket INTEGER NOT NULL,
+                segment_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tm_lsh_bucket ON tm_lsh (bucket);
+            """
+        )
+        self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+    def lookup(self, text: str, source_key: str, target_key: str) -> Optional[TMMatch]:
+        """Best stored match for *text* at or above the reference threshold."""
+        normalized = _normalize_for_matching(text)
+        if not TM_MIN_SEGMENT_CHARS <= len(normalized) <= TM_MAX_SEGMENT_CHARS:
+            return None
+        pair = f"{source_key}->{target_key}"
+        query_shingles = _shingles(normalized)
+        signature = _minhash(query_shingles)
+        buckets = _band_keys(signature, pair)
+
+        # Each bucket contributes at most TM_MAX_BUCKET_SCAN segment ids, so a
+        # template shared by thousands of letters cannot slow lookups down.
+        bucket_scan = " UNION ALL ".join(
+            "SELECT * FROM (SELECT segment_id FROM tm_lsh "
+            f"WHERE bucket = ? LIMIT {TM_MAX_BUCKET_SCAN})"
+            for _ in buckets
+        )
+        with self._lock:
+            shared = Counter(
+                segment_id for (segment_id,) in self._conn.execute(bucket_scan, buckets)
+            )
+            candidate_ids = [segment_id for segment_id, _ in shared.most_common(TM_MAX_CANDIDATES)]
+            if not candidate_ids:
+                return None
+            # pair is part of the bucket keys; the filter only guards collisions.
+            rows = self._conn.execute(
+                f"""
+                SELECT source_text, target_text, signature FROM tm_segments
+                WHERE id IN ({",".join("?" * len(candidate_ids))}) AND pair = ?
+                """,
+                (*candidate_ids, pair),
+            ).fetchall()
+        if not rows:
+            return None
+
+        signatures = np.frombuffer(b"".join(row[2] for row in rows), dtype=np.uint32)
+        estimates = (signatures.reshape(len(rows), _NUM_PERM) == signature).mean(axis=1)
+        best = rows[int(np.argmax(estimates))]
+
+        # The MinHash estimate ranks candidates; the exact Jaccard decides.
+        similarity = _jaccard(query_shingles, _shingles(_normalize_for_matching(best[0])))
+        if similarity < TM_REFERENCE_MIN_SIMILARITY:
+            return None
+        return TMMatch(
+            source_text=best[0],
+            target_text=best[1],
+            similarity=round(similarity, 4),
+            reusable=(
+                normalized == _normalize_for_matching(best[0])
+                and _digits(text) == _digits(best[0])
+            ),
+        )
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+    def add(self, source_text: str, target_text: str, source_key: str, target_key: str) -> None:
+        """Store one translated segment pair (duplicates are ignored)."""
+        normalized = _normalize_for_matching(source_text)
+        if not target_text.strip():
+            return
+        if not TM_MIN_SEGMENT_CHARS <= len(normalized) <= TM_MAX_SEGMENT_CHARS:
+            return
+        pair = f"{source_key}->{target_key}"
+        digest = make_cache_key(pair, unicodedata.normalize("NFC", source_text.strip()))
+        signature = _minhash(_shingles(normalized))
+
+        with self._lock:
+            try:
+                cursor = self._conn.execute(
+                    """
+                    INSERT OR IGNORE INTO tm_segments
+                        (digest, pair, source_text, target_text, signature, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                    """,
+                    (
+                        digest,
+                        pair,
+                        source_text.strip(),
+                        target_text.strip(),
+                        signature.tobytes(),
+                        time.time(),
+                    ),
+                )
+                if cursor.rowcount:
+                    self._conn.executemany(
+                        "INSERT INTO tm_lsh (bucket, segment_id) VALUES (?, ?)",
+                        [(bucket, cursor.lastrowid) for bucket in _band_keys(signature, pair)],
+                    )
+                self._conn.commit()
+            except sqlite3.Error as exc:
+                self._conn.rollback()
+                logger.warning("[Translation memory] could not store segment: %s", exc)
+
+    def stats(self) -> dict:
+        with self._lock:
+            (count,) = self._conn.execute("SELECT COUNT(*) FROM tm_segments").fetchone()
+        return {"path": self.path, "segments": count}
+
+
+_memory: Optional[TranslationMemory] = None
+_memory_lock = threading.Lock()
+
+
+def get_translation_memory() -> Optional[TranslationMemory]:
+    """Process-wide translation memory, or None when disabled or unavailable."""
+    global _memory
+    if not TM_ENABLED:
+        return None
+    with _memory_lock:
+        if _memory is None:
+            try:
+                _memory = TranslationMemory()
+            except (OSError, sqlite3.Error) as exc:
+                logger.warning("[Translation memory] disabled, cannot open %s: %s", TM_PATH, exc)
+                return None
+        return _memory
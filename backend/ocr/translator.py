@@ -1,11 +1,24 @@
+import asyncio
+import json
 import os
 import re
 import time
+import unicodedata
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
 from google import genai
 from google.genai import types
 from pydantic import BaseModel
 from dotenv import load_dotenv, find_dotenv
 
+from ocr.cache import DEFAULT_CACHE_ROOT, ResultCache, make_cache_key
+from ocr.translation_memory import TMMatch, get_translation_memory
+from ocr.model_health import get_model_health
+from ocr.llm_dispatch import DispatchError, HedgedDispatcher
+from ocr.coalescer import RequestCoalescer
+from execution.offload import IO_RESOURCE, run_blocking
+from execution.pools import LLM_IO_POOL, get_pool
+
 load_dotenv(find_dotenv())
 
 # Optimization: Limit Tesseract's internal multi-threading when we use parallel page processing.
@@ -48,6 +61,18 @@ MODELS_TO_TRY = [
     "gemini-2.5-pro",
 ]
 DIRECT_TEXT_REQUEST_TIMEOUT_MS = 15000
+# OCR-repair prompts are longer and run one model at a time, but still need a
+# deadline so a hung model cannot stall an upload.
+REPAIR_OCR_REQUEST_TIMEOUT_MS = int(os.getenv("TRANSLATION_REPAIR_TIMEOUT_MS", "60000"))
+# Shared with the Gemini OCR fallbacks: models with an open circuit breaker
+# are skipped (see ocr/model_health.py).
+model_health = get_model_health()
+# Direct-text requests go to the preferred model first and hedge to the next
+# one only after that model's p90 latency (see ocr/llm_dispatch.py).
+translation_dispatcher = HedgedDispatcher(MODELS_TO_TRY, health=model_health)
+TRANSLATION_MEMORY_MODEL = "translation_memory"
+# Similar past translations shown to the model as references per request.
+TRANSLATION_MEMORY_MAX_REFERENCES = 3
 PIVOT_LANGUAGE = "Nepali"
 PIVOTABLE_NON_NEPALI_LANGS = {"tamang", "newari"}
 LANGUAGE_ALIASES = {
@@ -69,6 +94,47 @@ LANGUAGE_DISPLAY_NAMES = {
     "newari": "Nepal Bhasa (Newari)",
 }
 
+# Segment translation cache: repeated boilerplate, clauses and re-submitted
+# drafts are served without a Gemini call. Only successful translations are
+# stored. Keys name the prompt template, not the rendered prompt, so chunks
+# of different documents share entries; bump TRANSLATION_PROMPT_VERSION
+# whenever a template in `_build_system_prompt` changes.
+TRANSLATION_PROMPT_VERSION = "2026.10.1"
+TRANSLATION_CACHE_ENABLED = os.getenv("TRANSLATION_CACHE", "1") != "0"
+TRANSLATION_CACHE_DIR = os.getenv(
+    "TRANSLATION_CACHE_DIR",
+    os.path.join(DEFAULT_CACHE_ROOT, "translations"),
+)
+translation_cache = (
+    ResultCache(
+        "translation",
+        TRANSLATION_CACHE_DIR,
+        memory_entries=int(os.getenv("TRANSLATION_CACHE_MEMORY_ENTRIES", "2048")),
+        disk_max_bytes=int(os.getenv("TRANSLATION_CACHE_MAX_MB", "256")) * 1024 * 1024,
+    )
+    if TRANSLATION_CACHE_ENABLED
+    else None
+)
+
+# Short segments (table rows, list items) are packed into one JSON request
+# instead of one Gemini call each. Budgets are in estimated input tokens.
+TRANSLATION_BATCHING_ENABLED = os.getenv("TRANSLATION_BATCHING", "1") != "0"
+TRANSLATION_BATCH_MAX_TOKENS = int(os.getenv("TRANSLATION_BATCH_MAX_TOKENS", "2000"))
+TRANSLATION_BATCH_MAX_SEGMENTS = int(os.getenv("TRANSLATION_BATCH_MAX_SEGMENTS", "50"))
+# Segments above this size are translated on their own.
+TRANSLATION_BATCH_SEGMENT_MAX_TOKENS = 200
+# Short async requests from concurrent callers with the same language pair
+# are held this long and merged into one batch request (see ocr/coalescer.py).
+TRANSLATION_COALESCING_ENABLED = os.getenv("TRANSLATION_COALESCING", "1") != "0"
+TRANSLATION_COALESCE_MAX_WAIT_MS = int(os.getenv("TRANSLATION_COALESCE_MAX_WAIT_MS", "15"))
+# translate_text_stream streams model tokens for the first chunk, which is
+# what the user reads first; later chunks arrive whole.
+TRANSLATION_STREAM_FIRST_CHUNK_TOKENS = os.getenv("TRANSLATION_STREAM_TOKENS", "1") != "0"
+
+class BatchTranslationItem(BaseModel):
+    id: int
+    translation: str
+
 class LanguageDetectionResult(BaseModel):
     language: str
     code: str
@@ -152,12 +218,44 @@ CRITICAL TARGET LANGUAGE CONTROL:
     return ""
 
 
+def _pivot_pieces(text_input: str | list[str], repair_ocr: bool) -> tuple[list[str], str | None]:
+    chunks, full_context = _plan_direct_translation(text_input, repair_ocr)
+    if chunks is None:
+        return [text_input], None
+    return chunks, full_context
+
+
+def _finish_pivot(
+    legs: list[tuple[tuple[str, str], tuple[str, str]]],
+    start_time: float,
+) -> tuple[str, str]:
+    """Reassemble pivot results in chunk order with the combined model label."""
+    final_texts = [second[0] for _, second in legs]
+    first_models = [first[1] for first, _ in legs]
+    second_models = [second[1] for _, second in legs]
+    print(
+        "Pivot translation complete: "
+        f"{len(legs)} chunk(s), {time.time() - start_time:.2f}s"
+    )
+    return "\n\n".join(final_texts), f"nepali_pivot:{_combine_model_names(*first_models, *second_models)}"
+
+
 def _translate_via_nepali(
     text_input: str | list[str],
     source_lang: str,
     target_lang: str,
     repair_ocr: bool,
 ) -> tuple[str | list[str], str]:
+    """
+    Translate through Nepali as a per-chunk pipeline.
+
+    Each chunk (or batch of short chunks) starts its Nepali -> target leg as
+    soon as its own first leg returns, so total latency is the slowest
+    chunk's two legs rather than the slowest first leg plus the slowest
+    second leg. Both legs go through `_call_llm`, so the intermediate Nepali
+    is cached and reused by later Tamang/Newari -> Nepali requests.
+    """
+    start_time = time.time()
     source_display = _display_lang(source_lang)
     target_display = _display_lang(target_lang)
     print(
@@ -165,39 +263,91 @@ def _translate_via_nepali(
         f"{PIVOT_LANGUAGE} -> {target_display}"
     )
 
-    nepali_text, first_model = _translate_direct(
-        text_input,
-        source_display,
-        PIVOT_LANGUAGE,
-        repair_ocr=repair_ocr,
-    )
-    final_text, second_model = _translate_direct(
-        nepali_text,
-        PIVOT_LANGUAGE,
-        target_display,
-        repair_ocr=False,
-    )
-    return final_text, f"nepali_pivot:{_combine_model_names(first_model, second_model)}"
+    pieces, full_context = _pivot_pieces(text_input, repair_ocr)
+    legs = [(("", MODEL), ("", MODEL))] * len(pieces)
+    jobs = _plan_jobs(pieces)
+
+    def pivot_job(job: list[int]) -> list[tuple[tuple[str, str], tuple[str, str]]]:
+        first = _translate_segments(
+            [pieces[idx] for idx in job],
+            source_display,
+            PIVOT_LANGUAGE,
+            repair_ocr=repair_ocr,
+            full_context=full_context,
+        )
+        second = _translate_segments(
+            [text for text, _ in first],
+            PIVOT_LANGUAGE,
+            target_display,
+            repair_ocr=False,
+        )
+        return list(zip(first, second))
+
+    if len(jobs) == 1:
+        translated = [pivot_job(jobs[0])]
+    else:
+        translated = get_pool(LLM_IO_POOL).map(pivot_job, jobs)
+    for job, job_legs in zip(jobs, translated):
+        for idx, leg in zip(job, job_legs):
+            legs[idx] = leg
+    return _finish_pivot(legs, start_time)
 
 
-def _translate_direct(
+async def _translate_via_nepali_async(
     text_input: str | list[str],
     source_lang: str,
     target_lang: str,
     repair_ocr: bool,
 ) -> tuple[str | list[str], str]:
+    """Async variant of `_translate_via_nepali`; jobs run via asyncio.gather."""
+    start_time = time.time()
     source_display = _display_lang(source_lang)
     target_display = _display_lang(target_lang)
+    print(
+        f"Using Nepali pivot translation: {source_display} -> "
+        f"{PIVOT_LANGUAGE} -> {target_display}"
+    )
 
-    if isinstance(text_input, list):
-        # Already split by pages, run page-parallel
-        return translate_parallel_chunks(
-            text_input,
+    pieces, full_context = _pivot_pieces(text_input, repair_ocr)
+    legs = [(("", MODEL), ("", MODEL))] * len(pieces)
+    jobs = _plan_jobs(pieces)
+
+    async def pivot_job(job: list[int]) -> list[tuple[tuple[str, str], tuple[str, str]]]:
+        first = await _translate_segments_async(
+            [pieces[idx] for idx in job],
             source_display,
-            target_display,
-            return_list=False,
+            PIVOT_LANGUAGE,
             repair_ocr=repair_ocr,
+            full_context=full_context,
+        )
+        second = await _translate_segments_async(
+            [text for text, _ in first],
+            PIVOT_LANGUAGE,
+            target_display,
+            repair_ocr=False,
         )
+        return list(zip(first, second))
+
+    translated = await asyncio.gather(*(pivot_job(job) for job in jobs))
+    for job, job_legs in zip(jobs, translated):
+        for idx, leg in zip(job, job_legs):
+            legs[idx] = leg
+    return _finish_pivot(legs, start_time)
+
+
+def _plan_direct_translation(
+    text_input: str | list[str],
+    repair_ocr: bool,
+) -> tuple[list[str] | None, str | None]:
+    """
+    Decide how to split a direct translation.
+
+    Returns (chunks, full_context) for page-/chunk-parallel translation, or
+    (None, None) when the text should go to the model as one request.
+    """
+    if isinstance(text_input, list):
+        # Already split by pages, run page-parallel
+        return text_input, None
 
     # For a single page/string, check if it's long enough to benefit from chunking.
     # Pasted text is often one large block, unlike OCR uploads which arrive as a
@@ -209,16 +359,30 @@ def _translate_direct(
             "Translation chunking: "
             f"single text with {word_count} words split into {len(chunks)} chunks"
         )
+        full_context = _build_compact_context(text_input, chunks) if repair_ocr else None
+        return chunks, full_context
+
+    return None, None
+
+
+def _translate_direct(
+    text_input: str | list[str],
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool,
+) -> tuple[str | list[str], str]:
+    source_display = _display_lang(source_lang)
+    target_display = _display_lang(target_lang)
+
+    chunks, full_context = _plan_direct_translation(text_input, repair_ocr)
+    if chunks is not None:
         return translate_parallel_chunks(
             chunks,
             source_display,
             target_display,
+            return_list=False,
             repair_ocr=repair_ocr,
-            full_context=(
-                _build_compact_context(text_input, chunks)
-                if repair_ocr
-                else None
-            ),
+            full_context=full_context,
         )
 
     return _call_llm(
@@ -229,6 +393,34 @@ def _translate_direct(
     )
 
 
+async def _translate_direct_async(
+    text_input: str | list[str],
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool,
+) -> tuple[str | list[str], str]:
+    source_display = _display_lang(source_lang)
+    target_display = _display_lang(target_lang)
+
+    chunks, full_context = _plan_direct_translation(text_input, repair_ocr)
+    if chunks is not None:
+        return await translate_parallel_chunks_async(
+            chunks,
+            source_display,
+            target_display,
+            return_list=False,
+            repair_ocr=repair_ocr,
+            full_context=full_context,
+        )
+
+    return await _call_llm_async(
+        text_input,
+        source_display,
+        target_display,
+        repair_ocr=repair_ocr,
+    )
+
+
 def translate_text(
     text_input: str | list[str],
     source_lang: str = "Tamang/Newari",
@@ -256,6 +448,34 @@ def translate_text(
     )
 
 
+async def translate_text_async(
+    text_input: str | list[str],
+    source_lang: str = "Tamang/Newari",
+    target_lang: str = "Nepali",
+    repair_ocr: bool = False,
+) -> tuple[str | list[str], str]:
+    """
+    Async variant of `translate_text` for `async def` endpoints.
+
+    Uses the Gemini async client, so waiting on the model does not hold a
+    thread or block the event loop; concurrent chunks run via asyncio.gather.
+    """
+    if _should_translate_via_nepali(source_lang, target_lang):
+        return await _translate_via_nepali_async(
+            text_input,
+            source_lang,
+            target_lang,
+            repair_ocr=repair_ocr,
+        )
+
+    return await _translate_direct_async(
+        text_input,
+        source_lang,
+        target_lang,
+        repair_ocr=repair_ocr,
+    )
+
+
 def _split_into_chunks(text: str, target_word_count: int = 220) -> list[str]:
     """Split text into bounded chunks even when pasted as one large block."""
     units = _split_text_units(text)
@@ -329,26 +549,13 @@ def _build_compact_context(text: str, chunks: list[str], max_chars: int = 1800)
     return f"{cleaned[:half]} ... {cleaned[-half:]}"
 
 
-def _call_llm(
-    text: str,
+def _build_system_prompt(
     source_lang: str,
     target_lang: str,
     repair_ocr: bool = False,
     full_context: str | None = None,
-) -> tuple[str, str]:
-    """Helper for a single LLM call with context-awareness for chunked processing."""
-    if not text.strip():
-        return "", MODEL
-
-    request_started = time.time()
-    input_words = len(text.split())
-    context_chars = len(full_context or "")
-    print(
-        "LLM request start: "
-        f"source={source_lang}, target={target_lang}, "
-        f"chars={len(text)}, words={input_words}, context_chars={context_chars}"
-    )
-
+) -> str:
+    """System prompt for one translation request."""
     target_guard = _target_language_guard(target_lang)
 
     if not repair_ocr:
@@ -429,182 +636,1202 @@ Output Requirements:
 - NO preamble, NO explanations, NO labels like "Translated Text:".
 - If content is absolutely illegible, keep the best guess or use [...].
 """
+    return system_prompt.strip()
 
-    messages = [
-        {"role": "system", "content": system_prompt.strip()},
-        {"role": "user", "content": f"SNIPPET TO TRANSLATE:\n{text}"}
-    ]
 
-    if not gemini_client:
-        print("LLM Error: Google GenAI Client is not initialized (missing or invalid API key)")
-        return text, MODEL
+def _normalize_segment(text: str) -> str:
+    """Canonical form of a segment for cache keys (NFC, collapsed spacing)."""
+    text = unicodedata.normalize("NFC", text)
+    lines = (" ".join(line.split()) for line in text.strip().splitlines())
+    return "\n".join(lines)
 
-    def generate_with_model(model_name: str) -> tuple[str, str]:
-        model_started = time.time()
-        if model_name.startswith("gemini-2.5"):
-            thinking_config = types.ThinkingConfig(thinking_budget=0)
-        else:
-            thinking_config = types.ThinkingConfig(
-                thinking_level=types.ThinkingLevel.MINIMAL
-            )
 
-        http_options = None
-        max_output_tokens = None
-        if not repair_ocr:
-            # Direct text is latency-critical: avoid hidden SDK retries.
-            # Gemini requires manually configured deadlines to be >= 10s.
-            http_options = types.HttpOptions(
-                timeout=DIRECT_TEXT_REQUEST_TIMEOUT_MS,
-                retry_options=types.HttpRetryOptions(attempts=1),
-            )
-            max_output_tokens = min(
-                4096,
-                max(512, input_words * 12),
-            )
+def _prompt_template(repair_ocr: bool, full_context: str | None) -> str:
+    """Which `_build_system_prompt` template a request uses."""
+    if not repair_ocr:
+        return "translate"
+    return "repair_snippet" if full_context else "repair"
 
-        response = gemini_client.models.generate_content(
-            model=model_name,
-            contents=f"SNIPPET TO TRANSLATE:\n{text}",
-            config=types.GenerateContentConfig(
-                system_instruction=system_prompt.strip(),
-                temperature=0.0,
-                thinking_config=thinking_config,
-                max_output_tokens=max_output_tokens,
-                http_options=http_options,
-            )
+
+def _translation_cache_key(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool,
+    full_context: str | None,
+) -> str:
+    # The document context of a chunked repair only guides OCR fixes inside
+    # the snippet, so it selects the template but is not part of the key.
+    return make_cache_key(
+        _normalize_segment(text),
+        _canonical_lang_key(source_lang),
+        _canonical_lang_key(target_lang),
+        _prompt_template(repair_ocr, full_context),
+        TRANSLATION_PROMPT_VERSION,
+    )
+
+
+def _cached_translation(cache_key: str) -> tuple[str, str] | None:
+    if translation_cache is None:
+        return None
+    cached = translation_cache.get(cache_key)
+    if cached is None:
+        return None
+    return cached["text"], cached["model"]
+
+
+@dataclass
+class _LLMRequest:
+    """A translation request after cache and translation-memory lookups."""
+    text: str
+    system_prompt: str
+    repair_ocr: bool
+    cache_key: str
+    source_key: str
+    target_key: str
+    ready: tuple[str, str] | None = None
+
+
+def _prepare_llm_request(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool,
+    full_context: str | None,
+) -> _LLMRequest:
+    """Resolve a segment from the cache or translation memory, or build its prompt."""
+    system_prompt = _build_system_prompt(source_lang, target_lang, repair_ocr, full_context)
+    cache_key = _translation_cache_key(text, source_lang, target_lang, repair_ocr, full_context)
+    source_key = _canonical_lang_key(source_lang)
+    target_key = _canonical_lang_key(target_lang)
+    request = _LLMRequest(text, system_prompt, repair_ocr, cache_key, source_key, target_key)
+
+    cached = _cached_translation(cache_key)
+    if cached is not None:
+        print(
+            "Translation cache hit: "
+            f"source={source_lang}, target={target_lang}, chars={len(text)}"
         )
-        text_result = response.text
-        if not text_result:
-            raise ValueError("Empty response text (possible safety block)")
-        model_duration = time.time() - model_started
-        total_duration = time.time() - request_started
+        request.ready = cached
+        return request
+
+    reused, references = _translation_memory_lookup(text, source_key, target_key)
+    if reused is not None:
         print(
-            "LLM request complete: "
-            f"model={model_name}, model_seconds={model_duration:.2f}, "
-            f"total_seconds={total_duration:.2f}, output_chars={len(text_result)}"
+            "Translation memory reuse: "
+            f"source={source_lang}, target={target_lang}, chars={len(text)}"
         )
-        return text_result.strip(), model_name
+        request.ready = (reused, TRANSLATION_MEMORY_MODEL)
+    elif references:
+        request.system_prompt = f"{system_prompt}\n\n{_translation_memory_prompt(references)}"
+    return request
 
-    if not repair_ocr:
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-
-        # Submit in the configured preference order, but return whichever model
-        # produces a valid full translation first. This avoids waiting behind a
-        # busy preferred model while another preferred fallback is healthy.
-        executor = ThreadPoolExecutor(max_workers=len(MODELS_TO_TRY))
-        futures = {
-            executor.submit(generate_with_model, model_name): model_name
-            for model_name in MODELS_TO_TRY
-        }
-        last_error = None
-        try:
-            for future in as_completed(futures):
-                model_name = futures[future]
-                try:
-                    result = future.result()
-                    for pending in futures:
-                        if pending is not future:
-                            pending.cancel()
-                    executor.shutdown(wait=False, cancel_futures=True)
-                    return result
-                except Exception as e:
-                    last_error = e
-                    print(
-                        f"LLM Error with {model_name}: {e}. "
-                        "Waiting for another model..."
-                    )
-        finally:
-            executor.shutdown(wait=False, cancel_futures=True)
 
-        print(f"All Gemini models failed. Last error: {last_error}")
-        return text, MODEL
+def _finish_llm_request(
+    request: _LLMRequest,
+    result: tuple[str, str] | None,
+) -> tuple[str, str]:
+    if result is None:
+        # Failures fall back to the source text and are never cached.
+        return request.text, MODEL
+    if translation_cache is not None:
+        translation_cache.set(request.cache_key, {"text": result[0], "model": result[1]})
+    _remember_translation(request.text, result[0], request.source_key, request.target_key)
+    return result
 
-    last_error = None
-    for model_name in MODELS_TO_TRY:
-        try:
-            return generate_with_model(model_name)
-        except Exception as e:
-            last_error = e
-            print(
-                f"LLM Error with {model_name}: {e}. Trying next model..."
-            )
 
-    print(f"All Gemini models failed. Last error: {last_error}")
-    return text, MODEL
+async def _prepare_llm_request_async(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool,
+    full_context: str | None,
+) -> _LLMRequest:
+    """`_prepare_llm_request` off the event loop (disk cache and SQLite reads)."""
+    return await run_blocking(
+        IO_RESOURCE, _prepare_llm_request, text, source_lang, target_lang, repair_ocr, full_context
+    )
 
 
-def translate_parallel_chunks(
-    chunks: list[str],
+async def _finish_llm_request_async(
+    request: _LLMRequest,
+    result: tuple[str, str] | None,
+) -> tuple[str, str]:
+    """`_finish_llm_request` off the event loop (disk cache and SQLite writes)."""
+    if result is None:
+        return _finish_llm_request(request, result)
+    return await run_blocking(IO_RESOURCE, _finish_llm_request, request, result)
+
+
+def _call_llm(
+    text: str,
     source_lang: str,
     target_lang: str,
-    return_list: bool = False,
     repair_ocr: bool = False,
     full_context: str | None = None,
-) -> tuple[str | list[str], str]:
-    """Translates multiple chunks/pages in parallel to hit the < 5s target."""
-    from concurrent.futures import ThreadPoolExecutor
+) -> tuple[str, str]:
+    """Helper for a single LLM call with context-awareness for chunked processing."""
+    if not text.strip():
+        return "", MODEL
 
-    # Higher thread count for small chunks since I/O bound
-    max_workers = min(len(chunks), 8)
-    start_time = time.time()
-    
-    def translate_single(chunk):
-        return _call_llm(
-            chunk,
-            source_lang,
-            target_lang,
-            repair_ocr=repair_ocr,
-            full_context=full_context,
+    request = _prepare_llm_request(text, source_lang, target_lang, repair_ocr, full_context)
+    if request.ready is not None:
+        return request.ready
+    result = _generate_translation(text, request.system_prompt, repair_ocr)
+    return _finish_llm_request(request, result)
+
+
+async def _call_llm_async(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool = False,
+    full_context: str | None = None,
+) -> tuple[str, str]:
+    """Async variant of `_call_llm` on the Gemini async client."""
+    if not text.strip():
+        return "", MODEL
+
+    request = await _prepare_llm_request_async(text, source_lang, target_lang, repair_ocr, full_context)
+    if request.ready is not None:
+        return request.ready
+    if TRANSLATION_COALESCING_ENABLED and (
+        _estimate_tokens(text) <= TRANSLATION_BATCH_SEGMENT_MAX_TOKENS
+    ):
+        result = await translation_coalescer.submit(
+            (source_lang, target_lang, repair_ocr, full_context),
+            request,
+            weight=_estimate_tokens(text),
         )
+    else:
+        result = await _generate_translation_async(text, request.system_prompt, repair_ocr)
+    return await _finish_llm_request_async(request, result)
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        results = list(executor.map(translate_single, chunks))
 
-    translated_texts = [res[0] for res in results]
-    model_used = _combine_model_names(*(res[1] for res in results))
-    
-    if return_list:
-        return translated_texts, model_used
-        
-    combined_text = "\n\n".join(translated_texts)
-    print(
-        "Parallel translation complete: "
-        f"{len(chunks)} chunks, {max_workers} workers, {time.time() - start_time:.2f}s"
-    )
-    return combined_text, model_used
+def _unit_separator(text: str) -> str:
+    """Separator that rejoins `_split_text_units(text)` in the same layout."""
+    if len([part for part in re.split(r"\n\s*\n", text) if part.strip()]) > 1:
+        return "\n\n"
+    if len([line for line in text.splitlines() if line.strip()]) > 1:
+        return "\n"
+    return " "
 
 
-def detect_language(text: str) -> dict:
-    """
-    Detects the language of a given text snippet using LLM.
+def _translation_memory_lookup(
+    text: str,
+    source_key: str,
+    target_key: str,
+) -> tuple[str | None, list[TMMatch]]:
     """
-    # Truncate to first 500 characters for efficiency to save tokens
-    snippet = text[:500].strip()
-    if not snippet:
-        return {"language": "Unknown", "code": "unknown", "confidence": 0.0}
+    Look up each text unit in the translation memory.
 
-    system_prompt = """
-You are a highly capable AI language identification expert. Your task is to accurately detect the language of the provided text.
-You can detect any global language (e.g., English, Spanish, Chinese, French, Hindi, etc.).
-Crucially, you have specialized expertise in distinguishing Himalayan languages. If the text is in Devanagari script, pay extremely close attention to the nuances to accurately distinguish whether it is Tamang, Newari, or Nepali.
+    Returns the reassembled stored translation when every unit can be reused
+    directly, otherwise the best matches to show the model as references.
+    """
+    memory = get_translation_memory()
+    if memory is None:
+        return None, []
 
-Rules:
-1. Output ONLY a valid JSON object in this format: {"language": "Language Name", "code": "lang_code", "confidence": 0.95}
-2. Language codes for global languages: Use standard 3-letter ISO codes (e.g., 'eng' for English, 'spa' for Spanish, 'zho' for Chinese).
-3. Language codes for Himalayan languages: strictly use 'tam' for Tamang, 'new' for Newari, and 'nep' for Nepali.
-4. If the language is completely unrecognizable, use code 'ot' and Language Name 'Other'.
-5. Use a confidence score between 0.0 and 1.0.
-6. Output ONLY the JSON. No preamble, no markdown blocks, no talk.
-"""
+    units = _split_text_units(text)
+    matches = [memory.lookup(unit, source_key, target_key) for unit in units]
+    if matches and all(match is not None and match.reusable for match in matches):
+        return _unit_separator(text).join(match.target_text for match in matches), []
+
+    references = {}
+    for match in matches:
+        if match is not None and match.source_text not in references:
+            references[match.source_text] = match
+    ranked = sorted(references.values(), key=lambda match: -match.similarity)
+    return None, ranked[:TRANSLATION_MEMORY_MAX_REFERENCES]
+
+
+def _translation_memory_prompt(references: list[TMMatch]) -> str:
+    examples = "\n\n".join(
+        f"SOURCE:\n{match.source_text}\nTRANSLATION:\n{match.target_text}"
+        for match in references
+    )
+    return f"""
+TRANSLATION MEMORY:
+Previously translated segments similar to this snippet are listed below. Reuse their terminology and phrasing where the snippet says the same thing. They are references only: names, dates, numbers and wording may differ, so always translate what the snippet actually says.
 
-    messages = [
-        {"role": "system", "content": system_prompt.strip()},
-        {"role": "user", "content": snippet}
-    ]
+-- TRANSLATION MEMORY --
+{examples}
+-- END TRANSLATION MEMORY --
+""".strip()
 
-    if not gemini_client:
-        print("Language detection failed: Google GenAI Client is not initialized (missing or invalid API key)")
-        return {"language": "Detection Error", "code": "error", "confidence": 0.0}
+
+def _remember_translation(
+    source_text: str,
+    translated_text: str,
+    source_key: str,
+    target_key: str,
+) -> None:
+    """Store aligned unit pairs of a successful translation in the memory."""
+    memory = get_translation_memory()
+    if memory is None:
+        return
+    source_units = _split_text_units(source_text)
+    target_units = _split_text_units(translated_text)
+    if len(source_units) != len(target_units):
+        # Units are only stored when they align one-to-one.
+        if len(source_units) != 1:
+            return
+        target_units = [translated_text]
+    for source_unit, target_unit in zip(source_units, target_units):
+        memory.add(source_unit, target_unit, source_key, target_key)
+
+
+def _generation_config(
+    model_name: str,
+    system_prompt: str,
+    input_words: int,
+    repair_ocr: bool,
+) -> types.GenerateContentConfig:
+    if model_name.startswith("gemini-2.5"):
+        thinking_config = types.ThinkingConfig(thinking_budget=0)
+    else:
+        thinking_config = types.ThinkingConfig(
+            thinking_level=types.ThinkingLevel.MINIMAL
+        )
+
+    max_output_tokens = None
+    if repair_ocr:
+        # Failover to the next model (and the circuit breaker) replaces SDK
+        # retries, so the timeout bounds each attempt.
+        http_options = types.HttpOptions(
+            timeout=REPAIR_OCR_REQUEST_TIMEOUT_MS,
+            retry_options=types.HttpRetryOptions(attempts=1),
+        )
+    else:
+        # Direct text is latency-critical: avoid hidden SDK retries.
+        # Gemini requires manually configured deadlines to be >= 10s.
+        http_options = types.HttpOptions(
+            timeout=DIRECT_TEXT_REQUEST_TIMEOUT_MS,
+            retry_options=types.HttpRetryOptions(attempts=1),
+        )
+        max_output_tokens = min(
+            4096,
+            max(512, input_words * 12),
+        )
+
+    return types.GenerateContentConfig(
+        system_instruction=system_prompt.strip(),
+        temperature=0.0,
+        thinking_config=thinking_config,
+        max_output_tokens=max_output_tokens,
+        http_options=http_options,
+    )
+
+
+def _log_request_start(text: str, system_prompt: str) -> None:
+    print(
+        "LLM request start: "
+        f"chars={len(text)}, words={len(text.split())}, prompt_chars={len(system_prompt)}"
+    )
+
+
+def _checked_response_text(
+    response,
+    model_name: str,
+    model_started: float,
+    request_started: float,
+) -> tuple[str, str]:
+    text_result = response.text
+    if not text_result:
+        raise ValueError("Empty response text (possible safety block)")
+    model_duration = time.time() - model_started
+    total_duration = time.time() - request_started
+    print(
+        "LLM request complete: "
+        f"model={model_name}, model_seconds={model_duration:.2f}, "
+        f"total_seconds={total_duration:.2f}, output_chars={len(text_result)}"
+    )
+    return text_result.strip(), model_name
+
+
+def _log_dispatch(dispatch) -> None:
+    print(
+        "LLM dispatch complete: "
+        f"winner={dispatch.model}, hedges={dispatch.hedges}, "
+        f"attempts={dispatch.attempts}, seconds={dispatch.seconds:.2f}"
+    )
+
+
+def _run_with_models(
+    generate_with_model,
+    repair_ocr: bool,
+    batch: bool = False,
+) -> tuple[str, str] | None:
+    """Try models for one request (*batch*: several segments); None if every model failed."""
+    if not repair_ocr:
+        # Preferred model first; a backup model is launched only when the
+        # first runs past its p90 latency or fails, and the first valid
+        # translation wins.
+        try:
+            dispatch = translation_dispatcher.dispatch(generate_with_model, batch=batch)
+        except DispatchError as e:
+            print(f"All Gemini models failed. Last error: {e.last_error}")
+            return None
+        _log_dispatch(dispatch)
+        return dispatch.value
+
+    last_error = None
+    for model_name in MODELS_TO_TRY:
+        if not model_health.acquire(model_name):
+            print(f"LLM skipping {model_name}: circuit breaker open")
+            continue
+        try:
+            result = generate_with_model(model_name)
+        except Exception as e:
+            model_health.record_failure(model_name, e)
+            last_error = e
+            print(
+                f"LLM Error with {model_name}: {e}. Trying next model..."
+            )
+            continue
+        model_health.record_success(model_name)
+        return result
+
+    print(f"All Gemini models failed. Last error: {last_error}")
+    return None
+
+
+async def _run_with_models_async(
+    generate_with_model,
+    repair_ocr: bool,
+    batch: bool = False,
+) -> tuple[str, str] | None:
+    """Async variant of `_run_with_models`; losing hedged requests are cancelled."""
+    if not repair_ocr:
+        try:
+            dispatch = await translation_dispatcher.dispatch_async(generate_with_model, batch=batch)
+        except DispatchError as e:
+            print(f"All Gemini models failed. Last error: {e.last_error}")
+            return None
+        _log_dispatch(dispatch)
+        return dispatch.value
+
+    last_error = None
+    for model_name in MODELS_TO_TRY:
+        if not model_health.acquire(model_name):
+            print(f"LLM skipping {model_name}: circuit breaker open")
+            continue
+        try:
+            result = await generate_with_model(model_name)
+        except asyncio.CancelledError:
+            model_health.release(model_name)
+            raise
+        except Exception as e:
+            model_health.record_failure(model_name, e)
+            last_error = e
+            print(
+                f"LLM Error with {model_name}: {e}. Trying next model..."
+            )
+            continue
+        model_health.record_success(model_name)
+        return result
+
+    print(f"All Gemini models failed. Last error: {last_error}")
+    return None
+
+
+def _generate_translation(
+    text: str,
+    system_prompt: str,
+    repair_ocr: bool = False,
+) -> tuple[str, str] | None:
+    """Run the Gemini model fan-out for one segment; None if every model failed."""
+    request_started = time.time()
+    input_words = len(text.split())
+    _log_request_start(text, system_prompt)
+
+    if not gemini_client:
+        print("LLM Error: Google GenAI Client is not initialized (missing or invalid API key)")
+        return None
+
+    def generate_with_model(model_name: str) -> tuple[str, str]:
+        model_started = time.time()
+        response = gemini_client.models.generate_content(
+            model=model_name,
+            contents=f"SNIPPET TO TRANSLATE:\n{text}",
+            config=_generation_config(model_name, system_prompt, input_words, repair_ocr),
+        )
+        return _checked_response_text(response, model_name, model_started, request_started)
+
+    return _run_with_models(generate_with_model, repair_ocr)
+
+
+async def _generate_translation_async(
+    text: str,
+    system_prompt: str,
+    repair_ocr: bool = False,
+) -> tuple[str, str] | None:
+    """Async variant of `_generate_translation` on `gemini_client.aio`."""
+    request_started = time.time()
+    input_words = len(text.split())
+    _log_request_start(text, system_prompt)
+
+    if not gemini_client:
+        print("LLM Error: Google GenAI Client is not initialized (missing or invalid API key)")
+        return None
+
+    async def generate_with_model(model_name: str) -> tuple[str, str]:
+        model_started = time.time()
+        response = await gemini_client.aio.models.generate_content(
+            model=model_name,
+            contents=f"SNIPPET TO TRANSLATE:\n{text}",
+            config=_generation_config(model_name, system_prompt, input_words, repair_ocr),
+        )
+        return _checked_response_text(response, model_name, model_started, request_started)
+
+    return await _run_with_models_async(generate_with_model, repair_ocr)
+
+
+# ==========================================
+# Batched multi-segment translation
+# ==========================================
+
+def _estimate_tokens(text: str) -> int:
+    """Rough input token estimate; Devanagari tokenizes at ~3 chars per token."""
+    return len(text) // 3 + 1
+
+
+def _plan_batches(chunks: list[str], misses: list[int]) -> tuple[list[list[int]], list[int]]:
+    """
+    Pack short uncached segments into batches under the token budget.
+
+    Returns (batches, singles): batches of chunk indices (two or more each)
+    and the indices that are translated one request at a time.
+    """
+    if not TRANSLATION_BATCHING_ENABLED:
+        return [], misses
+
+    batches: list[list[int]] = []
+    singles: list[int] = []
+    current: list[int] = []
+    current_tokens = 0
+    for idx in misses:
+        tokens = _estimate_tokens(chunks[idx])
+        if tokens > TRANSLATION_BATCH_SEGMENT_MAX_TOKENS:
+            singles.append(idx)
+            continue
+        if current and (
+            current_tokens + tokens > TRANSLATION_BATCH_MAX_TOKENS
+            or len(current) >= TRANSLATION_BATCH_MAX_SEGMENTS
+        ):
+            batches.append(current)
+            current, current_tokens = [], 0
+        current.append(idx)
+        current_tokens += tokens
+    if current:
+        batches.append(current)
+
+    # A batch of one is just a single request with a JSON wrapper.
+    singles.extend(batch[0] for batch in batches if len(batch) == 1)
+    return [batch for batch in batches if len(batch) > 1], sorted(singles)
+
+
+def _batch_system_prompt(system_prompt: str) -> str:
+    return f"""{system_prompt.strip()}
+
+BATCH MODE:
+- The input is a JSON array of segments, each {{"id": <int>, "text": <string>}}.
+- Translate every segment independently, following all rules above.
+- Return ONLY a JSON array with exactly one {{"id": <int>, "translation": <string>}} per input segment, in the same order and with the same ids.
+- Never merge, split, skip, or reorder segments.
+"""
+
+
+def _batch_contents(segments: list[str]) -> str:
+    payload = [{"id": idx, "text": segment} for idx, segment in enumerate(segments)]
+    return f"SEGMENTS TO TRANSLATE (JSON):\n{json.dumps(payload, ensure_ascii=False)}"
+
+
+def _batch_generation_config(
+    model_name: str,
+    system_prompt: str,
+    segments: list[str],
+    repair_ocr: bool,
+) -> types.GenerateContentConfig:
+    input_words = sum(len(segment.split()) for segment in segments)
+    config = _generation_config(model_name, system_prompt, input_words, repair_ocr)
+    return config.model_copy(update={
+        "response_mime_type": "application/json",
+        "response_schema": list[BatchTranslationItem],
+        # Room for the JSON envelope around every segment.
+        "max_output_tokens": min(8192, max(1024, input_words * 12 + len(segments) * 24)),
+    })
+
+
+def _parse_batch_translations(raw_text: str, count: int) -> list[str | None] | None:
+    """
+    Validate a batch response against the segments that were sent.
+
+    Returns one translation per segment (None where a segment is missing or
+    empty), or None when the response is unusable as a whole: not a JSON
+    array, unknown or duplicate ids, or ids out of order.
+    """
+    try:
+        items = json.loads(raw_text)
+    except ValueError:
+        return None
+    if not isinstance(items, list):
+        return None
+
+    translations: list[str | None] = [None] * count
+    last_id = -1
+    for item in items:
+        if not isinstance(item, dict):
+            return None
+        segment_id = item.get("id")
+        if not isinstance(segment_id, int) or not last_id < segment_id < count:
+            return None
+        last_id = segment_id
+        translation = item.get("translation")
+        if isinstance(translation, str) and translation.strip():
+            translations[segment_id] = translation.strip()
+    if len(items) != count:
+        print(f"Batch translation count mismatch: sent {count}, received {len(items)}")
+    return translations
+
+
+def _generate_batch_translation(
+    segments: list[str],
+    system_prompt: str,
+    repair_ocr: bool,
+) -> tuple[list[str | None] | None, str] | None:
+    """
+    One Gemini request for several segments.
+
+    Returns (translations, model) where translations is None if the response
+    failed validation, or None if every model failed outright.
+    """
+    request_started = time.time()
+    batch_prompt = _batch_system_prompt(system_prompt)
+    contents = _batch_contents(segments)
+    _log_request_start(contents, batch_prompt)
+
+    if not gemini_client:
+        print("LLM Error: Google GenAI Client is not initialized (missing or invalid API key)")
+        return None
+
+    def generate_with_model(model_name: str) -> tuple[str, str]:
+        model_started = time.time()
+        response = gemini_client.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=_batch_generation_config(model_name, batch_prompt, segments, repair_ocr),
+        )
+        return _checked_response_text(response, model_name, model_started, request_started)
+
+    result = _run_with_models(generate_with_model, repair_ocr, batch=True)
+    if result is None:
+        return None
+    return _parse_batch_translations(result[0], len(segments)), result[1]
+
+
+async def _generate_batch_translation_async(
+    segments: list[str],
+    system_prompt: str,
+    repair_ocr: bool,
+) -> tuple[list[str | None] | None, str] | None:
+    """Async variant of `_generate_batch_translation`."""
+    request_started = time.time()
+    batch_prompt = _batch_system_prompt(system_prompt)
+    contents = _batch_contents(segments)
+    _log_request_start(contents, batch_prompt)
+
+    if not gemini_client:
+        print("LLM Error: Google GenAI Client is not initialized (missing or invalid API key)")
+        return None
+
+    async def generate_with_model(model_name: str) -> tuple[str, str]:
+        model_started = time.time()
+        response = await gemini_client.aio.models.generate_content(
+            model=model_name,
+            contents=contents,
+            config=_batch_generation_config(model_name, batch_prompt, segments, repair_ocr),
+        )
+        return _checked_response_text(response, model_name, model_started, request_started)
+
+    result = await _run_with_models_async(generate_with_model, repair_ocr, batch=True)
+    if result is None:
+        return None
+    return _parse_batch_translations(result[0], len(segments)), result[1]
+
+
+async def _coalesced_generate(
+    key: tuple[str, str, bool, str | None],
+    requests: list[_LLMRequest],
+) -> list[tuple[str, str] | None]:
+    """Batch function for `translation_coalescer`: one result per request."""
+    source_lang, target_lang, repair_ocr, full_context = key
+    if len(requests) == 1:
+        # Nobody else arrived in time; keep the request's own prompt,
+        # including any translation-memory references.
+        request = requests[0]
+        return [await _generate_translation_async(request.text, request.system_prompt, repair_ocr)]
+
+    print(f"Translation coalescing: {len(requests)} concurrent requests in one batch")
+    system_prompt = _build_system_prompt(source_lang, target_lang, repair_ocr, full_context)
+    outcome = await _generate_batch_translation_async(
+        [request.text for request in requests], system_prompt, repair_ocr
+    )
+    if outcome is None:
+        return [None] * len(requests)
+    translations, model_name = outcome
+    if translations is None:
+        translations = [None] * len(requests)
+
+    results = [
+        (translation, model_name) if translation is not None else None
+        for translation in translations
+    ]
+    # Requests the batch did not deliver are retried one by one, concurrently.
+    retry = [idx for idx, result in enumerate(results) if result is None]
+    if retry:
+        retried = await asyncio.gather(*(
+            _generate_translation_async(
+                requests[idx].text, requests[idx].system_prompt, repair_ocr
+            )
+            for idx in retry
+        ))
+        for idx, result in zip(retry, retried):
+            results[idx] = result
+    return results
+
+
+translation_coalescer = RequestCoalescer(
+    _coalesced_generate,
+    max_wait=TRANSLATION_COALESCE_MAX_WAIT_MS / 1000.0,
+    max_items=TRANSLATION_BATCH_MAX_SEGMENTS,
+    max_weight=TRANSLATION_BATCH_MAX_TOKENS,
+    name="translation coalescer",
+)
+
+
+def _settle_batch(
+    requests: list[_LLMRequest],
+    pending: list[int],
+    outcome: tuple[list[str | None] | None, str] | None,
+    results: list[tuple[str, str] | None],
+) -> list[int]:
+    """
+    Record the segments a batch translated; return the ones to re-split.
+
+    If every model failed outright, the remaining segments fall back to
+    their source text like `_call_llm` does, rather than being retried.
+    """
+    if outcome is None:
+        for idx in pending:
+            results[idx] = _finish_llm_request(requests[idx], None)
+        return []
+    translations, model_name = outcome
+    if translations is None:
+        print(f"Batch translation rejected: {len(pending)} segments will be re-split")
+        return pending
+    failed = []
+    for idx, translation in zip(pending, translations):
+        if translation is None:
+            failed.append(idx)
+        else:
+            results[idx] = _finish_llm_request(requests[idx], (translation, model_name))
+    if failed:
+        print(f"Batch translation: re-splitting {len(failed)} of {len(pending)} segments")
+    return failed
+
+
+def _translate_batch(
+    segments: list[str],
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool = False,
+    full_context: str | None = None,
+) -> list[tuple[str, str]]:
+    """
+    Translate several short segments with one JSON request.
+
+    Segments that come back missing, empty or out of order are re-split in
+    halves and retried; a segment that fails on its own goes through the
+    regular single-segment path.
+    """
+    if len(segments) == 1:
+        return [_call_llm(segments[0], source_lang, target_lang, repair_ocr, full_context)]
+
+    requests = [
+        _prepare_llm_request(segment, source_lang, target_lang, repair_ocr, full_context)
+        for segment in segments
+    ]
+    results = [
+        request.ready if segment.strip() else ("", MODEL)
+        for segment, request in zip(segments, requests)
+    ]
+    pending = [idx for idx, result in enumerate(results) if result is None]
+    if pending:
+        # Translation-memory references are per segment; a batch uses the
+        # shared prompt only.
+        system_prompt = _build_system_prompt(source_lang, target_lang, repair_ocr, full_context)
+        outcome = _generate_batch_translation(
+            [segments[idx] for idx in pending], system_prompt, repair_ocr
+        )
+        failed = _settle_batch(requests, pending, outcome, results)
+        if failed:
+            middle = (len(failed) + 1) // 2
+            for half in (failed[:middle], failed[middle:]):
+                if not half:
+                    continue
+                retried = _translate_batch(
+                    [segments[idx] for idx in half],
+                    source_lang,
+                    target_lang,
+                    repair_ocr,
+                    full_context,
+                )
+                for idx, result in zip(half, retried):
+                    results[idx] = result
+    return results
+
+
+async def _translate_batch_async(
+    segments: list[str],
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool = False,
+    full_context: str | None = None,
+) -> list[tuple[str, str]]:
+    """Async variant of `_translate_batch`; re-split halves run concurrently."""
+    if len(segments) == 1:
+        return [await _call_llm_async(segments[0], source_lang, target_lang, repair_ocr, full_context)]
+
+    requests = await run_blocking(IO_RESOURCE, lambda: [
+        _prepare_llm_request(segment, source_lang, target_lang, repair_ocr, full_context)
+        for segment in segments
+    ])
+    results = [
+        request.ready if segment.strip() else ("", MODEL)
+        for segment, request in zip(segments, requests)
+    ]
+    pending = [idx for idx, result in enumerate(results) if result is None]
+    if pending:
+        system_prompt = _build_system_prompt(source_lang, target_lang, repair_ocr, full_context)
+        outcome = await _generate_batch_translation_async(
+            [segments[idx] for idx in pending], system_prompt, repair_ocr
+        )
+        failed = await run_blocking(
+            IO_RESOURCE, _settle_batch, requests, pending, outcome, results
+        )
+        if failed:
+            middle = (len(failed) + 1) // 2
+            halves = [half for half in (failed[:middle], failed[middle:]) if half]
+            retried = await asyncio.gather(*(
+                _translate_batch_async(
+                    [segments[idx] for idx in half],
+                    source_lang,
+                    target_lang,
+                    repair_ocr,
+                    full_context,
+                )
+                for half in halves
+            ))
+            for half, half_results in zip(halves, retried):
+                for idx, result in zip(half, half_results):
+                    results[idx] = result
+    return results
+
+
+def _cached_chunk_results(
+    chunks: list[str],
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool,
+    full_context: str | None,
+) -> list[tuple[str, str] | None]:
+    """Per-chunk cached translations (None for misses); empty chunks resolve to ""."""
+    results: list[tuple[str, str] | None] = [None] * len(chunks)
+    for idx, chunk in enumerate(chunks):
+        if not chunk.strip():
+            results[idx] = ("", MODEL)
+            continue
+        cache_key = _translation_cache_key(
+            chunk, source_lang, target_lang, repair_ocr, full_context
+        )
+        results[idx] = _cached_translation(cache_key)
+    return results
+
+
+def _combine_chunk_results(
+    results: list[tuple[str, str]],
+    cached_count: int,
+    return_list: bool,
+    start_time: float,
+) -> tuple[str | list[str], str]:
+    translated_texts = [res[0] for res in results]
+    model_used = _combine_model_names(*(res[1] for res in results))
+
+    if return_list:
+        return translated_texts, model_used
+
+    combined_text = "\n\n".join(translated_texts)
+    print(
+        "Parallel translation complete: "
+        f"{len(results)} chunks ({cached_count} cached), "
+        f"{time.time() - start_time:.2f}s"
+    )
+    return combined_text, model_used
+
+
+def _plan_jobs(segments: list[str], indices: list[int] | None = None) -> list[list[int]]:
+    """Group segment indices into request jobs: singles, then JSON batches."""
+    if indices is None:
+        indices = [idx for idx, segment in enumerate(segments) if segment.strip()]
+    batches, singles = _plan_batches(segments, indices)
+    if batches:
+        print(
+            "Translation batching: "
+            f"{sum(len(batch) for batch in batches)} segments in {len(batches)} "
+            f"request(s), {len(singles)} single request(s)"
+        )
+    return [[idx] for idx in singles] + batches
+
+
+def _translate_segments(
+    segments: list[str],
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool = False,
+    full_context: str | None = None,
+) -> list[tuple[str, str]]:
+    """Translate one job: a single `_call_llm`, or one batch request."""
+    if len(segments) == 1:
+        return [_call_llm(
+            segments[0],
+            source_lang,
+            target_lang,
+            repair_ocr=repair_ocr,
+            full_context=full_context,
+        )]
+    return _translate_batch(
+        segments,
+        source_lang,
+        target_lang,
+        repair_ocr=repair_ocr,
+        full_context=full_context,
+    )
+
+
+async def _translate_segments_async(
+    segments: list[str],
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool = False,
+    full_context: str | None = None,
+) -> list[tuple[str, str]]:
+    if len(segments) == 1:
+        return [await _call_llm_async(
+            segments[0],
+            source_lang,
+            target_lang,
+            repair_ocr=repair_ocr,
+            full_context=full_context,
+        )]
+    return await _translate_batch_async(
+        segments,
+        source_lang,
+        target_lang,
+        repair_ocr=repair_ocr,
+        full_context=full_context,
+    )
+
+
+def translate_parallel_chunks(
+    chunks: list[str],
+    source_lang: str,
+    target_lang: str,
+    return_list: bool = False,
+    repair_ocr: bool = False,
+    full_context: str | None = None,
+) -> tuple[str | list[str], str]:
+    """Translates multiple chunks/pages in parallel to hit the < 5s target."""
+    start_time = time.time()
+
+    # Serve cached segments first; only the misses are sent to Gemini.
+    results = _cached_chunk_results(chunks, source_lang, target_lang, repair_ocr, full_context)
+    misses = [idx for idx, result in enumerate(results) if result is None]
+
+    # Short misses (table rows, list items) share JSON batch requests.
+    jobs = _plan_jobs(chunks, misses)
+
+    def translate_job(job: list[int]) -> list[tuple[str, str]]:
+        return _translate_segments(
+            [chunks[idx] for idx in job],
+            source_lang,
+            target_lang,
+            repair_ocr=repair_ocr,
+            full_context=full_context,
+        )
+
+    if jobs:
+        # Jobs run on the shared LLM I/O pool; their model calls go to the
+        # separate llm_dispatch pool, so the two never wait on each other.
+        translated = get_pool(LLM_IO_POOL).map(translate_job, jobs)
+        for job, job_results in zip(jobs, translated):
+            for idx, result in zip(job, job_results):
+                results[idx] = result
+
+    return _combine_chunk_results(results, len(chunks) - len(misses), return_list, start_time)
+
+
+async def translate_parallel_chunks_async(
+    chunks: list[str],
+    source_lang: str,
+    target_lang: str,
+    return_list: bool = False,
+    repair_ocr: bool = False,
+    full_context: str | None = None,
+) -> tuple[str | list[str], str]:
+    """Async variant of `translate_parallel_chunks`: cache misses run via asyncio.gather."""
+    start_time = time.time()
+
+    results = await run_blocking(
+        IO_RESOURCE, _cached_chunk_results, chunks, source_lang, target_lang, repair_ocr, full_context
+    )
+    misses = [idx for idx, result in enumerate(results) if result is None]
+
+    jobs = _plan_jobs(chunks, misses)
+
+    async def translate_job(job: list[int]) -> list[tuple[str, str]]:
+        return await _translate_segments_async(
+            [chunks[idx] for idx in job],
+            source_lang,
+            target_lang,
+            repair_ocr=repair_ocr,
+            full_context=full_context,
+        )
+
+    if jobs:
+        # If the caller is cancelled (e.g. the client went away), gather
+        # cancels the outstanding requests with it.
+        translated = await asyncio.gather(*(translate_job(job) for job in jobs))
+        for job, job_results in zip(jobs, translated):
+            for idx, result in zip(job, job_results):
+                results[idx] = result
+
+    return _combine_chunk_results(results, len(chunks) - len(misses), return_list, start_time)
+
+
+# ==========================================
+# Streaming translation
+# ==========================================
+
+async def _stream_translation_async(
+    text: str,
+    system_prompt: str,
+    repair_ocr: bool,
+    on_delta: Callable[[str], None],
+) -> tuple[str, str] | None:
+    """
+    Stream one segment from the preferred healthy model, calling *on_delta*
+    for every text fragment as it arrives.
+
+    There is no hedging once tokens are flowing; if the stream fails, the
+    segment is retried through the regular non-streaming path, whose result
+    supersedes any fragments already sent.
+    """
+    request_started = time.time()
+    input_words = len(text.split())
+    _log_request_start(text, system_prompt)
+
+    if not gemini_client:
+        print("LLM Error: Google GenAI Client is not initialized (missing or invalid API key)")
+        return None
+
+    model_name = next(
+        (model for model in translation_dispatcher.ranked_models() if model_health.acquire(model)),
+        None,
+    )
+    if model_name is None:
+        return await _generate_translation_async(text, system_prompt, repair_ocr)
+
+    parts = []
+    try:
+        stream = await gemini_client.aio.models.generate_content_stream(
+            model=model_name,
+            contents=f"SNIPPET TO TRANSLATE:\n{text}",
+            config=_generation_config(model_name, system_prompt, input_words, repair_ocr),
+        )
+        async for response in stream:
+            fragment = response.text
+            if fragment:
+                parts.append(fragment)
+                on_delta(fragment)
+        if not "".join(parts).strip():
+            raise ValueError("Empty response text (possible safety block)")
+    except asyncio.CancelledError:
+        model_health.release(model_name)
+        raise
+    except Exception as e:
+        model_health.record_failure(model_name, e)
+        print(f"LLM stream error with {model_name}: {e}. Falling back to non-streaming models...")
+        return await _generate_translation_async(text, system_prompt, repair_ocr)
+
+    model_health.record_success(model_name)
+    text_result = "".join(parts).strip()
+    print(
+        "LLM stream complete: "
+        f"model={model_name}, total_seconds={time.time() - request_started:.2f}, "
+        f"output_chars={len(text_result)}"
+    )
+    return text_result, model_name
+
+
+async def _call_llm_streaming(
+    text: str,
+    source_lang: str,
+    target_lang: str,
+    repair_ocr: bool,
+    full_context: str | None,
+    on_delta: Callable[[str], None],
+) -> tuple[str, str]:
+    """`_call_llm_async` with token streaming; cache and TM hits return at once."""
+    if not text.strip():
+        return "", MODEL
+
+    request = await _prepare_llm_request_async(text, source_lang, target_lang, repair_ocr, full_context)
+    if request.ready is not None:
+        return request.ready
+    result = await _stream_translation_async(text, request.system_prompt, repair_ocr, on_delta)
+    return await _finish_llm_request_async(request, result)
+
+
+async def translate_text_stream(
+    text_input: str | list[str],
+    source_lang: str = "Tamang/Newari",
+    target_lang: str = "Nepali",
+    repair_ocr: bool = False,
+) -> AsyncIterator[dict]:
+    """
+    Translate like `translate_text_async`, yielding events as chunks finish.
+
+    Events, in order of arrival:
+    - {"type": "start", "chunks": n}
+    - {"type": "delta", "index": 0, "text": fragment}  (first chunk only,
+      when token streaming is enabled and the chunk is not cached)
+    - {"type": "chunk", "index": i, "text": ..., "model": ..., "seconds": ...}
+      once per chunk, in completion order; its text is authoritative and
+      replaces any deltas received for that index
+    - {"type": "done", "model_used": ..., "timing": {...}}
+
+    Closing the generator (e.g. on client disconnect) cancels unfinished
+    chunks.
+    """
+    started = time.time()
+    via_nepali = _should_translate_via_nepali(source_lang, target_lang)
+    source_display = _display_lang(source_lang)
+    target_display = _display_lang(target_lang)
+
+    chunks, full_context = _plan_direct_translation(text_input, repair_ocr)
+    if chunks is None:
+        chunks = [text_input]
+    yield {"type": "start", "chunks": len(chunks)}
+
+    events: asyncio.Queue = asyncio.Queue()
+
+    def emit_delta(fragment: str) -> None:
+        events.put_nowait({"type": "delta", "index": 0, "text": fragment})
+
+    async def run_chunk(idx: int) -> None:
+        chunk_started = time.time()
+        chunk = chunks[idx]
+        try:
+            if via_nepali:
+                text, model_name = await _translate_via_nepali_async(
+                    chunk, source_lang, target_lang, repair_ocr=repair_ocr
+                )
+            elif idx == 0 and TRANSLATION_STREAM_FIRST_CHUNK_TOKENS:
+                text, model_name = await _call_llm_streaming(
+                    chunk, source_display, target_display, repair_ocr, full_context, emit_delta
+                )
+            else:
+                text, model_name = await _call_llm_async(
+                    chunk,
+                    source_display,
+                    target_display,
+                    repair_ocr=repair_ocr,
+                    full_context=full_context,
+                )
+            event = {"type": "chunk", "index": idx, "text": text, "model": model_name}
+        except Exception as e:
+            print(f"Streaming translation chunk {idx} failed: {e}")
+            event = {"type": "chunk", "index": idx, "text": chunk, "model": MODEL, "error": str(e)}
+        event["seconds"] = round(time.time() - chunk_started, 2)
+        events.put_nowait(event)
+
+    tasks = [asyncio.ensure_future(run_chunk(idx)) for idx in range(len(chunks))]
+    model_names = [MODEL] * len(chunks)
+    first_text_seconds = None
+    try:
+        remaining = len(chunks)
+        while remaining:
+            event = await events.get()
+            if first_text_seconds is None and event.get("text"):
+                first_text_seconds = round(time.time() - started, 2)
+            if event["type"] == "chunk":
+                model_names[event["index"]] = event["model"]
+                remaining -= 1
+            yield event
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    total_seconds = round(time.time() - started, 2)
+    print(
+        "Streaming translation complete: "
+        f"{len(chunks)} chunks, first text {first_text_seconds}s, total {total_seconds}s"
+    )
+    model_used = _combine_model_names(*model_names)
+    if via_nepali and not model_used.startswith("nepali_pivot:"):
+        model_used = f"nepali_pivot:{model_used}"
+    yield {
+        "type": "done",
+        "model_used": model_used,
+        "timing": {
+            "first_text_seconds": first_text_seconds,
+            "total_processing_seconds": total_seconds,
+        },
+    }
+
+
+def detect_language(text: str) -> dict:
+    """
+    Detects the language of a given text snippet using LLM.
+    """
+    # Truncate to first 500 characters for efficiency to save tokens
+    snippet = text[:500].strip()
+    if not snippet:
+        return {"language": "Unknown", "code": "unknown", "confidence": 0.0}
+
+    system_prompt = """
+You are a highly capable AI language identification expert. Your task is to accurately detect the language of the provided text.
+You can detect any global language (e.g., English, Spanish, Chinese, French, Hindi, etc.).
+Crucially, you have specialized expertise in distinguishing Himalayan languages. If the text is in Devanagari script, pay extremely close attention to the nuances to accurately distinguish whether it is Tamang, Newari, or Nepali.
+
+Rules:
+1. Output ONLY a valid JSON object in this format: {"language": "Language Name", "code": "lang_code", "confidence": 0.95}
+2. Language codes for global languages: Use standard 3-letter ISO codes (e.g., 'eng' for English, 'spa' for Spanish, 'zho' for Chinese).
+3. Language codes for Himalayan languages: strictly use 'tam' for Tamang, 'new' for Newari, and 'nep' for Nepali.
+4. If the language is completely unrecognizable, use code 'ot' and Language Name 'Other'.
+5. Use a confidence score between 0.0 and 1.0.
+6. Output ONLY the JSON. No preamble, no markdown blocks, no talk.
+"""
+
+    messages = [
+        {"role": "system", "content": system_prompt.strip()},
+        {"role": "user", "content": snippet}
+    ]
+
+    if not gemini_client:
+        print("Language detection failed: Google GenAI Client is not initialized (missing or invalid API key)")
+        return {"language": "Detection Error", "code": "error", "confidence": 0.0}
 
     # Ordered by recency & availability. Excludes TTS/Live/Image-only models and quota-exhausted gemini-2.0-flash.
     models_to_try = [
@@ -618,17 +1845,25 @@ Rules:
     ]
     last_error = None
     for model_name in models_to_try:
+        if not model_health.acquire(model_name):
+            print(f"Language detection skipping {model_name}: circuit breaker open")
+            continue
         try:
-            response = gemini_client.models.generate_content(
-                model=model_name,
-                contents=snippet,
-                config=types.GenerateContentConfig(
-                    system_instruction=system_prompt.strip(),
-                    temperature=0.0,
-                    response_mime_type="application/json",
-                    response_schema=LanguageDetectionResult,
+            try:
+                response = gemini_client.models.generate_content(
+                    model=model_name,
+                    contents=snippet,
+                    config=types.GenerateContentConfig(
+                        system_instruction=system_prompt.strip(),
+                        temperature=0.0,
+                        response_mime_type="application/json",
+                        response_schema=LanguageDetectionResult,
+                    )
                 )
-            )
+            except Exception as e:
+                model_health.record_failure(model_name, e)
+                raise
+            model_health.record_success(model_name)
             if response.parsed:
                 if isinstance(response.parsed, BaseModel):
                     return response.parsed.model_dump()
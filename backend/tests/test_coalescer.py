@@ -0,0 +1,128 @@
+import asyncio
+
+import pytest
+
+from ocr.coalescer import RequestCoalescer
+
+
+class Recorder:
+    """batch_fn that records each batch and answers item -> item * 10."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.batches = []
+
+    async def __call__(self, key, items):
+        self.batches.append((key, list(items)))
+        await asyncio.sleep(self.delay)
+        return [item * 10 for item in items]
+
+
+def test_flushes_after_max_wait():
+    recorder = Recorder()
+    coalescer = RequestCoalescer(recorder, max_wait=0.05, max_items=10)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        results = await asyncio.gather(*(coalescer.submit("k", item) for item in (1, 2, 3)))
+        return results, loop.time() - started
+
+    results, elapsed = asyncio.run(scenario())
+
+    assert results == [10, 20, 30]
+    assert recorder.batches == [("k", [1, 2, 3])]
+    assert 0.04 <= elapsed < 1.0
+
+
+def test_flushes_at_max_items_without_waiting():
+    recorder = Recorder()
+    coalescer = RequestCoalescer(recorder, max_wait=10.0, max_items=2)
+
+    async def scenario():
+        return await asyncio.wait_for(
+            asyncio.gather(*(coalescer.submit("k", item) for item in (1, 2, 3, 4))), 1.0
+        )
+
+    assert asyncio.run(scenario()) == [10, 20, 30, 40]
+    assert recorder.batches == [("k", [1, 2]), ("k", [3, 4])]
+
+
+def test_flushes_before_exceeding_max_weight():
+    recorder = Recorder()
+    coalescer = RequestCoalescer(recorder, max_wait=0.02, max_items=10, max_weight=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            coalescer.submit("k", 1, weight=6),
+            coalescer.submit("k", 2, weight=3),
+            coalescer.submit("k", 3, weight=3),
+        )
+
+    assert asyncio.run(scenario()) == [10, 20, 30]
+    assert recorder.batches == [("k", [1, 2]), ("k", [3])]
+
+
+def test_keys_are_batched_separately_and_results_fan_out_in_order():
+    recorder = Recorder()
+    coalescer = RequestCoalescer(recorder, max_wait=0.02, max_items=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            coalescer.submit("a", 1),
+            coalescer.submit("b", 2),
+            coalescer.submit("a", 3),
+            coalescer.submit("b", 4),
+        )
+
+    assert asyncio.run(scenario()) == [10, 20, 30, 40]
+    assert sorted(recorder.batches) == [("a", [1, 3]), ("b", [2, 4])]
+
+
+def test_cancelled_callers_are_dropped_before_the_call():
+    recorder = Recorder()
+    coalescer = RequestCoalescer(recorder, max_wait=0.05, max_items=10)
+
+    async def scenario():
+        first = asyncio.ensure_future(coalescer.submit("k", 1))
+        second = asyncio.ensure_future(coalescer.submit("k", 2))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await second
+
+    assert asyncio.run(scenario()) == 20
+    assert recorder.batches == [("k", [2])]
+
+
+def test_cancelled_batch_fails_its_waiters():
+    recorder = Recorder(delay=10.0)
+    coalescer = RequestCoalescer(recorder, max_wait=0.0, max_items=10)
+
+    async def scenario():
+        waiters = [asyncio.ensure_future(coalescer.submit("k", item)) for item in (1, 2)]
+        while not coalescer._tasks:
+            await asyncio.sleep(0.005)
+        for task in list(coalescer._tasks):
+            task.cancel()
+        return await asyncio.wait_for(asyncio.gather(*waiters, return_exceptions=True), 1.0)
+
+    results = asyncio.run(scenario())
+
+    assert len(results) == 2
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_batch_error_reaches_every_waiter():
+    async def failing(key, items):
+        raise ValueError("model down")
+
+    coalescer = RequestCoalescer(failing, max_wait=0.0, max_items=10)
+
+    async def scenario():
+        return await asyncio.gather(
+            coalescer.submit("k", 1), coalescer.submit("k", 2), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
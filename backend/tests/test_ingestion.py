@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import io
+import os
+
+import pytest
+from fastapi import UploadFile
+
+from ingestion import upload as ingest
+from ingestion.sniff import (
+    AUDIO_KIND,
+    IMAGE_KIND,
+    KIND_BY_EXTENSION,
+    PDF_KIND,
+    WORD_KIND,
+    sniff_kind,
+)
+from ingestion.upload import UploadRejected, ingest_upload
+
+PNG = b"\x89PNG\r\n\x1a\n" + b"\x00" * 8
+JPEG = b"\xff\xd8\xff\xe0\x00\x10JFIF\x00"
+PDF = b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n"
+
+HEADS = {
+    ".png": PNG,
+    ".jpg": JPEG,
+    ".jpeg": JPEG,
+    ".tif": b"II*\x00\x08\x00\x00\x00",
+    ".tiff": b"MM\x00*\x00\x00\x00\x08",
+    ".bmp": b"BM6\x00\x0c\x00\x00\x00",
+    ".pdf": PDF,
+    ".docx": b"PK\x03\x04\x14\x00\x06\x00",
+    ".doc": b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1",
+    ".mp3": b"ID3\x04\x00\x00\x00\x00\x00\x00",
+    ".wav": b"RIFF\x24\x08\x00\x00WAVEfmt ",
+    ".ogg": b"OggS\x00\x02\x00\x00",
+    ".flac": b"fLaC\x00\x00\x00\x22",
+    ".webm": b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81",
+    ".weba": b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81",
+    ".m4a": b"\x00\x00\x00\x20ftypM4A \x00\x00",
+}
+
+
+@pytest.mark.parametrize("suffix", sorted(KIND_BY_EXTENSION))
+def test_every_supported_extension_is_sniffed(suffix):
+    assert sniff_kind(HEADS[suffix]) == KIND_BY_EXTENSION[suffix]
+
+
+@pytest.mark.parametrize(
+    "head",
+    [b"\xff\xfb\x90\x64\x00", b"\xff\xf3\x48\xc4\x00"],
+    ids=["mpeg1-layer3", "mpeg2-layer3"],
+)
+def test_mp3_without_id3_is_sniffed_from_the_frame_sync(head):
+    assert sniff_kind(head) == AUDIO_KIND
+
+
+@pytest.mark.parametrize(
+    "head",
+    [b"", b"hello world", b"\xff\xe0\x00\x00", b"RIFF\x24\x08\x00\x00AVI "],
+    ids=["empty", "text", "reserved-layer", "avi"],
+)
+def test_unknown_content_is_not_sniffed(head):
+    assert sniff_kind(head) is None
+
+
+def test_kinds_cover_documents_and_audio():
+    assert set(KIND_BY_EXTENSION.values()) == {IMAGE_KIND, PDF_KIND, WORD_KIND, AUDIO_KIND}
+
+
+def _upload(filename: str, data: bytes, size_known: bool = True) -> UploadFile:
+    return UploadFile(io.BytesIO(data), filename=filename, size=len(data) if size_known else None)
+
+
+def _ingest(upload: UploadFile, dest_dir, **kwargs):
+    return asyncio.run(ingest_upload(upload, str(dest_dir), **kwargs))
+
+
+def test_ingest_returns_digest_and_size(tmp_path):
+    data = PDF + os.urandom(3 * 1024 * 1024 + 17)
+
+    ingested = _ingest(_upload("Letter.PDF", data), tmp_path)
+
+    assert ingested.kind == PDF_KIND
+    assert ingested.suffix == ".pdf"
+    assert ingested.size == len(data)
+    assert ingested.sha256 == hashlib.sha256(data).hexdigest()
+    with open(ingested.path, "rb") as handle:
+        assert handle.read() == data
+    assert os.listdir(tmp_path) == [os.path.basename(ingested.path)]
+
+
+def test_extension_content_mismatch_is_415(tmp_path):
+    with pytest.raises(UploadRejected) as info:
+        _ingest(_upload("scan.png", PDF + b"rest"), tmp_path)
+
+    assert info.value.status_code == 415
+    assert os.listdir(tmp_path) == []
+
+
+def test_unsupported_extension_is_400(tmp_path):
+    with pytest.raises(UploadRejected) as info:
+        _ingest(_upload("notes.txt", b"hello"), tmp_path)
+
+    assert info.value.status_code == 400
+
+
+def test_kind_not_allowed_by_the_endpoint_is_400(tmp_path):
+    with pytest.raises(UploadRejected) as info:
+        _ingest(_upload("voice.mp3", HEADS[".mp3"]), tmp_path, allowed_kinds=frozenset({PDF_KIND}))
+
+    assert info.value.status_code == 400
+
+
+def test_known_size_over_the_limit_is_413_before_copying(tmp_path, monkeypatch):
+    monkeypatch.setitem(ingest.MAX_UPLOAD_BYTES, IMAGE_KIND, 1024)
+
+    with pytest.raises(UploadRejected) as info:
+        _ingest(_upload("scan.png", PNG + b"\x00" * 2048), tmp_path / "out")
+
+    assert info.value.status_code == 413
+    assert not (tmp_path / "out").exists()
+
+
+def test_unknown_size_over_the_limit_is_413_during_copy(tmp_path, monkeypatch):
+    monkeypatch.setitem(ingest.MAX_UPLOAD_BYTES, IMAGE_KIND, 1024)
+    monkeypatch.setattr(ingest, "INGEST_CHUNK_BYTES", 256)
+
+    with pytest.raises(UploadRejected) as info:
+        _ingest(_upload("scan.png", PNG + b"\x00" * 2048, size_known=False), tmp_path)
+
+    assert info.value.status_code == 413
+    # The partial file is removed.
+    assert os.listdir(tmp_path) == []
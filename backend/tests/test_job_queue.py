@@ -0,0 +1,166 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from jobs import queue as job_queue
+from jobs.queue import COMPLETED, FAILED, QUEUED, RUNNING, JobQueue
+from jobs.worker import JobWorker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = datetime(2026, 1, 1, 12, 0, 0)
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += timedelta(seconds=seconds)
+
+
+class FailingEngine:
+    def process_detailed(self, *args, **kwargs):
+        raise RuntimeError("model quota exhausted")
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(job_queue, "_utcnow", fake)
+    return fake
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = JobQueue(f"sqlite:///{tmp_path / 'jobs.sqlite3'}", lease_seconds=60)
+    queue.create_table()
+    return queue
+
+
+def _enqueue(queue, spool_path="/nonexistent/upload.pdf"):
+    return queue.enqueue(spool_path, "letter.pdf", "ne", "en")
+
+
+def test_claim_leases_the_oldest_job(queue, clock):
+    first = _enqueue(queue)
+    clock.advance(1)
+    _enqueue(queue)
+
+    job = queue.claim("worker-a")
+
+    assert job.id == first
+    assert job.status == RUNNING
+    assert job.lease_owner == "worker-a"
+    assert job.attempts == 1
+    assert job.lease_expires_at == clock.now + timedelta(seconds=60)
+
+
+def test_running_job_is_not_claimed_twice(queue):
+    _enqueue(queue)
+
+    assert queue.claim("worker-a") is not None
+    assert queue.claim("worker-b") is None
+
+
+def test_expired_lease_is_re_claimed(queue, clock):
+    job_id = _enqueue(queue)
+    queue.claim("worker-a")
+
+    clock.advance(30)
+    assert queue.heartbeat(job_id, "worker-a")
+    clock.advance(59)
+    assert queue.claim("worker-b") is None
+
+    clock.advance(2)
+    job = queue.claim("worker-b")
+
+    assert job.id == job_id
+    assert job.lease_owner == "worker-b"
+    assert job.attempts == 2
+    assert not queue.heartbeat(job_id, "worker-a")
+    assert not queue.complete(job_id, "worker-a", {})
+    assert queue.complete(job_id, "worker-b", {"translated_text": "done"})
+    assert queue.get(job_id)["status"] == COMPLETED
+
+
+def test_requeue_with_error_backs_off(queue, clock, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOBS_RETRY_BASE_SECONDS", 30)
+    monkeypatch.setattr(job_queue, "JOBS_RETRY_MAX_SECONDS", 600)
+    job_id = _enqueue(queue)
+    queue.claim("worker-a")
+
+    assert queue.requeue(job_id, "worker-a", error="RuntimeError: boom")
+
+    view = queue.get(job_id)
+    assert view["status"] == QUEUED
+    assert view["attempts"] == 1
+    assert view["error"] == "RuntimeError: boom"
+    clock.advance(29)
+    assert queue.claim("worker-b") is None
+    clock.advance(1)
+    job = queue.claim("worker-b")
+    assert job.attempts == 2
+
+    # The second failure waits twice as long.
+    queue.requeue(job_id, "worker-b", error="RuntimeError: boom")
+    clock.advance(59)
+    assert queue.claim("worker-c") is None
+    clock.advance(1)
+    assert queue.claim("worker-c") is not None
+
+
+def test_shutdown_requeue_is_claimable_at_once(queue):
+    job_id = _enqueue(queue)
+    queue.claim("worker-a")
+
+    assert queue.requeue(job_id, "worker-a")
+
+    assert queue.get(job_id)["attempts"] == 0
+    job = queue.claim("worker-b")
+    assert job.id == job_id
+    assert job.attempts == 1
+
+
+def test_only_the_lease_owner_can_requeue(queue):
+    job_id = _enqueue(queue)
+    queue.claim("worker-a")
+
+    assert not queue.requeue(job_id, "worker-b", error="RuntimeError: boom")
+    assert queue.get(job_id)["status"] == RUNNING
+
+
+def test_last_failure_fails_the_job(queue, clock, tmp_path, monkeypatch):
+    monkeypatch.setattr("jobs.worker.JOBS_MAX_ATTEMPTS", 3)
+    spool = tmp_path / "upload.pdf"
+    spool.write_bytes(b"%PDF-1.7")
+    job_id = _enqueue(queue, str(spool))
+    worker = JobWorker(queue, FailingEngine(), name="worker-a")
+
+    for attempt in (1, 2):
+        job = queue.claim("worker-a")
+        assert job.attempts == attempt
+        worker.process(job)
+        assert queue.get(job_id)["status"] == QUEUED
+        clock.advance(3600)
+
+    worker.process(queue.claim("worker-a"))
+
+    view = queue.get(job_id)
+    assert view["status"] == FAILED
+    assert view["error"] == "RuntimeError: model quota exhausted"
+    assert not spool.exists()
+
+
+def test_crash_looping_job_is_failed_on_claim(queue, clock, monkeypatch):
+    monkeypatch.setattr("jobs.worker.JOBS_MAX_ATTEMPTS", 3)
+    job_id = _enqueue(queue)
+    for _ in range(3):
+        # The worker dies without recording anything; the lease runs out.
+        queue.claim("worker-a")
+        clock.advance(61)
+
+    job = queue.claim("worker-b")
+    assert job.attempts == 4
+    JobWorker(queue, FailingEngine(), name="worker-b").process(job)
+
+    assert queue.get(job_id)["status"] == FAILED
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from ocr import llm_dispatch
+from ocr.llm_dispatch import DispatchError, HedgedDispatcher
+
+
+@pytest.fixture(autouse=True)
+def short_hedge_delay(monkeypatch):
+    monkeypatch.setattr(llm_dispatch, "LLM_HEDGE_INITIAL_DELAY_MS", 100)
+    monkeypatch.setattr(llm_dispatch, "LLM_HEDGE_MIN_DELAY_MS", 100)
+
+
+class FakeModels:
+    """Callable standing in for a Gemini call: per-model delay or error."""
+
+    def __init__(self, delays=None, errors=()):
+        self.delays = delays or {}
+        self.errors = set(errors)
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, model):
+        with self._lock:
+            self.calls.append(model)
+        time.sleep(self.delays.get(model, 0.0))
+        if model in self.errors:
+            raise RuntimeError(f"{model} failed")
+        return f"answer from {model}"
+
+    async def call_async(self, model):
+        with self._lock:
+            self.calls.append(model)
+        await asyncio.sleep(self.delays.get(model, 0.0))
+        if model in self.errors:
+            raise RuntimeError(f"{model} failed")
+        return f"answer from {model}"
+
+
+def _dispatcher() -> HedgedDispatcher:
+    return HedgedDispatcher(["a", "b", "c"], max_in_flight=2, hedging=True)
+
+
+def test_no_hedge_when_first_model_answers_in_time():
+    models = FakeModels()
+
+    result = _dispatcher().dispatch(models)
+
+    assert result.model == "a"
+    assert result.hedges == 0
+    assert models.calls == ["a"]
+
+
+def test_one_hedge_after_the_delay():
+    models = FakeModels(delays={"a": 1.0})
+
+    result = _dispatcher().dispatch(models)
+
+    assert result.model == "b"
+    assert result.hedges == 1
+    assert result.attempts == 2
+    assert result.seconds < 1.0
+    assert sorted(models.calls) == ["a", "b"]
+
+
+def test_failover_on_error_does_not_wait_for_the_delay(monkeypatch):
+    monkeypatch.setattr(llm_dispatch, "LLM_HEDGE_INITIAL_DELAY_MS", 5000)
+    monkeypatch.setattr(llm_dispatch, "LLM_HEDGE_MIN_DELAY_MS", 5000)
+    models = FakeModels(errors={"a"})
+
+    result = _dispatcher().dispatch(models)
+
+    assert result.model == "b"
+    assert result.hedges == 0
+    assert result.seconds < 1.0
+
+
+def test_async_failover_on_error():
+    models = FakeModels(errors={"a"})
+
+    result = asyncio.run(_dispatcher().dispatch_async(models.call_async))
+
+    assert result.model == "b"
+    assert models.calls == ["a", "b"]
+
+
+def test_unhealthy_model_is_ranked_last():
+    dispatcher = _dispatcher()
+    for _ in range(4):
+        dispatcher._record_error("a", RuntimeError("quota"))
+
+    assert dispatcher.ranked_models() == ["b", "c", "a"]
+
+    models = FakeModels()
+    assert dispatcher.dispatch(models).model == "b"
+
+
+def test_dispatch_error_when_every_model_fails():
+    models = FakeModels(errors={"a", "b", "c"})
+
+    with pytest.raises(DispatchError) as info:
+        _dispatcher().dispatch(models)
+
+    assert sorted(models.calls) == ["a", "b", "c"]
+    assert isinstance(info.value.last_error, RuntimeError)
@@ -0,0 +1,119 @@
+import pytest
+
+from ocr import model_health
+from ocr.model_health import CLOSED, HALF_OPEN, OPEN, ModelHealthRegistry
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+class BadRequest(Exception):
+    code = 400
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(model_health, "time", fake)
+    return fake
+
+
+def _state(registry, model="m"):
+    return registry.snapshot()[model]["state"]
+
+
+def _tripped(clock) -> ModelHealthRegistry:
+    registry = ModelHealthRegistry(failure_threshold=3, cooldown_seconds=60, enabled=True)
+    for _ in range(3):
+        registry.record_failure("m", RuntimeError("unavailable"))
+    return registry
+
+
+def test_breaker_trips_at_the_threshold(clock):
+    registry = ModelHealthRegistry(failure_threshold=3, cooldown_seconds=60, enabled=True)
+    registry.record_failure("m", RuntimeError("unavailable"))
+    registry.record_failure("m", RuntimeError("unavailable"))
+    assert _state(registry) == CLOSED
+    assert registry.acquire("m")
+
+    registry.record_failure("m", RuntimeError("unavailable"))
+    assert _state(registry) == OPEN
+
+
+def test_success_resets_the_failure_count(clock):
+    registry = ModelHealthRegistry(failure_threshold=3, cooldown_seconds=60, enabled=True)
+    registry.record_failure("m", RuntimeError("unavailable"))
+    registry.record_failure("m", RuntimeError("unavailable"))
+    registry.record_success("m")
+    registry.record_failure("m", RuntimeError("unavailable"))
+
+    assert _state(registry) == CLOSED
+
+
+def test_open_breaker_is_skipped(clock):
+    registry = _tripped(clock)
+    clock.now += 59
+
+    assert not registry.acquire("m")
+    assert registry.snapshot()["m"]["skipped"] == 1
+
+
+def test_one_probe_after_the_cooldown(clock):
+    registry = _tripped(clock)
+    clock.now += 60
+
+    assert registry.acquire("m")
+    assert _state(registry) == HALF_OPEN
+    assert not registry.acquire("m")
+    assert not registry.acquire("m")
+
+
+def test_successful_probe_closes_the_breaker(clock):
+    registry = _tripped(clock)
+    clock.now += 60
+    assert registry.acquire("m")
+
+    registry.record_success("m")
+
+    assert _state(registry) == CLOSED
+    assert registry.acquire("m")
+    assert registry.acquire("m")
+
+
+def test_failed_probe_reopens_the_breaker(clock):
+    registry = _tripped(clock)
+    clock.now += 60
+    assert registry.acquire("m")
+
+    registry.record_failure("m", TimeoutError("deadline exceeded"))
+
+    assert _state(registry) == OPEN
+    assert not registry.acquire("m")
+    clock.now += 60
+    assert registry.acquire("m")
+
+
+def test_bad_requests_are_ignored(clock):
+    registry = ModelHealthRegistry(failure_threshold=1, cooldown_seconds=60, enabled=True)
+
+    registry.record_failure("m", BadRequest("invalid argument"))
+
+    assert registry.acquire("m")
+    assert registry.snapshot().get("m", {}).get("failures", 0) == 0
+
+
+def test_release_frees_the_probe(clock):
+    registry = _tripped(clock)
+    clock.now += 60
+    assert registry.acquire("m")
+    assert not registry.acquire("m")
+
+    registry.release("m")
+
+    assert registry.acquire("m")
+    assert _state(registry) == HALF_OPEN
@@ -0,0 +1,32 @@
+import os
+
+from ocr.cache import ResultCache
+
+
+def _cache(tmp_path) -> ResultCache:
+    return ResultCache("test", str(tmp_path), memory_entries=0)
+
+
+def test_overwrite_counts_only_the_size_difference(tmp_path):
+    cache = _cache(tmp_path)
+    cache.set("ab" * 32, {"text": "x" * 100})
+    cache.set("cd" * 32, {"text": "y" * 100})
+    cache.set("ab" * 32, {"text": "z" * 10})
+
+    assert cache.stats()["disk_bytes"] == cache._scan_disk_bytes()
+
+
+def test_corrupt_disk_entry_is_a_miss_and_removed(tmp_path):
+    cache = _cache(tmp_path)
+    key = "ef" * 32
+    cache.set(key, {"text": "hello"})
+    path = cache._path_for(key)
+    with open(path, "w", encoding="utf-8") as handle:
+        handle.write('{"text": "hel')
+
+    assert cache.get(key) is None
+    assert not os.path.exists(path)
+    assert cache.stats()["misses"] == 1
+
+    cache.set(key, {"text": "hello"})
+    assert cache.get(key) == {"text": "hello"}
@@ -0,0 +1,159 @@
+import json
+
+import pytest
+
+from ocr import translator
+from ocr.translator import _LLMRequest, _parse_batch_translations, _plan_batches
+
+
+def _response(*items):
+    return json.dumps([{"id": idx, "translation": text} for idx, text in items])
+
+
+# ------------------------------------------------------------------
+# Response validation
+# ------------------------------------------------------------------
+def test_parse_complete_response():
+    assert _parse_batch_translations(_response((0, "one"), (1, "two")), 2) == ["one", "two"]
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        _response((1, "two"), (0, "one")),
+        _response((0, "one"), (0, "one again")),
+        _response((0, "one"), (2, "three")),
+        _response((-1, "none")),
+        json.dumps({"id": 0, "translation": "one"}),
+        json.dumps(["one", "two"]),
+        "not json",
+    ],
+    ids=["out-of-order", "duplicate", "unknown", "negative", "object", "strings", "invalid"],
+)
+def test_parse_rejects_unusable_responses(raw):
+    assert _parse_batch_translations(raw, 2) is None
+
+
+def test_parse_missing_and_empty_items_become_none():
+    raw = _response((0, "one"), (2, "  "))
+
+    assert _parse_batch_translations(raw, 3) == ["one", None, None]
+
+
+# ------------------------------------------------------------------
+# Batch planning
+# ------------------------------------------------------------------
+def test_plan_cuts_at_the_token_budget(monkeypatch):
+    monkeypatch.setattr(translator, "TRANSLATION_BATCH_MAX_TOKENS", 100)
+    # 150 characters estimate to 51 tokens, so no two fit under 100 and
+    # every one-segment batch is demoted to a single request.
+    chunks = ["x" * 150] * 5
+
+    batches, singles = _plan_batches(chunks, list(range(5)))
+
+    assert batches == []
+    assert singles == [0, 1, 2, 3, 4]
+
+    monkeypatch.setattr(translator, "TRANSLATION_BATCH_MAX_TOKENS", 110)
+    batches, singles = _plan_batches(chunks, list(range(5)))
+
+    assert batches == [[0, 1], [2, 3]]
+    assert singles == [4]
+
+
+def test_plan_cuts_at_the_segment_limit(monkeypatch):
+    monkeypatch.setattr(translator, "TRANSLATION_BATCH_MAX_SEGMENTS", 3)
+    chunks = ["short"] * 7
+
+    batches, singles = _plan_batches(chunks, list(range(7)))
+
+    assert batches == [[0, 1, 2], [3, 4, 5]]
+    assert singles == [6]
+
+
+def test_plan_sends_long_segments_alone():
+    chunks = ["short", "x" * 3 * (translator.TRANSLATION_BATCH_SEGMENT_MAX_TOKENS + 1), "short"]
+
+    batches, singles = _plan_batches(chunks, [0, 1, 2])
+
+    assert batches == [[0, 2]]
+    assert singles == [1]
+
+
+def test_plan_disabled_sends_everything_alone(monkeypatch):
+    monkeypatch.setattr(translator, "TRANSLATION_BATCHING_ENABLED", False)
+
+    assert _plan_batches(["a", "b"], [0, 1]) == ([], [0, 1])
+
+
+# ------------------------------------------------------------------
+# Re-splitting
+# ------------------------------------------------------------------
+@pytest.fixture
+def fake_llm(monkeypatch):
+    """Stub out caching and models; record every batch request."""
+    batches = []
+    singles = []
+    failing = set()
+
+    def prepare(text, source_lang, target_lang, repair_ocr, full_context):
+        return _LLMRequest(text, "prompt", repair_ocr, f"key:{text}", source_lang, target_lang)
+
+    def generate(segments, system_prompt, repair_ocr):
+        batches.append(list(segments))
+        translations = [None if segment in failing else segment.upper() for segment in segments]
+        return translations, "fake-model"
+
+    def call_single(text, source_lang, target_lang, repair_ocr=False, full_context=None):
+        singles.append(text)
+        return text.upper(), "fake-model"
+
+    monkeypatch.setattr(translator, "_prepare_llm_request", prepare)
+    monkeypatch.setattr(translator, "_finish_llm_request", lambda request, result: result or (request.text, "none"))
+    monkeypatch.setattr(translator, "_build_system_prompt", lambda *args: "prompt")
+    monkeypatch.setattr(translator, "_generate_batch_translation", generate)
+    monkeypatch.setattr(translator, "_call_llm", call_single)
+    return batches, singles, failing
+
+
+def test_only_failed_segments_are_re_split(fake_llm):
+    batches, singles, failing = fake_llm
+    segments = ["a", "b", "c", "d", "e", "f"]
+    failing.update({"b", "e"})
+
+    results = translator._translate_batch(segments, "ne", "en")
+
+    assert [text for text, _ in results] == ["A", "B", "C", "D", "E", "F"]
+    assert batches == [segments]
+    # The two failures are split into halves of one, which go out singly.
+    assert singles == ["b", "e"]
+
+
+def test_rejected_batch_is_re_split_in_halves(fake_llm, monkeypatch):
+    batches, singles, _ = fake_llm
+    segments = ["a", "b", "c", "d"]
+    calls = []
+
+    def generate(batch, system_prompt, repair_ocr):
+        calls.append(list(batch))
+        if len(calls) == 1:
+            return None, "fake-model"
+        return [segment.upper() for segment in batch], "fake-model"
+
+    monkeypatch.setattr(translator, "_generate_batch_translation", generate)
+
+    results = translator._translate_batch(segments, "ne", "en")
+
+    assert [text for text, _ in results] == ["A", "B", "C", "D"]
+    assert calls == [segments, ["a", "b"], ["c", "d"]]
+    assert singles == []
+
+
+def test_all_models_failing_falls_back_to_source(fake_llm, monkeypatch):
+    _, singles, _ = fake_llm
+    monkeypatch.setattr(translator, "_generate_batch_translation", lambda *args: None)
+
+    results = translator._translate_batch(["a", "b"], "ne", "en")
+
+    assert [text for text, _ in results] == ["a", "b"]
+    assert singles == []
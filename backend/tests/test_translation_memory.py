@@ -0,0 +1,44 @@
+from ocr.translation_memory import TranslationMemory
+
+WARD_LETTER = (
+    "वडा नं. ४ को कार्यालयबाट श्री रामबहादुर थापाको नाममा जारी गरिएको यो "
+    "सिफारिस पत्र स्थायी बसोबास प्रमाणित गर्नका लागि लेखिएको हो। निजको "
+    "नागरिकता प्रमाणपत्र र जग्गाधनी पुर्जा संलग्न छ।"
+)
+WARD_LETTER_EN = (
+    "This recommendation letter, issued by the Ward No. 4 office in the name "
+    "of Mr. Ram Bahadur Thapa, certifies his permanent residence."
+)
+
+
+def _memory() -> TranslationMemory:
+    memory = TranslationMemory(":memory:")
+    memory.add(WARD_LETTER, WARD_LETTER_EN, "ne", "en")
+    return memory
+
+
+def test_exact_repeat_is_reused():
+    match = _memory().lookup("  " + WARD_LETTER.replace("४", "4") + " ", "ne", "en")
+
+    assert match is not None
+    assert match.reusable
+    assert match.target_text == WARD_LETTER_EN
+
+
+def test_changed_name_is_only_a_reference():
+    letter = WARD_LETTER.replace("रामबहादुर", "श्यामबहादुर")
+
+    match = _memory().lookup(letter, "ne", "en")
+
+    assert match is not None
+    assert match.similarity >= 0.95
+    assert not match.reusable
+
+
+def test_changed_digits_are_only_a_reference():
+    letter = WARD_LETTER.replace("४", "५")
+
+    match = _memory().lookup(letter, "ne", "en")
+
+    assert match is not None
+    assert not match.reusable